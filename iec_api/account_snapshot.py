@@ -0,0 +1,60 @@
+"""Account snapshot, the aggregate of the customer data fetched when bootstrapping a customer."""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from iec_api.models.contract import Contract
+from iec_api.models.customer import Customer
+from iec_api.models.device import Device, Devices
+from iec_api.models.electric_bill import ElectricBill
+from iec_api.models.invoice import GetInvoicesBody
+from iec_api.models.meter_reading import MeterReadings
+
+DEFAULT_SNAPSHOT_CONCURRENCY = 8
+
+
+@dataclass
+class ContractSnapshot:
+    """
+    Snapshot of a single contract.
+
+    Attributes:
+        contract (Contract): The contract.
+        devices (Optional[list[Device]]): The devices of the contract.
+        device_details (dict[str, Devices]): The device details, by device number.
+        last_meter_reading (Optional[MeterReadings]): The last meter reading.
+        billing_invoices (Optional[GetInvoicesBody]): The billing invoices.
+        electric_bill (Optional[ElectricBill]): The electric bill.
+        errors (dict[str, Exception]): Errors of the failed calls, by call name.
+    """
+
+    contract: Contract
+    devices: Optional[list[Device]] = None
+    device_details: dict[str, Devices] = field(default_factory=dict)
+    last_meter_reading: Optional[MeterReadings] = None
+    billing_invoices: Optional[GetInvoicesBody] = None
+    electric_bill: Optional[ElectricBill] = None
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+
+@dataclass
+class AccountSnapshot:
+    """
+    Snapshot of a customer and all of their contracts.
+
+    Attributes:
+        bp_number (Optional[str]): The BP number.
+        customer (Optional[Customer]): The customer.
+        contracts (list[ContractSnapshot]): The contract snapshots.
+        errors (dict[str, Exception]): Errors of the failed account level calls, by call name.
+    """
+
+    bp_number: Optional[str] = None
+    customer: Optional[Customer] = None
+    contracts: list[ContractSnapshot] = field(default_factory=list)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether all calls of the snapshot succeeded."""
+        return not self.errors and not any(contract.errors for contract in self.contracts)
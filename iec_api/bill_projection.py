@@ -0,0 +1,99 @@
+"""Projection of the current billing cycle amount."""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+from iec_api.const import TIMEZONE
+from iec_api.models.invoice import Invoice
+from iec_api.models.remote_reading import FutureConsumptionInfo
+from iec_api.tariff_cost import DAYS_PER_YEAR, prorate_monthly_charge
+
+DEFAULT_BILLING_CYCLE_DAYS = 60  # IEC bills households every two months
+
+
+@dataclass
+class BillProjection:
+    """
+    Projected amount of the current billing cycle. All amounts are in ILS and include VAT.
+
+    Attributes:
+        cycle_start (Optional[date]): The first day of the current billing cycle.
+        current_date (Optional[date]): The date of the latest consumption included.
+        days_elapsed (int): Days elapsed since the cycle start.
+        cycle_days (int): Expected length of the cycle.
+        consumption_so_far (float): Consumption (kWh) since the cycle start.
+        projected_consumption (float): Expected consumption (kWh) for the whole cycle.
+        energy_cost (float): Cost of the projected consumption.
+        fixed_cost (float): Distribution and delivery charges for the cycle.
+        capacity_cost (float): Power size (KVA) charges for the cycle.
+    """
+
+    cycle_start: Optional[date]
+    current_date: Optional[date]
+    days_elapsed: int
+    cycle_days: int
+    consumption_so_far: float
+    projected_consumption: float
+    energy_cost: float
+    fixed_cost: float
+    capacity_cost: float
+
+    @property
+    def projected_amount(self) -> float:
+        return round(self.energy_cost + self.fixed_cost + self.capacity_cost, 2)
+
+
+def _cycle_start(info: FutureConsumptionInfo, last_invoice: Optional[Invoice]) -> Optional[date]:
+    if info.last_invoice_date:
+        return datetime.strptime(info.last_invoice_date[:10], "%Y-%m-%d").date()
+    if last_invoice and last_invoice.to_date:
+        return last_invoice.to_date.astimezone(TIMEZONE).date()
+    return None
+
+
+def project_bill(
+    info: FutureConsumptionInfo,
+    kwh_tariff: float,
+    distribution_tariff: float,
+    delivery_tariff: float,
+    power_size: float = 0.0,
+    kva_tariff: float = 0.0,
+    last_invoice: Optional[Invoice] = None,
+) -> BillProjection:
+    """
+    Project the amount of the current billing cycle from the consumption since the last invoice.
+    Args:
+        info (FutureConsumptionInfo): The future consumption info of the meter, from the remote reading.
+        kwh_tariff (float): Rate per kWh.
+        distribution_tariff (float): Monthly distribution charge, prorated with prorate_monthly_charge.
+        delivery_tariff (float): Monthly delivery charge, prorated with prorate_monthly_charge.
+        power_size (float): Power size (KVA) of the connection, without VAT.
+        kva_tariff (float): Yearly rate per KVA, including VAT.
+        last_invoice (Invoice): The last invoice, used for the cycle length and as a cycle start fallback.
+    Returns:
+        BillProjection: The projection.
+    """
+    cycle_start = _cycle_start(info, last_invoice)
+    current_date = info.current_date or datetime.now(TIMEZONE).date()
+    days_elapsed = max((current_date - cycle_start).days, 1) if cycle_start else 1
+
+    cycle_days = DEFAULT_BILLING_CYCLE_DAYS
+    if last_invoice and last_invoice.days_period and str(last_invoice.days_period).isdigit():
+        cycle_days = int(last_invoice.days_period)
+    cycle_days = max(cycle_days, days_elapsed)
+
+    consumption_so_far = info.future_consumption or 0.0
+    projected_consumption = consumption_so_far / days_elapsed * cycle_days
+
+    return BillProjection(
+        cycle_start=cycle_start,
+        current_date=current_date,
+        days_elapsed=days_elapsed,
+        cycle_days=cycle_days,
+        consumption_so_far=consumption_so_far,
+        projected_consumption=projected_consumption,
+        energy_cost=projected_consumption * kwh_tariff,
+        fixed_cost=prorate_monthly_charge(distribution_tariff + delivery_tariff, cycle_days),
+        capacity_cost=power_size * kva_tariff / DAYS_PER_YEAR * cycle_days,
+    )
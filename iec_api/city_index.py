@@ -0,0 +1,100 @@
+"""Index of the MASA cities, for exact lookups and normalized prefix search (autocomplete)."""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Iterator, Optional
+from uuid import UUID
+
+from iec_api.masa_api_models.cities import City
+
+_NIQQUD = re.compile("[\u0591-\u05bd\u05bf-\u05c7]")  # Cantillation marks and vowel points, except maqaf
+_FINAL_LETTERS = str.maketrans("\u05da\u05dd\u05df\u05e3\u05e5", "\u05db\u05de\u05e0\u05e4\u05e6")  # ךםןףץ to כמנפצ
+_SEPARATORS = re.compile("[\\s\\-_.,'\"()\u05be\u05f3\u05f4]+")  # Including maqaf, geresh and gershayim
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a city name for search: lower case, no niqqud, final letters folded and single spaces between words.
+    Args:
+        name (str): The name, Hebrew or English.
+    Returns:
+        str: The normalized name.
+    """
+    name = unicodedata.normalize("NFC", name).lower()
+    name = _NIQQUD.sub("", name).translate(_FINAL_LETTERS)
+    return _SEPARATORS.sub(" ", name).strip()
+
+
+def _prefix_matches(keys: list[tuple[str, int]], prefix: str) -> Iterator[int]:
+    for i in range(bisect_left(keys, (prefix, -1)), len(keys)):
+        key, city_index = keys[i]
+        if not key.startswith(prefix):
+            return
+        yield city_index
+
+
+class CityIndex:
+    """Index of cities by ID, Shoval city code and normalized name, built once per cities load."""
+
+    def __init__(self, cities: list[City]):
+        self._cities = list(cities)
+        self._by_id = {city.id: city for city in self._cities}
+        self._by_shoval_code = {city.shoval_city_code.strip(): city for city in self._cities}
+        self._by_name: dict[str, City] = {}
+
+        self._names: list[tuple[str, int]] = []  # (normalized name, city index), sorted
+        self._words: list[tuple[str, int]] = []  # (normalized name from its second word on, city index), sorted
+        for i, city in enumerate(self._cities):
+            name = normalize_name(city.name)
+            self._names.append((name, i))
+            self._by_name.setdefault(name, city)
+            words = name.split(" ")
+            self._words.extend((" ".join(words[j:]), i) for j in range(1, len(words)))
+        self._names.sort()
+        self._words.sort()
+
+    def __len__(self) -> int:
+        return len(self._cities)
+
+    def __iter__(self) -> Iterator[City]:
+        return iter(self._cities)
+
+    def by_id(self, city_id: UUID | str) -> Optional[City]:
+        """Get a city by its ID, None if not found or malformed."""
+        if isinstance(city_id, str):
+            try:
+                city_id = UUID(city_id)
+            except ValueError:
+                return None
+        return self._by_id.get(city_id)
+
+    def by_shoval_code(self, shoval_city_code: int | str) -> Optional[City]:
+        """Get a city by its Shoval city code."""
+        return self._by_shoval_code.get(str(shoval_city_code).strip())
+
+    def by_name(self, name: str) -> Optional[City]:
+        """Get a city by its name, compared normalized."""
+        return self._by_name.get(normalize_name(name))
+
+    def search(self, prefix: str, limit: int = 10) -> list[City]:
+        """
+        Search cities by a name prefix, in O(log n + limit).
+        Cities whose name starts with the prefix come first, then cities with a later word starting with it.
+        Args:
+            prefix (str): The prefix, compared normalized.
+            limit (int): Maximal number of cities.
+        Returns:
+            list[City]: The matching cities, each group ordered by normalized name.
+        """
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+
+        found: dict[int, None] = {}  # Insertion ordered set
+        for keys in (self._names, self._words):
+            for city_index in _prefix_matches(keys, prefix):
+                if len(found) >= limit:
+                    break
+                found.setdefault(city_index)
+        return [self._cities[i] for i in found]
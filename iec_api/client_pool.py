@@ -0,0 +1,195 @@
+"""Pool of IEC API clients of many users, sharing a single session and connection pool."""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import aiohttp
+from aiohttp import ClientSession
+
+from iec_api import commons
+from iec_api.iec_client import IecClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CLIENTS = 1024
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 30
+DNS_CACHE_TTL = 5 * 60
+
+
+@dataclass
+class ClientPoolMetrics:
+    """
+    Pool wide metrics.
+
+    Attributes:
+        clients (int): Number of clients currently in the pool.
+        created (int): Number of clients created.
+        hits (int): Number of requests served by an existing client.
+        evictions (int): Number of clients evicted, being the least recently used or idle.
+        connection_limit (int): Maximal number of connections of the shared session.
+        session_closed (bool): Whether the shared session is closed.
+        executor (ExecutorMetrics): Metrics of the executor running the blocking work of the clients.
+    """
+
+    clients: int
+    created: int
+    hits: int
+    evictions: int
+    connection_limit: int
+    session_closed: bool
+    executor: commons.ExecutorMetrics
+
+
+class ClientPool:
+    """
+    Pool of IEC API clients, one per user, all sharing a single session.
+    Every client keeps its own JWT and cached IDs, the session, connector and trace config are shared.
+    """
+
+    def __init__(
+        self,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+        idle_timeout: Optional[float] = None,
+        session: Optional[ClientSession] = None,
+        on_evict: Optional[Callable[[IecClient], None]] = None,
+        executor_workers: int = commons.DEFAULT_EXECUTOR_WORKERS,
+    ):
+        """
+        Initializes the pool.
+
+        Args:
+        max_clients (int): Maximal number of clients, the least recently used client is evicted beyond it.
+        idle_timeout (float): Seconds after which an unused client is evicted. Default is never.
+        session (ClientSession): The session to share. Default is a session created and owned by the pool.
+        on_evict (Callable[[IecClient], None]): Called with every evicted client, e.g. to save its token.
+        executor_workers (int): Worker threads of the executor running the blocking work of all the clients.
+        """
+        if max_clients < 1:
+            raise ValueError("Max clients must be positive")
+
+        self._max_clients = max_clients
+        self._idle_timeout = idle_timeout
+        self._session = session
+        self._owns_session = session is None
+        self._on_evict = on_evict
+        self._executor = commons.BlockingExecutor(executor_workers, "IecClientPool")
+        self._clients: OrderedDict[str, tuple[float, IecClient]] = OrderedDict()  # (last use, client) by user ID
+        self._created = 0
+        self._hits = 0
+        self._evictions = 0
+
+    def _get_session(self) -> ClientSession:
+        if not self._session:
+            connector = aiohttp.TCPConnector(
+                limit=DEFAULT_CONNECTION_LIMIT,
+                limit_per_host=DEFAULT_CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[commons.get_debug_trace_config()],
+                timeout=commons.DEFAULT_CLIENT_TIMEOUT,
+            )
+        return self._session
+
+    def _evict(self, user_id: str):
+        _, client = self._clients.pop(user_id)
+        self._evictions += 1
+        logger.debug(f"Evicting client of user {user_id}")
+        if self._on_evict:
+            self._on_evict(client)
+
+    def evict_idle(self) -> int:
+        """
+        Evict the clients that were not used within the idle timeout.
+        Returns:
+        int: Number of evicted clients.
+        """
+        if self._idle_timeout is None:
+            return 0
+
+        deadline = time.monotonic() - self._idle_timeout
+        idle_user_ids = []
+        for user_id, (last_used, _) in self._clients.items():  # Ordered by last use
+            if last_used > deadline:
+                break
+            idle_user_ids.append(user_id)
+
+        for user_id in idle_user_ids:
+            self._evict(user_id)
+        return len(idle_user_ids)
+
+    def get_client(self, user_id: str | int) -> IecClient:
+        """
+        Get the client of a user, creating it if it is not in the pool.
+        Args:
+        user_id (str): The user ID (SSN).
+        Returns:
+        IecClient: The client of the user.
+        """
+        user_id = str(user_id)
+        self.evict_idle()
+
+        entry = self._clients.pop(user_id, None)
+        if entry:
+            self._hits += 1
+            client = entry[1]
+        else:
+            client = IecClient(user_id, session=self._get_session(), executor=self._executor)
+            client._shared_session = True
+            self._created += 1
+            while len(self._clients) >= self._max_clients:
+                self._evict(next(iter(self._clients)))
+
+        self._clients[user_id] = (time.monotonic(), client)
+        return client
+
+    def remove_client(self, user_id: str | int) -> Optional[IecClient]:
+        """
+        Remove the client of a user from the pool, without calling on_evict.
+        Args:
+        user_id (str): The user ID (SSN).
+        Returns:
+        IecClient: The removed client, None if the user has no client in the pool.
+        """
+        entry = self._clients.pop(str(user_id), None)
+        return entry[1] if entry else None
+
+    def __contains__(self, user_id: object) -> bool:
+        return isinstance(user_id, (str, int)) and str(user_id) in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    @property
+    def metrics(self) -> ClientPoolMetrics:
+        connector = self._session.connector if self._session else None
+        return ClientPoolMetrics(
+            clients=len(self._clients),
+            created=self._created,
+            hits=self._hits,
+            evictions=self._evictions,
+            connection_limit=connector.limit if connector else DEFAULT_CONNECTION_LIMIT,
+            session_closed=self._session.closed if self._session else False,
+            executor=self._executor.metrics,
+        )
+
+    async def close(self):
+        """Evict all clients, shut down the executor and close the shared session, if owned by the pool."""
+        for user_id in list(self._clients):
+            self._evict(user_id)
+        self._executor.shutdown(wait=False)
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - evict the clients and close the session."""
+        await self.close()
@@ -2,11 +2,14 @@ import asyncio
 import http
 import json
 import logging
+import os
 import re
+import threading
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from json import JSONDecodeError
-from typing import Any, Optional
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generic, Iterable, Optional, TypeVar
 
 import aiohttp
 import pytz
@@ -18,6 +21,8 @@ from iec_api.models.exceptions import IECError, IECLoginError
 from iec_api.models.okta_errors import OktaError
 from iec_api.models.response_descriptor import RESPONSE_DESCRIPTOR_FIELD, ErrorResponseDescriptor
 
+K = TypeVar("K")
+T = TypeVar("T")
 logger = logging.getLogger(__name__)
 
 
@@ -80,9 +85,164 @@ def is_json(s: str):
     return True
 
 
+DEFAULT_EXECUTOR_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class ExecutorMetrics:
+    """
+    Metrics of a BlockingExecutor.
+
+    Attributes:
+        max_workers (int): Maximal number of worker threads.
+        pending (int): Number of calls waiting for a free worker.
+        running (int): Number of calls currently running.
+        completed (int): Number of completed calls.
+        max_pending (int): Highest number of calls that waited for a free worker at once.
+    """
+
+    max_workers: int
+    pending: int
+    running: int
+    completed: int
+    max_pending: int
+
+
+class BlockingExecutor:
+    """Bounded thread pool for blocking work (crypto, file I/O and user input), keeping it off the event loop."""
+
+    def __init__(self, max_workers: int = DEFAULT_EXECUTOR_WORKERS, thread_name_prefix: str = "IecApi"):
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None  # Created on first use
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._max_pending = 0
+
+    def _call(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run a blocking function on the executor.
+        Args:
+        func (Callable): The blocking function.
+        args: The arguments of the function.
+        Returns:
+        The result of the function.
+        """
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(self._max_workers, self._thread_name_prefix)
+        with self._lock:
+            self._pending += 1
+            self._max_pending = max(self._max_pending, self._pending)
+        try:
+            future = self._executor.submit(self._call, func, *args)
+        except RuntimeError:
+            self._on_not_started()  # Shut down meanwhile
+            raise
+        future.add_done_callback(lambda f: f.cancelled() and self._on_not_started())
+        return await asyncio.wrap_future(future)
+
+    def _on_not_started(self):
+        with self._lock:
+            self._pending -= 1
+
+    @property
+    def metrics(self) -> ExecutorMetrics:
+        with self._lock:
+            return ExecutorMetrics(
+                max_workers=self._max_workers,
+                pending=self._pending,
+                running=self._running,
+                completed=self._completed,
+                max_pending=self._max_pending,
+            )
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the worker threads, they are recreated on the next run."""
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+_default_executor: Optional[BlockingExecutor] = None
+
+
+def get_default_executor() -> BlockingExecutor:
+    """Get the executor shared by all the clients that were not given their own."""
+    global _default_executor
+    if not _default_executor:
+        _default_executor = BlockingExecutor()
+    return _default_executor
+
+
+def remove_file(path: str) -> None:
+    """Remove a file if it exists, to be run on an executor."""
+    if os.path.exists(path):
+        os.remove(path)
+
+
 async def read_user_input(prompt: str) -> str:
-    with ThreadPoolExecutor(1, "AsyncInput") as executor:
-        return await asyncio.get_event_loop().run_in_executor(executor, input, prompt)
+    # A thread of its own, a prompt may wait for the user indefinitely and must not hold a shared executor worker
+    return await asyncio.to_thread(input, prompt)
+
+
+@dataclass
+class FanOutResult(Generic[K, T]):
+    """Result of a single call of a fan out, holding either the call result or its error."""
+
+    key: K
+    result: Optional[T] = None
+    error: Optional[Exception] = None
+
+
+async def fan_out(
+    keys: Iterable[K],
+    func: Callable[[K], Awaitable[T]],
+    max_concurrency: int,
+    timeout: Optional[float] = None,
+) -> AsyncGenerator[FanOutResult[K, T], None]:
+    """
+    Call func for every key concurrently and yield the results as they complete.
+    Args:
+        keys (Iterable[K]): The keys to call func with.
+        func (Callable[[K], Awaitable[T]]): The call to make per key.
+        max_concurrency (int): Maximal number of concurrent calls.
+        timeout (Optional[float]): Timeout in seconds of every single call, not including the wait for a free slot.
+    Returns:
+        AsyncGenerator[FanOutResult[K, T], None]: The results in completion order, failed calls don't stop the others.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(key: K) -> FanOutResult[K, T]:
+        async with semaphore:
+            try:
+                return FanOutResult(key=key, result=await asyncio.wait_for(func(key), timeout))
+            except asyncio.TimeoutError:
+                return FanOutResult(key=key, error=IECError(-1, f"Call for {key} timed out after {timeout} seconds"))
+            except Exception as ex:
+                return FanOutResult(key=key, error=ex)
+
+    tasks = [asyncio.ensure_future(call(key)) for key in keys]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 def parse_error_response(resp: ClientResponse, json_resp: dict[str, Any]):
@@ -187,6 +347,23 @@ async def send_non_json_post_request(
     data: Optional[dict] = None,
     json_data: Optional[dict] = None,
 ) -> StreamReader:
+    resp = await send_streaming_post_request(session, url, timeout, headers, data, json_data)
+    return resp.content
+
+
+async def send_streaming_post_request(
+    session: ClientSession,
+    url: str,
+    timeout: Optional[int | aiohttp.ClientTimeout] = 60,
+    headers: Optional[dict[str, str]] = None,
+    data: Optional[dict] = None,
+    json_data: Optional[dict] = None,
+) -> ClientResponse:
+    """
+    Send a POST request and return the response with its body not yet read, to be streamed by the caller.
+    Returns:
+    ClientResponse: The response, to be read with copy_response_content or released by the caller.
+    """
     try:
         if isinstance(timeout, int):
             timeout = aiohttp.ClientTimeout(total=timeout)
@@ -204,7 +381,39 @@ async def send_non_json_post_request(
         if is_json(error_text):
             parse_error_response(resp, json.loads(error_text))
         raise IECError(resp.status, resp.reason)
-    return resp.content
+    return resp
+
+
+async def copy_response_content(
+    resp: ClientResponse, write: Callable[[bytes], Awaitable[Any]], chunk_size: int = DOWNLOAD_CHUNK_SIZE
+) -> int:
+    """
+    Copy the body of a response to an async writer chunk by chunk, and release the response.
+    The size is checked against the Content-Length, unless the response has a Content-Encoding.
+    Args:
+    resp (ClientResponse): The response.
+    write (Callable[[bytes], Awaitable]): The async write function, e.g. the write method of an aiofiles file.
+    chunk_size (int): Maximal size of a chunk.
+    Returns:
+    int: Number of bytes copied.
+    """
+    try:
+        size = 0
+        async for chunk in resp.content.iter_chunked(chunk_size):
+            await write(chunk)
+            size += len(chunk)
+    except TimeoutError as ex:
+        raise IECError(-1, f"Failed to communicate with IEC API due to time out: ({str(ex)})")
+    except ClientError as ex:
+        raise IECError(-1, f"Failed to communicate with IEC API due to ClientError: ({str(ex)})")
+    finally:
+        resp.release()
+
+    # Content-Length counts the encoded bytes, while the content is decoded (e.g. gunzipped) on the fly
+    encoding = resp.headers.get(aiohttp.hdrs.CONTENT_ENCODING, "identity").lower()
+    if resp.content_length is not None and encoding == "identity" and size != resp.content_length:
+        raise IECError(-1, f"Received incomplete response from IEC API: {size} of {resp.content_length} bytes")
+    return size
 
 
 def convert_to_tz_aware_datetime(dt: Optional[datetime]) -> Optional[datetime]:
@@ -242,3 +451,25 @@ async def on_request_end_debug(session: aiohttp.ClientSession, context, params:
     except Exception:
         text = "<unable to read response>"
     logger.debug(f"HTTP {params.method} call from {params.url} - Response <{params.response.status}>: {text}")
+
+
+DEFAULT_CLIENT_TIMEOUT = aiohttp.ClientTimeout(total=120, connect=60, sock_read=60)  # Handles DNS resolution delays
+
+_debug_trace_config: Optional[aiohttp.TraceConfig] = None
+
+
+def get_debug_trace_config() -> aiohttp.TraceConfig:
+    """
+    Get the frozen trace config logging the HTTP calls, shared by all clients so a session gets it only once.
+    Returns:
+    aiohttp.TraceConfig: The debug trace config.
+    """
+    global _debug_trace_config
+    if not _debug_trace_config:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start_debug)  # type: ignore[arg-type]
+        trace_config.on_request_chunk_sent.append(on_request_chunk_sent_debug)  # type: ignore[arg-type]
+        trace_config.on_request_end.append(on_request_end_debug)  # type: ignore[arg-type]
+        trace_config.freeze()
+        _debug_trace_config = trace_config
+    return _debug_trace_config
@@ -0,0 +1,173 @@
+"""Compact outage model, normalizing the disconnects of the IEC API and the Fault Portal outages."""
+
+import logging
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from iec_api.fault_portal_models.outages import FaultPortalOutage
+from iec_api.models.outages import Outage
+
+logger = logging.getLogger(__name__)
+
+
+class OutageSource(Enum):
+    """Outage Source enum."""
+
+    IEC_API = "iec_api"
+    FAULT_PORTAL = "fault_portal"
+
+
+@dataclass(frozen=True)
+class CompactOutage:
+    """
+    A single disconnect affecting a site.
+
+    Attributes:
+        disconnect_key (str): The disconnect key, or the disconnect ID when there is no key.
+        source (OutageSource): The API the disconnect was read from.
+        disconnect_id (Optional[UUID]): The disconnect ID.
+        contract_number (Optional[str]): The contract number of the site.
+        region (Optional[str]): The region of the site.
+        area (Optional[str]): The area of the site.
+        city (Optional[str]): The city of the site.
+        disconnect_date (Optional[datetime]): When the disconnect started.
+        disconnect_type (Optional[str]): Display name of the disconnect type.
+        treatment_state_code (Optional[str]): Code of the treatment state.
+        treatment_state (Optional[str]): Display name of the treatment state.
+        energized_date (Optional[datetime]): When the site was energized again, None while disconnected.
+        estimate_treatment_date (Optional[datetime]): Estimated treatment date, IEC API only.
+    """
+
+    disconnect_key: str
+    source: OutageSource
+    disconnect_id: Optional[UUID] = None
+    contract_number: Optional[str] = None
+    region: Optional[str] = None
+    area: Optional[str] = None
+    city: Optional[str] = None
+    disconnect_date: Optional[datetime] = None
+    disconnect_type: Optional[str] = None
+    treatment_state_code: Optional[str] = None
+    treatment_state: Optional[str] = None
+    energized_date: Optional[datetime] = None
+    estimate_treatment_date: Optional[datetime] = None
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the site is still disconnected."""
+        return self.energized_date is None
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        logger.debug(f"Ignoring unparsable date {value}")
+        return None
+
+
+def from_outages(outages: Optional[list[Outage]]) -> list[CompactOutage]:
+    """
+    Normalize IEC API outages, one compact outage per disconnect.
+    Args:
+        outages (list[Outage]): The outages.
+    Returns:
+        list[CompactOutage]: The compact outages.
+    """
+    compact = []
+    for outage in outages or []:
+        address = outage.site.address if outage.site else None
+        for info in outage.transactions_info:
+            disconnect = info.disconnect
+            state = disconnect.disconnect_treatment_state
+            compact.append(
+                CompactOutage(
+                    disconnect_key=disconnect.disconnect_key or str(disconnect.id),
+                    source=OutageSource.IEC_API,
+                    disconnect_id=disconnect.id,
+                    contract_number=outage.site.contract_number if outage.site else None,
+                    region=address.region.name if address and address.region else None,
+                    area=address.area.name if address and address.area else None,
+                    city=address.city.name if address and address.city else None,
+                    disconnect_date=info.disconnect_date,
+                    disconnect_type=disconnect.disconnect_type.display_name if disconnect.disconnect_type else None,
+                    treatment_state_code=state.code if state else None,
+                    treatment_state=state.display_name if state else None,
+                    energized_date=_parse_date(disconnect.energized_date),
+                    estimate_treatment_date=disconnect.estimate_treatment_date,
+                )
+            )
+    return compact
+
+
+def from_fault_portal_outages(outages: Optional[list[FaultPortalOutage]]) -> list[CompactOutage]:
+    """
+    Normalize Fault Portal outages, one compact outage per disconnect.
+    Args:
+        outages (list[FaultPortalOutage]): The outages.
+    Returns:
+        list[CompactOutage]: The compact outages, outages without a disconnect are skipped.
+    """
+    compact = []
+    for outage in outages or []:
+        disconnect = outage.disconnect
+        if not disconnect or not (disconnect.disconnect_key or disconnect.id):
+            continue
+        state = disconnect.disconnect_treatment_state
+        address = outage.site.address if outage.site else None
+        compact.append(
+            CompactOutage(
+                disconnect_key=disconnect.disconnect_key or str(disconnect.id),
+                source=OutageSource.FAULT_PORTAL,
+                disconnect_id=disconnect.id,
+                contract_number=outage.site.contract_number if outage.site else None,
+                region=address.region.name if address and address.region else None,
+                area=address.area.name if address and address.area else None,
+                city=address.city.name if address and address.city else None,
+                disconnect_date=disconnect.disconnect_date or outage.disconnect_date,
+                disconnect_type=disconnect.disconnect_type.display_name if disconnect.disconnect_type else None,
+                treatment_state_code=str(state.code) if state and state.code is not None else None,
+                treatment_state=state.display_name if state else None,
+                energized_date=disconnect.energized_date,
+            )
+        )
+    return compact
+
+
+def merge_outages(*sources: list[CompactOutage]) -> list[CompactOutage]:
+    """
+    Merge the compact outages of several sources, deduplicated by disconnect ID or key.
+    The first source to report a disconnect wins, and its missing fields are filled in from the later sources.
+    Args:
+        *sources (list[CompactOutage]): The compact outages of every source, by preference.
+    Returns:
+        list[CompactOutage]: The merged outages, in order of first appearance.
+    """
+    merged: dict[str, CompactOutage] = {}  # By disconnect key
+    keys_by_id: dict[UUID, str] = {}
+    for outages in sources:
+        for outage in outages:
+            key = (
+                keys_by_id.get(outage.disconnect_id, outage.disconnect_key)
+                if outage.disconnect_id
+                else outage.disconnect_key
+            )
+            first = merged.get(key)
+            if not first:
+                merged[key] = outage
+                if outage.disconnect_id:
+                    keys_by_id[outage.disconnect_id] = key
+                continue
+            missing = {
+                f.name: getattr(outage, f.name)
+                for f in fields(first)
+                if getattr(first, f.name) is None and getattr(outage, f.name) is not None
+            }
+            if missing:
+                merged[key] = replace(first, **missing)
+    return list(merged.values())
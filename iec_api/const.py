@@ -77,11 +77,15 @@ POST_MASA_CREATE_CONNECTION_REQUEST_URL = (
 GET_MASA_ORDER_TITLES_URL = IEC_MASA_API_BASE_URL + "accounts/{account_id}/orders/titles"
 GET_MASA_ORDER_LOOKUP_URL = IEC_MASA_API_BASE_URL + "orderLookup"
 GET_MASA_VOLT_LEVELS_URL = IEC_MASA_API_BASE_URL + "voltLevels/active"
-GET_MASA_EQUIPMENTS_URL = IEC_MASA_BASE_URL + "equipments/get?accountId={account_id}&pageNumber=1&pageSize=10"
+GET_MASA_EQUIPMENTS_URL = (
+    IEC_MASA_BASE_URL + "equipments/get?accountId={account_id}&pageNumber={page_number}&pageSize={page_size}"
+)
+DEFAULT_MASA_PAGE_SIZE = 10
 GET_MASA_LOOKUP_URL = IEC_MASA_BASE_URL + "lookup/all"
 
 GET_USER_PROFILE_FROM_FAULT_PORTAL_URL = IEC_FAULT_PORTAL_API_URL + "contacts/userprofile"
 GET_OUTAGES_FROM_FAULT_PORTAL_URL = IEC_FAULT_PORTAL_API_URL + "accounts/{account_id}/tranzactions/2"
 POST_ACCOUNTS_TRANSACTIONS_URL = IEC_FAULT_PORTAL_API_URL + "accounts/tranzactions"
+DEFAULT_ACCOUNTS_TRANSACTIONS_CHUNK_SIZE = 100
 ERROR_FIELD_NAME = "Error"
 ERROR_SUMMARY_FIELD_NAME = "errorSummary"
@@ -1,6 +1,6 @@
 import logging
 from datetime import datetime
-from typing import Any, List, Optional, TypeVar
+from typing import Any, Awaitable, Callable, List, Optional, TypeVar
 from uuid import UUID
 
 from aiohttp import ClientSession
@@ -389,6 +389,28 @@ async def get_invoice_pdf(
     return await response.read()
 
 
+async def stream_invoice_pdf(
+    session: ClientSession,
+    token: JWT,
+    bp_number: int | str,
+    contract_id: int | str,
+    invoice_number: int | str,
+    write: Callable[[bytes], Awaitable[Any]],
+) -> int:
+    """Stream Invoice PDF from IEC API to an async writer, returns the number of bytes written."""
+    headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH, token.id_token)
+    headers = headers.copy()  # don't modify original headers
+    headers.update({"accept": "application/pdf", "content-type": "application/json"})
+
+    request = GetPdfRequest(
+        invoice_number=str(invoice_number), contract_id=str(contract_id), bp_number=str(bp_number)
+    ).to_dict()
+    response = await commons.send_streaming_post_request(
+        session, url=GET_INVOICE_PDF_URL, headers=headers, json_data=request
+    )
+    return await commons.copy_response_content(response, write)
+
+
 async def send_consumption_report_to_mail(
     session: ClientSession, token: JWT, contract_id: int | str, email: str, device_code: int | str, device_id: int | str
 ) -> bool:
@@ -0,0 +1,220 @@
+"""Streaming NDJSON and CSV export of remote readings, invoices and meter readings, row by row in constant memory."""
+
+import csv
+import io
+import json
+from datetime import date
+from enum import Enum
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, Iterator, Optional
+
+from iec_api.models.invoice import Invoice
+from iec_api.models.meter_reading import MeterReadings
+from iec_api.models.remote_reading import RemoteReadingResponse
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # Optional, the "export" extra
+    _HAS_ORJSON = False
+
+EXPORT_BUFFER_SIZE = 64 * 1024  # Bytes buffered between writes of the async export
+
+READING_COLUMNS = (
+    "contract_number",
+    "meter_serial",
+    "meter_code",
+    "meter_kind",
+    "interval",
+    "consumption",
+    "back_stream",
+    "status",
+)
+INVOICE_COLUMNS = (
+    "contract_number",
+    "invoice_id",
+    "document_id",
+    "order_number",
+    "from_date",
+    "to_date",
+    "full_date",
+    "last_date",
+    "days_period",
+    "amount_origin",
+    "amount_paid",
+    "amount_to_pay",
+    "invoice_payment_status",
+    "invoice_type",
+    "has_direct_debit",
+    "reading_code",
+    "consumption",
+)
+METER_READING_COLUMNS = (
+    "contract_account",
+    "serial_number",
+    "material_number",
+    "register_number",
+    "reading",
+    "reading_date",
+    "reading_code",
+    "usage",
+)
+
+
+class ExportFormat(Enum):
+    """Export Format enum."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+def reading_rows(responses: Iterable[RemoteReadingResponse]) -> Iterator[tuple]:
+    """Rows of the period consumptions of remote reading responses, in READING_COLUMNS order."""
+    for response in responses:
+        for meter in response.meter_list:
+            prefix = (response.contract_number, meter.meter_serial, meter.meter_code, meter.meter_kind)
+            for period in meter.period_consumptions:
+                yield *prefix, period.interval, period.consumption, period.back_stream, period.status
+
+
+def invoice_rows(invoices: Iterable[Invoice]) -> Iterator[tuple]:
+    """Rows of invoices, in INVOICE_COLUMNS order."""
+    for invoice in invoices:
+        yield (
+            invoice.contract_number,
+            invoice.invoice_id,
+            invoice.document_id,
+            invoice.order_number,
+            invoice.from_date,
+            invoice.to_date,
+            invoice.full_date,
+            invoice.last_date,
+            invoice.days_period,
+            invoice.amount_origin,
+            invoice.amount_paid,
+            invoice.amount_to_pay,
+            invoice.invoice_payment_status,
+            invoice.invoice_type,
+            invoice.has_direct_debit,
+            invoice.reading_code,
+            invoice.consumption,
+        )
+
+
+def meter_reading_rows(meter_readings: Iterable[MeterReadings]) -> Iterator[tuple]:
+    """Rows of the readings of the last meters, in METER_READING_COLUMNS order."""
+    for readings in meter_readings:
+        for meter in readings.last_meters or []:
+            prefix = (readings.contract_account, meter.serial_number, meter.material_number, meter.register_number)
+            for reading in meter.meter_readings:
+                yield *prefix, reading.reading, reading.reading_date, reading.reading_code, reading.usage
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date):  # Including datetime
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Type {type(value).__name__} is not JSON serializable")
+
+
+class RowEncoder:
+    """Encodes rows of a stable column schema into NDJSON lines or CSV records, reusing its buffers."""
+
+    def __init__(self, columns: tuple[str, ...], export_format: ExportFormat):
+        self.columns = columns
+        self.export_format = export_format
+        self._buffer = io.StringIO()
+        self._csv_writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def header(self) -> bytes:
+        """The CSV header, empty for NDJSON."""
+        return self._encode_csv(self.columns) if self.export_format == ExportFormat.CSV else b""
+
+    def _encode_csv(self, row: Iterable[Any]) -> bytes:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._csv_writer.writerow(value.isoformat() if isinstance(value, date) else value for value in row)
+        return self._buffer.getvalue().encode()
+
+    def encode(self, row: tuple) -> bytes:
+        """Encode a row, as a line ending with a newline."""
+        if self.export_format == ExportFormat.CSV:
+            return self._encode_csv(row)
+        record = dict(zip(self.columns, row))
+        if _HAS_ORJSON:
+            return orjson.dumps(record, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+        return (json.dumps(record, default=_json_default, ensure_ascii=False) + "\n").encode()
+
+
+def export_rows(
+    rows: Iterable[tuple],
+    columns: tuple[str, ...],
+    write: Callable[[bytes], Any],
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    header: bool = True,
+) -> int:
+    """
+    Export rows, writing every row as soon as it is encoded.
+    Args:
+        rows (Iterable[tuple]): The rows, e.g. reading_rows(responses).
+        columns (tuple[str, ...]): The column names, e.g. READING_COLUMNS.
+        write (Callable[[bytes], Any]): Writes encoded bytes, e.g. the write of a file opened in binary mode.
+        export_format (ExportFormat): The format.
+        header (bool): Whether to write the CSV header.
+    Returns:
+        int: Number of exported rows.
+    """
+    encoder = RowEncoder(columns, export_format)
+    if header and export_format == ExportFormat.CSV:
+        write(encoder.header())
+
+    count = 0
+    for row in rows:
+        write(encoder.encode(row))
+        count += 1
+    return count
+
+
+async def export_rows_async(
+    rows: Iterable[tuple] | AsyncIterable[tuple],
+    columns: tuple[str, ...],
+    write: Callable[[bytes], Awaitable[Any]],
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    header: bool = True,
+    buffer_size: Optional[int] = EXPORT_BUFFER_SIZE,
+) -> int:
+    """
+    Export rows to an async writer, buffering up to buffer_size bytes between writes.
+    Args:
+        rows (Iterable[tuple] | AsyncIterable[tuple]): The rows.
+        columns (tuple[str, ...]): The column names.
+        write (Callable[[bytes], Awaitable[Any]]): Writes encoded bytes, e.g. the write of an aiofiles file.
+        export_format (ExportFormat): The format.
+        header (bool): Whether to write the CSV header.
+        buffer_size (int): Bytes buffered between writes, None to write every row.
+    Returns:
+        int: Number of exported rows.
+    """
+    encoder = RowEncoder(columns, export_format)
+    buffer = bytearray(encoder.header() if header else b"")
+    count = 0
+
+    async def add(row: tuple):
+        nonlocal count
+        buffer.extend(encoder.encode(row))
+        count += 1
+        if len(buffer) >= (buffer_size or 0):
+            await write(bytes(buffer))
+            buffer.clear()
+
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            await add(row)
+    else:
+        for row in rows:
+            await add(row)
+
+    if buffer:
+        await write(bytes(buffer))
+    return count
@@ -3,7 +3,9 @@ from typing import List, Optional
 from aiohttp import ClientSession
 
 from iec_api import commons
+from iec_api.commons import FanOutResult
 from iec_api.const import (
+    DEFAULT_ACCOUNTS_TRANSACTIONS_CHUNK_SIZE,
     GET_OUTAGES_FROM_FAULT_PORTAL_URL,
     GET_USER_PROFILE_FROM_FAULT_PORTAL_URL,
     HEADERS_WITH_AUTH,
@@ -51,6 +53,48 @@ async def post_accounts_transactions(
     return AccountsTransactionsResponse.from_dict(response)
 
 
+async def post_accounts_transactions_in_chunks(
+    session: ClientSession,
+    token: JWT,
+    accounts: List[str],
+    state_code: int = 0,
+    chunk_size: int = DEFAULT_ACCOUNTS_TRANSACTIONS_CHUNK_SIZE,
+    max_concurrency: int = 10,
+    timeout: Optional[float] = None,
+) -> dict[str, FanOutResult[str, AccountsTransactionsResponse]]:
+    """Post Accounts Transactions of many accounts to IEC Fault Portal API, in concurrent chunks.
+
+    Args:
+        session: The aiohttp ClientSession object.
+        token: The JWT token for authentication.
+        accounts: List of account UUIDs to query, duplicates are sent once.
+        state_code: The state code filter (default 0).
+        chunk_size: Maximal number of accounts per request.
+        max_concurrency: Maximal number of concurrent requests.
+        timeout: Timeout in seconds of every single request.
+
+    Returns:
+        dict[str, FanOutResult[str, AccountsTransactionsResponse]]: The response (or error) of the chunk of every
+        account, by account UUID.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    accounts = list(dict.fromkeys(accounts))
+    chunks = [accounts[i : i + chunk_size] for i in range(0, len(accounts), chunk_size)]
+
+    results: dict[str, FanOutResult[str, AccountsTransactionsResponse]] = {}
+    async for chunk in commons.fan_out(
+        range(len(chunks)),
+        lambda i: post_accounts_transactions(session, token, chunks[i], state_code),
+        max_concurrency,
+        timeout,
+    ):
+        for account in chunks[chunk.key]:
+            results[account] = FanOutResult(key=account, result=chunk.result, error=chunk.error)
+    return {account: results[account] for account in accounts}
+
+
 async def get_outages_by_account(
     session: ClientSession, token: JWT, account_id: str
 ) -> Optional[List[FaultPortalOutage]]:
@@ -58,6 +102,8 @@ async def get_outages_by_account(
 
     headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH, token.id_token)
     # sending get request and saving the response as response object
-    response = await commons.send_get_request(session=session, url=GET_OUTAGES_FROM_FAULT_PORTAL_URL, headers=headers)
+    response = await commons.send_get_request(
+        session=session, url=GET_OUTAGES_FROM_FAULT_PORTAL_URL.format(account_id=account_id), headers=headers
+    )
 
     return OutagesResponse.from_dict(response).data_collection
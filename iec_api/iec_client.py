@@ -1,22 +1,38 @@
 import asyncio
 import atexit
 import logging
+import os
+import time
+from contextlib import aclosing
 from datetime import datetime
-from typing import List, Optional
-from uuid import UUID
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, TypeVar
+from uuid import UUID, uuid4
 
-import aiofiles
 import aiohttp
 import jwt
 from aiohttp import ClientSession
 
 from iec_api import commons, data, fault_portal_data, login, masa_data, static_data
+from iec_api.account_snapshot import DEFAULT_SNAPSHOT_CONCURRENCY, AccountSnapshot, ContractSnapshot
+from iec_api.bill_projection import BillProjection, project_bill
+from iec_api.city_index import CityIndex
+from iec_api.commons import FanOutResult
+from iec_api.compact_outage import (
+    CompactOutage,
+    OutageSource,
+    from_fault_portal_outages,
+    from_outages,
+    merge_outages,
+)
+from iec_api.const import DEFAULT_ACCOUNTS_TRANSACTIONS_CHUNK_SIZE, DEFAULT_MASA_PAGE_SIZE, TIMEZONE
 from iec_api.fault_portal_models.accounts_transactions import AccountsTransactionsResponse
 from iec_api.fault_portal_models.outages import FaultPortalOutage
 from iec_api.fault_portal_models.user_profile import UserProfile
+from iec_api.invoice_collection import InvoiceCollection
+from iec_api.lookup_index import LookupIndex
 from iec_api.masa_api_models.cities import City
 from iec_api.masa_api_models.contact_account_user_profile import MasaMainPortalContactAccountUserProfile
-from iec_api.masa_api_models.equipment import GetEquipmentResponse
+from iec_api.masa_api_models.equipment import GetEquipmentResponse, Item
 from iec_api.masa_api_models.lookup import GetLookupResponse
 from iec_api.masa_api_models.manage_shared_accounts import ManageSharedAccountsResponse
 from iec_api.masa_api_models.masa_types import IDWrapper
@@ -26,19 +42,20 @@ from iec_api.masa_api_models.send_shared_account_invitation import SendSharedAcc
 from iec_api.masa_api_models.titles import GetTitleResponse
 from iec_api.masa_api_models.user_profile import MasaUserProfile
 from iec_api.masa_api_models.volt_levels import VoltLevel
+from iec_api.masa_context import MasaContext
 from iec_api.models.account import Account
 from iec_api.models.contract import Contract
 from iec_api.models.contract_check import ContractCheck
 from iec_api.models.customer import Customer
 from iec_api.models.customer_mobile import CustomerMobileResponse
-from iec_api.models.device import Device, Devices
+from iec_api.models.device import ConnectionSize, Device, Devices
 from iec_api.models.device_identity import DeviceDetails
 from iec_api.models.device_in import DeviceInResponse
 from iec_api.models.device_type import DeviceType
 from iec_api.models.efs import EfsMessage
 from iec_api.models.electric_bill import ElectricBill
 from iec_api.models.exceptions import IECLoginError
-from iec_api.models.invoice import GetInvoicesBody
+from iec_api.models.invoice import GetInvoicesBody, Invoice
 from iec_api.models.jwt import JWT
 from iec_api.models.meter_reading import MeterReadings
 from iec_api.models.mobility import MobilityStatus
@@ -46,21 +63,37 @@ from iec_api.models.outages import Outage
 from iec_api.models.remote_reading import ReadingResolution, RemoteReadingResponse
 from iec_api.models.social_discount import SocialDiscount
 from iec_api.models.touz_compatibility import TouzCompatibility
+from iec_api.outage_watcher import OutageWatcher
+from iec_api.reading_cache import RemoteReadingCache
+from iec_api.tariff_cost import TariffPlan
+from iec_api.token_store import TokenStore
 from iec_api.usage_calculator.calculator import UsageCalculator
 
+T = TypeVar("T")
 logger = logging.getLogger(__name__)
 
+INVOICES_TTL = 6 * 60 * 60  # Invoices are issued every two months, the invoice list rarely changes
+DEFAULT_FAN_OUT_CONCURRENCY = 10
+DEFAULT_FAN_OUT_TIMEOUT = 60
+DEFAULT_MERGED_OUTAGES_TIMEOUT = 10
+
 
 class IecClient:
     """IEC API Client."""
 
-    def __init__(self, user_id: str | int, session: Optional[ClientSession] = None):
+    def __init__(
+        self,
+        user_id: str | int,
+        session: Optional[ClientSession] = None,
+        executor: Optional[commons.BlockingExecutor] = None,
+    ):
         """
         Initializes the class with the provided user ID and optionally logs in automatically.
 
         Args:
         session (ClientSession): The aiohttp ClientSession object.
         user_id (str): The user ID (SSN) to be associated with the instance.
+        executor (BlockingExecutor): Runs the blocking work (crypto, file I/O and user input), default is shared.
         automatically_login (bool): Whether to automatically log in the user. Default is False.
         """
 
@@ -68,21 +101,17 @@ class IecClient:
             raise ValueError("User ID must be a valid Israeli ID.")
 
         # Custom Logger to the session
-        trace_config = aiohttp.TraceConfig()
-        trace_config.on_request_start.append(commons.on_request_start_debug)  # type: ignore[arg-type]
-        trace_config.on_request_chunk_sent.append(commons.on_request_chunk_sent_debug)  # type: ignore[arg-type]
-        trace_config.on_request_end.append(commons.on_request_end_debug)  # type: ignore[arg-type]
-        trace_config.freeze()
-
-        # Increase timeout to handle DNS resolution delays
-        timeout = aiohttp.ClientTimeout(total=120, connect=60, sock_read=60)
+        trace_config = commons.get_debug_trace_config()
+
         if not session:
-            session = aiohttp.ClientSession(trace_configs=[trace_config], timeout=timeout)
+            session = aiohttp.ClientSession(trace_configs=[trace_config], timeout=commons.DEFAULT_CLIENT_TIMEOUT)
             atexit.register(self._shutdown)
-        else:
+        elif trace_config not in session.trace_configs:
             session.trace_configs.append(trace_config)
 
         self._session = session
+        self._shared_session: bool = False  # Whether the session is owned by a ClientPool and outlives the client
+        self._executor = executor or commons.get_default_executor()
 
         self._state_token: Optional[str] = None  # Token for maintaining the state of the user's session
         self._factor_id: Optional[str] = None  # Factor ID for multifactor authentication
@@ -96,7 +125,9 @@ class IecClient:
         self._bp_number: Optional[str] = None  # BP Number associated with the instance
         self._contract_id: Optional[str] = None  # Contract ID associated with the instance
         self._account_id: Optional[str] = None  # Account ID associated with the instance
-        self._masa_connection_size_map: Optional[dict[int, str]] = None
+        self._reading_cache = RemoteReadingCache()  # Settled remote readings, by contract and meter
+        self._meter_info: dict[str, tuple[Device, ConnectionSize]] = {}  # First device by contract
+        self._invoice_collections: dict[str, tuple[float, InvoiceCollection]] = {}  # (fetch time, ...) by contract
 
     def _shutdown(self):
         if not self._session.closed:
@@ -108,7 +139,8 @@ class IecClient:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit - properly close the session."""
-        await self._session.close()
+        if not self._shared_session:
+            await self._session.close()
 
     # -------------
     # Data methods:
@@ -297,15 +329,54 @@ class IecClient:
         invoice_number: str | int,
         bp_number: Optional[str | int] = None,
         contract_id: Optional[str | int] = None,
-    ):
+    ) -> int:
         """
         Get PDF of invoice from IEC api
+        The PDF is streamed to a temporary file, which replaces the file only when the download is complete.
         Args:
             self: The instance of the class.
             file_path (str): Path to save the bill to
             invoice_number (str): The requested invoice number
             bp_number (str): The BP number of the meter.
             contract_id (str): The contract ID associated with the meter.
+        Returns:
+            int: The size of the PDF in bytes, the file is not written if empty
+        """
+        executor = self._executor
+        temp_path = f"{file_path}.{uuid4().hex}.part"
+        try:
+            f = await executor.run(open, temp_path, "wb")
+            try:
+
+                async def write(chunk: bytes):
+                    await executor.run(f.write, chunk)
+
+                size = await self.stream_invoice_pdf(write, invoice_number, bp_number, contract_id)
+            finally:
+                await executor.run(f.close)
+            if size:
+                await executor.run(os.replace, temp_path, file_path)
+            return size
+        finally:
+            await executor.run(commons.remove_file, temp_path)
+
+    async def stream_invoice_pdf(
+        self,
+        write: Callable[[bytes], Awaitable[Any]],
+        invoice_number: str | int,
+        bp_number: Optional[str | int] = None,
+        contract_id: Optional[str | int] = None,
+    ) -> int:
+        """
+        Stream PDF of invoice from IEC api to an async writer, without loading it into memory
+        Args:
+            self: The instance of the class.
+            write (Callable[[bytes], Awaitable]): The async write function, e.g. the write method of an aiofiles file
+            invoice_number (str): The requested invoice number
+            bp_number (str): The BP number of the meter.
+            contract_id (str): The contract ID associated with the meter.
+        Returns:
+            int: The number of bytes written
         """
         await self.check_token()
 
@@ -321,10 +392,7 @@ class IecClient:
         if not contract_id:
             raise ValueError("Contract ID must be provided")
 
-        response_bytes = await data.get_invoice_pdf(self._session, self._token, bp_number, contract_id, invoice_number)
-        if response_bytes:
-            async with aiofiles.open(file_path, "wb") as f:
-                await f.write(response_bytes)
+        return await data.stream_invoice_pdf(self._session, self._token, bp_number, contract_id, invoice_number, write)
 
     async def send_consumption_report_to_mail(
         self,
@@ -451,9 +519,11 @@ class IecClient:
         from_date: datetime,
         resolution: ReadingResolution = ReadingResolution.DAILY,
         contract_id: Optional[str] = None,
+        use_cache: bool = True,
     ) -> Optional[RemoteReadingResponse]:
         """
         Retrieves a remote reading for a specific meter using the provided parameters.
+        Coarser resolutions are derived locally from previously fetched days when the whole range is cached.
         Args:
             self: The instance of the class.
             meter_kind (str): The meter kind (for example from devices API).
@@ -463,6 +533,7 @@ class IecClient:
             from_date (str): The start date for the remote reading.
             resolution (int): The resolution of the remote reading.
             contract_id (str): The contract id.
+            use_cache (bool): Whether to serve settled days from the reading cache. Default is True.
         Returns:
             RemoteReadingResponse: The response containing the remote reading or None if not found
         """
@@ -473,7 +544,11 @@ class IecClient:
         if not contract_id:
             raise ValueError("Contract id must be provided")
 
-        return await data.get_remote_reading(
+        cache_key = (contract_id, meter_kind, meter_serial_number, str(meter_code))
+        if use_cache and (cached := self._reading_cache.get(cache_key, from_date, resolution)):
+            return cached
+
+        response = await data.get_remote_reading(
             session=self._session,
             token=self._token,
             contract_id=contract_id,
@@ -484,6 +559,14 @@ class IecClient:
             from_date=from_date,
             resolution=resolution,
         )
+        self._reading_cache.put(cache_key, from_date, resolution, response)
+        return response
+
+    def clear_reading_cache(self):
+        """
+        Drop all cached remote readings.
+        """
+        self._reading_cache.clear()
 
     async def get_device_type(
         self, bp_number: Optional[str] = None, contract_id: Optional[str] = None
@@ -553,20 +636,8 @@ class IecClient:
         """Get get_distribution tariff"""
 
         if not phase_count:
-            devices = await self.get_devices()
-
-            if not devices:
-                raise ValueError("No Devices found")
-            device = devices[0]
-
-            if not device.device_number:
-                raise ValueError("Device number is missing")
-
-            device_details = await self.get_device_by_device_id(device.device_number)
-            if not device_details or not device_details.counter_devices:
-                raise ValueError("No Device Details")
-
-            phase_count = device_details.counter_devices[0].connection_size.phase
+            _, connection_size = await self._get_meter_info()
+            phase_count = connection_size.phase
 
         return await static_data.get_distribution_tariff(self._session, phase_count)
 
@@ -574,7 +645,28 @@ class IecClient:
         """Get delivery tariff"""
 
         if not phase_count:
-            devices = await self.get_devices()
+            _, connection_size = await self._get_meter_info()
+            phase_count = connection_size.phase
+
+        return await static_data.get_delivery_tariff(self._session, phase_count)
+
+    async def _get_meter_info(self, contract_id: Optional[str] = None) -> tuple[Device, ConnectionSize]:
+        """
+        Get the first device of the contract and its connection size, cached per contract
+        Args:
+            self: The instance of the class.
+            contract_id (str): The Contract ID. Defaults to client's Contract ID.
+        Returns:
+            tuple[Device, ConnectionSize]: The meter device and its connection size
+        """
+        if not contract_id:
+            contract_id = self._contract_id
+
+        if not contract_id:
+            raise ValueError("Contract ID must be provided")
+
+        if contract_id not in self._meter_info:
+            devices = await self.get_devices(contract_id)
 
             if not devices:
                 raise ValueError("No Devices found")
@@ -583,41 +675,148 @@ class IecClient:
             if not device.device_number:
                 raise ValueError("Device number is missing")
 
-            device_details = await self.get_device_by_device_id(device.device_number)
+            device_details = await self.get_device_by_device_id(device.device_number, contract_id)
             if not device_details or not device_details.counter_devices:
                 raise ValueError("No Device Details")
 
-            phase_count = device_details.counter_devices[0].connection_size.phase
+            self._meter_info[contract_id] = (device, device_details.counter_devices[0].connection_size)
 
-        return await static_data.get_delivery_tariff(self._session, phase_count)
+        return self._meter_info[contract_id]
 
-    async def get_kva_tariff(self) -> float:
-        """Get KVA tariff"""
-        return await static_data.get_kva_tariff(self._session)
+    async def get_invoice_collection(
+        self, bp_number: Optional[str] = None, contract_id: Optional[str] = None, max_age: float = INVOICES_TTL
+    ) -> InvoiceCollection:
+        """
+        Get the billing invoices of the contract as an indexed collection, cached per contract
+        Args:
+            self: The instance of the class.
+            bp_number (str): The BP number of the meter.
+            contract_id (str): The Contract ID
+            max_age (float): Maximal age in seconds of a cached collection, 0 to always fetch the invoices.
+        Returns:
+            InvoiceCollection: The invoices, indexed by date, payment status and contract
+        """
+        if not contract_id:
+            contract_id = self._contract_id
 
-    async def get_power_size(self, connection: Optional[str] = None) -> float:
-        """Get delivery tariff"""
+        if not contract_id:
+            raise ValueError("Contract ID must be provided")
 
-        if not connection:
-            devices = await self.get_devices()
+        cached = self._invoice_collections.get(contract_id)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
 
-            if not devices:
-                raise ValueError("No Devices found")
-            device = devices[0]
+        collection = InvoiceCollection.from_response(await self.get_billing_invoices(bp_number, contract_id))
+        self._invoice_collections[contract_id] = (time.monotonic(), collection)
+        return collection
 
-            if not device.device_number:
-                raise ValueError("Device number is missing")
+    async def _get_last_invoice(self, bp_number: str, contract_id: str) -> Optional[Invoice]:
+        """
+        Get the latest invoice of the contract, from the cached invoice collection
+        """
+        return (await self.get_invoice_collection(bp_number, contract_id)).latest
 
-            device_details = await self.get_device_by_device_id(device.device_number)
-            if not device_details or not device_details.counter_devices:
-                raise ValueError("No Device Details")
+    async def get_bill_projection(
+        self, bp_number: Optional[str] = None, contract_id: Optional[str] = None
+    ) -> BillProjection:
+        """
+        Project the amount of the current billing cycle.
+        Independent inputs are fetched concurrently, and the meter info, last invoice and tariffs are cached,
+        so repeated polls only fetch the current remote reading.
+        Args:
+            self: The instance of the class.
+            bp_number (str): The BP number of the meter.
+            contract_id (str): The Contract ID
+        Returns:
+            BillProjection: The projected bill of the current billing cycle
+        """
+        await self.check_token()
 
-            connection = device_details.counter_devices[0].connection_size.representative_connection_size
+        if not bp_number:
+            bp_number = self._bp_number
+
+        if not bp_number:
+            raise ValueError("BP number must be provided")
+
+        if not contract_id:
+            contract_id = self._contract_id
+
+        if not contract_id:
+            raise ValueError("Contract ID must be provided")
+
+        (device, connection_size), last_invoice, kwh_tariff = await asyncio.gather(
+            self._get_meter_info(contract_id), self._get_last_invoice(bp_number, contract_id), self.get_kwh_tariff()
+        )
+
+        if not device.device_number or not device.device_code:
+            raise ValueError("Device number and code are missing")
+
+        async def get_fixed_tariffs() -> tuple[float, float, float]:
+            # These share a single tariffs page, so fetching them one after the other hits the cache
+            distribution_tariff = await self.get_distribution_tariff(connection_size.phase)
+            delivery_tariff = await self.get_delivery_tariff(connection_size.phase)
+            kva_tariff = await self.get_kva_tariff()
+            return distribution_tariff, delivery_tariff, kva_tariff
+
+        now = datetime.now(TIMEZONE)
+        last_invoice_date = last_invoice.to_date if last_invoice and last_invoice.to_date else now
+        reading, (distribution_tariff, delivery_tariff, kva_tariff), power_size = await asyncio.gather(
+            self.get_remote_reading(
+                "Consumption",
+                device.device_number,
+                int(device.device_code),
+                last_invoice_date,
+                now,
+                ReadingResolution.DAILY,
+                contract_id,
+            ),
+            get_fixed_tariffs(),
+            # The KVA tariff already includes VAT, so the power size must not
+            self.get_power_size(connection_size.representative_connection_size, include_vat=False),
+        )
+
+        if not reading or not reading.meter_list or not reading.meter_list[0].future_consumption_info:
+            raise ValueError("No Future Consumption Info")
+
+        return project_bill(
+            reading.meter_list[0].future_consumption_info,
+            kwh_tariff=kwh_tariff,
+            distribution_tariff=distribution_tariff,
+            delivery_tariff=delivery_tariff,
+            power_size=power_size,
+            kva_tariff=kva_tariff,
+            last_invoice=last_invoice,
+        )
+
+    async def get_kva_tariff(self) -> float:
+        """Get KVA tariff"""
+        return await static_data.get_kva_tariff(self._session)
+
+    async def get_power_size(self, connection: Optional[str] = None, include_vat: bool = True) -> float:
+        """Get power size, including VAT unless include_vat is False"""
+
+        if not connection:
+            _, connection_size = await self._get_meter_info()
+            connection = connection_size.representative_connection_size
 
         if "X" not in connection:  # Solve cases where the connection size is "25"
             connection = "1X" + connection
 
-        return await static_data.get_power_size(self._session, connection)
+        return await static_data.get_power_size(self._session, connection, include_vat)
+
+    async def get_flat_tariff_plan(self, phase_count: Optional[int] = None) -> TariffPlan:
+        """
+        Get the flat home tariff plan, for pricing readings with tariff_cost.compute_costs
+        Args:
+            self: The instance of the class.
+            phase_count (int): The number of phases of the connection. Defaults to the first device's.
+        Returns:
+            TariffPlan: The flat plan, including distribution and delivery charges
+        """
+        kwh_tariff = await self.get_kwh_tariff()
+        distribution_tariff = await self.get_distribution_tariff(phase_count)
+        delivery_tariff = await self.get_delivery_tariff(phase_count)
+        return TariffPlan(name="flat", kwh_rate=kwh_tariff, fixed_monthly_charge=distribution_tariff + delivery_tariff)
 
     async def get_usage_calculator(self) -> UsageCalculator:
         """
@@ -777,6 +976,274 @@ class IecClient:
 
         return await data.get_outages_by_account(self._session, self._token, account_id)
 
+    # ----------------
+    # Aggregate methods
+    # ----------------
+
+    async def get_account_snapshot(
+        self, bp_number: Optional[str] = None, max_concurrency: int = DEFAULT_SNAPSHOT_CONCURRENCY
+    ) -> AccountSnapshot:
+        """
+        Get the customer, all of their contracts, and the devices, last meter reading, invoices and electric bill
+        of every contract. Independent calls run concurrently, bounded by max_concurrency, and a failed call is
+        reported in the snapshot errors instead of failing the whole snapshot.
+        Args:
+            self: The instance of the class.
+            bp_number (str): The BP number. Defaults to client's BP number, or the customer's.
+            max_concurrency (int): Maximal number of concurrent calls.
+        Returns:
+            AccountSnapshot: The account snapshot
+        """
+        await self.check_token()
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def call(errors: dict[str, Exception], name: str, coro: Awaitable[T]) -> Optional[T]:
+            async with semaphore:
+                try:
+                    return await coro
+                except Exception as ex:
+                    logger.warning(f"Account snapshot call {name} failed: {ex}")
+                    errors[name] = ex
+                    return None
+
+        snapshot = AccountSnapshot(bp_number=bp_number or self._bp_number)
+        if snapshot.bp_number:
+            snapshot.customer, contracts = await asyncio.gather(
+                call(snapshot.errors, "customer", self.get_customer()),
+                call(snapshot.errors, "contracts", self.get_contracts(snapshot.bp_number)),
+            )
+        else:
+            snapshot.customer = await call(snapshot.errors, "customer", self.get_customer())
+            if not snapshot.customer:
+                return snapshot
+            snapshot.bp_number = snapshot.customer.bp_number
+            contracts = await call(snapshot.errors, "contracts", self.get_contracts(snapshot.bp_number))
+
+        bp = snapshot.bp_number
+
+        async def get_devices_with_details(contract_snapshot: ContractSnapshot):
+            contract_id = contract_snapshot.contract.contract_id
+            errors = contract_snapshot.errors
+            contract_snapshot.devices = await call(errors, "devices", self.get_devices(contract_id))
+            device_numbers = [
+                device.device_number for device in contract_snapshot.devices or [] if device.device_number
+            ]
+            details = await asyncio.gather(
+                *(
+                    call(errors, f"device_details:{number}", self.get_device_by_device_id(number, contract_id))
+                    for number in device_numbers
+                )
+            )
+            contract_snapshot.device_details = {
+                number: detail for number, detail in zip(device_numbers, details) if detail is not None
+            }
+
+        async def get_contract_snapshot(contract: Contract) -> ContractSnapshot:
+            contract_snapshot = ContractSnapshot(contract=contract)
+            contract_id = contract.contract_id
+            errors = contract_snapshot.errors
+            _, last_meter_reading, billing_invoices, electric_bill = await asyncio.gather(
+                get_devices_with_details(contract_snapshot),
+                call(errors, "last_meter_reading", self.get_last_meter_reading(bp, contract_id)),
+                call(errors, "billing_invoices", self.get_billing_invoices(bp, contract_id)),
+                call(errors, "electric_bill", self.get_electric_bill(bp, contract_id)),
+            )
+            contract_snapshot.last_meter_reading = last_meter_reading
+            contract_snapshot.billing_invoices = billing_invoices
+            contract_snapshot.electric_bill = electric_bill
+            return contract_snapshot
+
+        snapshot.contracts = list(await asyncio.gather(*(get_contract_snapshot(c) for c in contracts or [])))
+        return snapshot
+
+    async def get_merged_outages(
+        self, account_id: Optional[str] = None, timeout: Optional[float] = DEFAULT_MERGED_OUTAGES_TIMEOUT
+    ) -> List[CompactOutage]:
+        """
+        Get the outages of the account from both the IEC API and the Fault Portal concurrently, merged into compact
+        outages deduplicated by disconnect key. The IEC API wins, the Fault Portal fills in missing fields, regardless
+        of which source answers first.
+        A source failing or exceeding the timeout is skipped, so the call never waits longer than the timeout.
+        Args:
+            self: The instance of the class.
+            account_id (str): The Account ID of the meter.
+            timeout (float): Latency budget in seconds.
+        Returns:
+            list[CompactOutage]: The merged outages
+        """
+        await self.check_token()
+
+        if not account_id:
+            account_id = self._account_id
+
+        if not account_id:
+            raise ValueError("Account Id must be provided")
+
+        async def fetch(source: OutageSource) -> List[CompactOutage]:
+            if source == OutageSource.FAULT_PORTAL:
+                outages = await fault_portal_data.get_outages_by_account(self._session, self._token, account_id)
+                return from_fault_portal_outages(outages)
+            return from_outages(await data.get_outages_by_account(self._session, self._token, account_id))
+
+        sources: dict[OutageSource, List[CompactOutage]] = {}
+        errors: list[Exception] = []
+        async for result in commons.fan_out(list(OutageSource), fetch, len(OutageSource), timeout):
+            if result.error:
+                logger.warning(f"Failed getting {result.key.value} outages of account {account_id}: {result.error}")
+                errors.append(result.error)
+            else:
+                sources[result.key] = result.result or []
+
+        if not sources:
+            raise errors[0]
+        return merge_outages(*(sources[source] for source in OutageSource if source in sources))
+
+    def create_outage_watcher(
+        self, account_ids: Optional[List[str]] = None, fault_portal: bool = False, **kwargs
+    ) -> OutageWatcher:
+        """
+        Create a watcher of the outages of accounts, emitting only the new, updated and resolved disconnects.
+        Args:
+            self: The instance of the class.
+            account_ids (list[str]): The Account IDs. Defaults to client's account ID.
+            fault_portal (bool): Whether to poll the Fault Portal outages instead of the IEC API outages.
+            **kwargs: Passed to OutageWatcher, e.g. min_interval, max_interval and on_event.
+        Returns:
+            OutageWatcher: The watcher, polling once watched or run
+        """
+        if not account_ids:
+            account_ids = [self._account_id] if self._account_id else []
+
+        if not account_ids:
+            raise ValueError("Account Id must be provided")
+
+        async def fetch(account_id: str) -> list[CompactOutage]:
+            if fault_portal:
+                return from_fault_portal_outages(await self.get_fault_portal_outages_by_account(account_id))
+            return from_outages(await self.get_outages_by_account(account_id))
+
+        return OutageWatcher(fetch, account_ids, **kwargs)
+
+    async def iter_all_contracts(
+        self,
+        func: Callable[[str], Awaitable[T]],
+        contract_ids: Optional[List[str]] = None,
+        bp_number: Optional[str] = None,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        timeout: Optional[float] = DEFAULT_FAN_OUT_TIMEOUT,
+    ) -> AsyncIterator[FanOutResult[str, T]]:
+        """
+        Call func for every contract concurrently and yield the results as they complete.
+        Args:
+            self: The instance of the class.
+            func (Callable[[str], Awaitable[T]]): The call to make per contract ID.
+            contract_ids (list[str]): The Contract IDs. Defaults to all the contracts of the BP number.
+            bp_number (str): The BP number, used when contract_ids are not provided.
+            max_concurrency (int): Maximal number of concurrent calls.
+            timeout (float): Timeout in seconds of every single contract call.
+        Returns:
+            AsyncIterator[FanOutResult[str, T]]: Results keyed by Contract ID, in completion order
+        """
+        await self.check_token()
+
+        if contract_ids is None:
+            contracts = await self.get_contracts(bp_number)
+            contract_ids = [contract.contract_id for contract in contracts]
+
+        # Closing this iterator early also cancels the calls still running in the fan out
+        async with aclosing(commons.fan_out(contract_ids, func, max_concurrency, timeout)) as results:
+            async for result in results:
+                yield result
+
+    async def _get_for_all_contracts(
+        self, func: Callable[[str], Awaitable[T]], **kwargs
+    ) -> dict[str, FanOutResult[str, T]]:
+        return {result.key: result async for result in self.iter_all_contracts(func, **kwargs)}
+
+    async def get_devices_for_all_contracts(self, **kwargs) -> dict[str, FanOutResult[str, Optional[List[Device]]]]:
+        """
+        Get the devices of all contracts concurrently
+        Args:
+            self: The instance of the class.
+            kwargs: contract_ids, bp_number, max_concurrency and timeout, as in iter_all_contracts
+        Returns:
+            dict[str, FanOutResult]: The devices or the error, by Contract ID
+        """
+        return await self._get_for_all_contracts(self.get_devices, **kwargs)
+
+    async def get_billing_invoices_for_all_contracts(
+        self, bp_number: Optional[str] = None, only_open: Optional[bool] = None, **kwargs
+    ) -> dict[str, FanOutResult[str, Optional[GetInvoicesBody]]]:
+        """
+        Get the billing invoices of all contracts concurrently
+        Args:
+            self: The instance of the class.
+            bp_number (str): The BP number.
+            only_open (bool): If True, only return open invoices
+            kwargs: contract_ids, max_concurrency and timeout, as in iter_all_contracts
+        Returns:
+            dict[str, FanOutResult]: The billing invoices or the error, by Contract ID
+        """
+        bp_number = bp_number or self._bp_number
+        return await self._get_for_all_contracts(
+            lambda contract_id: self.get_billing_invoices(bp_number, contract_id, only_open),
+            bp_number=bp_number,
+            **kwargs,
+        )
+
+    async def get_electric_bill_for_all_contracts(
+        self, bp_number: Optional[str] = None, **kwargs
+    ) -> dict[str, FanOutResult[str, Optional[ElectricBill]]]:
+        """
+        Get the electric bill of all contracts concurrently
+        Args:
+            self: The instance of the class.
+            bp_number (str): The BP number.
+            kwargs: contract_ids, max_concurrency and timeout, as in iter_all_contracts
+        Returns:
+            dict[str, FanOutResult]: The electric bill or the error, by Contract ID
+        """
+        bp_number = bp_number or self._bp_number
+        return await self._get_for_all_contracts(
+            lambda contract_id: self.get_electric_bill(bp_number, contract_id), bp_number=bp_number, **kwargs
+        )
+
+    async def get_remote_reading_for_all_contracts(
+        self,
+        last_invoice_date: datetime,
+        from_date: datetime,
+        resolution: ReadingResolution = ReadingResolution.DAILY,
+        **kwargs,
+    ) -> dict[str, FanOutResult[str, Optional[RemoteReadingResponse]]]:
+        """
+        Get the remote reading of the first meter of all contracts concurrently
+        Args:
+            self: The instance of the class.
+            last_invoice_date (datetime): The date of the last invoice.
+            from_date (datetime): The start date for the remote reading.
+            resolution (ReadingResolution): The resolution of the remote reading.
+            kwargs: contract_ids, bp_number, max_concurrency and timeout, as in iter_all_contracts
+        Returns:
+            dict[str, FanOutResult]: The remote reading or the error, by Contract ID
+        """
+
+        async def get_remote_reading(contract_id: str) -> Optional[RemoteReadingResponse]:
+            device, _ = await self._get_meter_info(contract_id)
+            if not device.device_number or not device.device_code:
+                raise ValueError("Device number and code are missing")
+            return await self.get_remote_reading(
+                "Consumption",
+                device.device_number,
+                int(device.device_code),
+                last_invoice_date,
+                from_date,
+                resolution,
+                contract_id,
+            )
+
+        return await self._get_for_all_contracts(get_remote_reading, **kwargs)
+
     # ----------------
     # Masa API Flow
     # ----------------
@@ -799,6 +1266,34 @@ class IecClient:
 
         return await masa_data.get_masa_equipments(self._session, self._token, masa_account_id)
 
+    async def iter_masa_equipment_by_account(
+        self,
+        masa_account_id: Optional[str] = None,
+        page_size: int = DEFAULT_MASA_PAGE_SIZE,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Item]:
+        """Iterate over the Equipment of all pages for the Account
+        Args:
+            self: The instance of the class.
+            masa_account_id (str): The MASA account ID of the meter.
+            page_size (int): Number of equipment items per page.
+            prefetch (int): Number of later pages fetched concurrently.
+        Returns:
+            AsyncIterator[Item]: The Equipment items, in page order
+        """
+        await self.check_token()
+
+        if not masa_account_id:
+            masa_account_id = self._account_id
+
+        if not masa_account_id:
+            raise ValueError("Account Id must be provided")
+
+        async for item in masa_data.iter_masa_equipments(
+            self._session, self._token, masa_account_id, page_size, prefetch
+        ):
+            yield item
+
     async def get_masa_user_profile(self) -> MasaUserProfile:
         """Get Masa User Profile
         Args:
@@ -832,6 +1327,17 @@ class IecClient:
 
         return await masa_data.get_masa_cities(self._session, self._token)
 
+    async def get_masa_city_index(self) -> CityIndex:
+        """Get Masa Cities indexed by ID, Shoval city code and normalized name
+        Args:
+            self: The instance of the class.
+        Returns:
+            CityIndex: Index of the Cities
+        """
+        await self.check_token()
+
+        return await masa_data.get_masa_city_index(self._session, self._token)
+
     async def get_masa_order_categories(self) -> List[OrderCategory]:
         """Get Masa Cities for the Account
         Args:
@@ -881,11 +1387,86 @@ class IecClient:
         await self.check_token()
         return await masa_data.get_masa_lookup(self._session, self._token)
 
-    async def get_masa_connection_size_from_masa(self, masa_account_id: Optional[str] = None) -> Optional[str]:
-        if not self._masa_connection_size_map:
-            lookup = await self.get_masa_lookup()
-            self._masa_connection_size_map = {obj.size_type: obj.name for obj in lookup.connection_size_types}
+    async def get_masa_lookup_index(self) -> LookupIndex:
+        """Get Masa Lookup indexed by the IDs and codes of every lookup category
+        Args:
+            self: The instance of the class.
+        Returns:
+            LookupIndex: Index of the Lookup, shared by all clients
+        """
+        await self.check_token()
+        return await masa_data.get_masa_lookup_index(self._session, self._token)
 
+    async def warm_up_masa_lookups(self):
+        """Load all the MASA lookups (cities, order categories, volt levels and lookup) concurrently
+        Args:
+            self: The instance of the class.
+        """
+        await self.check_token()
+        await masa_data.warm_up_masa_lookups(self._session, self._token)
+
+    async def get_masa_context(self, masa_account_id: Optional[str] = None) -> MasaContext:
+        """
+        Get the MASA user profiles, lookup, volt levels, and the equipment and order titles of the account, all
+        in a single round trip. The lookups come from the shared cache, and a failed call is reported in the
+        context errors instead of failing the whole context. The client's account ID is left unchanged.
+        Args:
+            self: The instance of the class.
+            masa_account_id (str): The MASA account ID. Defaults to client's account ID, or the user profile's.
+        Returns:
+            MasaContext: The MASA context
+        """
+        await self.check_token()
+
+        context = MasaContext(account_id=masa_account_id or self._account_id)
+
+        async def call(name: str, coro: Awaitable[T]) -> Optional[T]:
+            try:
+                return await coro
+            except Exception as ex:
+                logger.warning(f"MASA context call {name} failed: {ex}")
+                context.errors[name] = ex
+                return None
+
+        user_profile = asyncio.ensure_future(
+            call("user_profile", masa_data.get_masa_user_profile(self._session, self._token))
+        )
+
+        async def get_account_data():
+            if not context.account_id:
+                # Only without a known account ID, the account calls wait for the user profile
+                profile = await user_profile
+                if not profile or not profile.accounts:
+                    context.errors["account_id"] = ValueError("Account Id must be provided")
+                    return
+                context.account_id = str(profile.accounts[0].id)
+
+            account_id = context.account_id
+            context.equipment, context.order_titles = await asyncio.gather(
+                call("equipment", masa_data.get_masa_equipments(self._session, self._token, account_id)),
+                call("order_titles", masa_data.get_masa_order_titles(self._session, self._token, account_id)),
+            )
+
+        (
+            context.user_profile,
+            context.contact_account_user_profile,
+            context.lookup_index,
+            context.volt_levels,
+            _,
+        ) = await asyncio.gather(
+            user_profile,
+            call(
+                "contact_account_user_profile",
+                masa_data.get_masa_contact_account_user_profile(self._session, self._token),
+            ),
+            call("lookup", masa_data.get_masa_lookup_index(self._session, self._token)),
+            call("volt_levels", masa_data.get_masa_volt_levels(self._session, self._token)),
+            get_account_data(),
+        )
+        return context
+
+    async def get_masa_connection_size_from_masa(self, masa_account_id: Optional[str] = None) -> Optional[str]:
+        lookup_index = await self.get_masa_lookup_index()
         equipment = await self.get_masa_equipment_by_account(masa_account_id)
 
         if not equipment or len(equipment.items) < 1 or len(equipment.items[0].connections) < 1:
@@ -893,7 +1474,7 @@ class IecClient:
 
         connection_size = equipment.items[0].connections[0].power_connection_size
 
-        return self._masa_connection_size_map.get(connection_size)
+        return lookup_index.connection_size_name(connection_size)
 
     # ----------------
     # Fault Portal Endpoints
@@ -945,6 +1526,31 @@ class IecClient:
 
         return await fault_portal_data.post_accounts_transactions(self._session, self._token, accounts, state_code)
 
+    async def post_fault_portal_accounts_transactions_in_chunks(
+        self,
+        accounts: List[str],
+        state_code: int = 0,
+        chunk_size: int = DEFAULT_ACCOUNTS_TRANSACTIONS_CHUNK_SIZE,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        timeout: Optional[float] = DEFAULT_FAN_OUT_TIMEOUT,
+    ) -> dict[str, FanOutResult[str, AccountsTransactionsResponse]]:
+        """Post Accounts Transactions of many accounts to Fault Portal, chunked into concurrent requests
+        Args:
+            self: The instance of the class.
+            accounts (List[str]): List of account UUIDs to query.
+            state_code (int): The state code filter (default 0).
+            chunk_size (int): Maximal number of accounts per request.
+            max_concurrency (int): Maximal number of concurrent requests.
+            timeout (float): Timeout in seconds of every single request.
+        Returns:
+            dict[str, FanOutResult[str, AccountsTransactionsResponse]]: The response of every account, by account UUID
+        """
+        await self.check_token()
+
+        return await fault_portal_data.post_accounts_transactions_in_chunks(
+            self._session, self._token, accounts, state_code, chunk_size, max_concurrency, timeout
+        )
+
     # ----------------
     # Login/Token Flow
     # ----------------
@@ -1045,6 +1651,13 @@ class IecClient:
 
         return True
 
+    async def verify_token(self) -> dict:
+        """
+        Verify the signature of the jwt.py token using the cached signing keys, without blocking the event loop.
+        :return: The decoded token claims
+        """
+        return await login.verify_token(self._session, self._token)
+
     async def refresh_token(self):
         """
         Refresh IEC JWT token.
@@ -1057,11 +1670,30 @@ class IecClient:
         """
         Load token from file.
         """
-        self._token = await login.load_token_from_file(file_path)
+        self._token = await login.load_token_from_file(file_path, self._executor)
         self.logged_in = True
 
     async def save_token_to_file(self, file_path: str = "token.json"):
         """
         Save token to file.
         """
-        await login.save_token_to_file(self._token, file_path)
+        await login.save_token_to_file(self._token, file_path, self._executor)
+
+    async def load_token_from_store(self, store: TokenStore) -> bool:
+        """
+        Load the token of the user from a token store.
+        Returns:
+            bool: Whether the store had a token of the user.
+        """
+        token = await store.load(self._user_id)
+        if not token:
+            return False
+        self._token = token
+        self.logged_in = True
+        return True
+
+    async def save_token_to_store(self, store: TokenStore):
+        """
+        Save the token of the user to a token store.
+        """
+        await store.save(self._user_id, self._token)
@@ -0,0 +1,247 @@
+"""Incremental archive of the invoice PDFs of all contracts, tracked by a manifest to resume interrupted runs."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+from uuid import uuid4
+
+import aiofiles
+
+from iec_api import commons
+from iec_api.const import TIMEZONE
+from iec_api.iec_client import IecClient
+from iec_api.models.exceptions import IECError
+from iec_api.models.invoice import Invoice
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = "manifest.json"
+MANIFEST_SAVE_INTERVAL = 20  # Downloads between manifest saves, files downloaded meanwhile are adopted on resume
+DEFAULT_ARCHIVE_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+RETRY_DELAY = 1  # Seconds, doubled on every retry
+PDF_MAGIC = b"%PDF-"
+
+
+@dataclass
+class ArchivedInvoice:
+    """
+    Manifest entry of an archived invoice PDF.
+
+    Attributes:
+        contract_id (str): The contract ID.
+        invoice_number (str): The invoice number (document ID).
+        path (str): Path of the PDF, relative to the archive directory.
+        size (int): Size of the PDF in bytes.
+        sha256 (str): SHA-256 of the PDF, hex encoded.
+        archived_at (str): When the PDF was archived, ISO formatted.
+    """
+
+    contract_id: str
+    invoice_number: str
+    path: str
+    size: int
+    sha256: str
+    archived_at: str
+
+
+@dataclass
+class ArchiveResult:
+    """
+    Result of an archive run.
+
+    Attributes:
+        downloaded (list[ArchivedInvoice]): The newly archived invoices.
+        skipped (int): Number of invoices already archived.
+        errors (dict[str, Exception]): Errors by contract ID (listing) or "<contract ID>/<invoice number>" (download).
+    """
+
+    downloaded: list[ArchivedInvoice] = field(default_factory=list)
+    skipped: int = 0
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+
+def _invoice_number(invoice: Invoice) -> str:
+    return invoice.document_id or str(invoice.invoice_id)
+
+
+def _is_retryable(ex: Exception) -> bool:
+    return isinstance(ex, IECError) and isinstance(ex.code, int) and (ex.code == -1 or ex.code >= 500)
+
+
+def _is_pdf(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(PDF_MAGIC)) == PDF_MAGIC
+
+
+def _make_dirs(path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+
+
+def _hash_file(path: str) -> tuple[int, str]:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(commons.DOWNLOAD_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return os.path.getsize(path), sha256.hexdigest()
+
+
+class InvoiceArchiver:
+    """
+    Archives the invoice PDFs of the contracts of a client into "<directory>/<contract ID>/<invoice number>.pdf".
+    Invoices in the manifest whose PDF has the recorded size (and hash, if verified) are not downloaded again.
+    """
+
+    def __init__(
+        self,
+        client: IecClient,
+        directory: str,
+        max_concurrency: int = DEFAULT_ARCHIVE_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+        verify_hash: bool = False,
+    ):
+        """
+        Initializes the archiver.
+
+        Args:
+        client (IecClient): The logged in client.
+        directory (str): The archive directory.
+        max_concurrency (int): Maximal number of concurrent downloads.
+        retries (int): Retries of a download failing on a network or server error.
+        verify_hash (bool): Whether to verify the hash of archived PDFs, not only their size.
+        """
+        self._client = client
+        self._directory = directory
+        self._max_concurrency = max_concurrency
+        self._retries = retries
+        self._verify_hash = verify_hash
+        self._manifest: dict[str, ArchivedInvoice] = {}
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self._directory, MANIFEST_FILE_NAME)
+
+    def _read_manifest(self) -> dict[str, ArchivedInvoice]:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                entries: dict[str, dict[str, Any]] = json.load(f)
+        except FileNotFoundError:
+            return {}
+        return {key: ArchivedInvoice(**entry) for key, entry in entries.items()}
+
+    def _write_manifest(self, manifest: dict[str, ArchivedInvoice]) -> None:
+        temp_path = f"{self.manifest_path}.{uuid4().hex}.part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({key: entry.__dict__ for key, entry in manifest.items()}, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    def _check_archived(self, key: str, contract_id: str, invoice_number: str) -> bool:
+        """Check an invoice PDF is archived, adopting PDFs downloaded after the last manifest save."""
+        relative_path = os.path.join(contract_id, f"{invoice_number}.pdf")
+        path = os.path.join(self._directory, relative_path)
+        if not os.path.exists(path):
+            return False
+
+        entry = self._manifest.get(key)
+        if entry and not self._verify_hash:
+            return entry.size > 0 and os.path.getsize(path) == entry.size
+
+        size, sha256 = _hash_file(path)
+        if entry:
+            return entry.size > 0 and size == entry.size and sha256 == entry.sha256
+
+        # PDFs are renamed into place only when complete, so a file missing from the manifest is adopted unless it is
+        # empty or is not a PDF (e.g. truncated or written by another tool)
+        if not size or not _is_pdf(path):
+            return False
+        archived_at = datetime.fromtimestamp(os.path.getmtime(path), TIMEZONE).isoformat()
+        self._manifest[key] = ArchivedInvoice(contract_id, invoice_number, relative_path, size, sha256, archived_at)
+        return True
+
+    async def _download(self, bp_number: Optional[str], contract_id: str, invoice_number: str) -> ArchivedInvoice:
+        executor = self._client._executor
+        relative_path = os.path.join(contract_id, f"{invoice_number}.pdf")
+        path = os.path.join(self._directory, relative_path)
+        await executor.run(_make_dirs, os.path.dirname(path))
+
+        attempt = 0
+        while True:
+            temp_path = f"{path}.{uuid4().hex}.part"
+            sha256 = hashlib.sha256()
+            try:
+                async with aiofiles.open(temp_path, "wb") as f:
+
+                    async def write(chunk: bytes):
+                        sha256.update(chunk)
+                        await f.write(chunk)
+
+                    size = await self._client.stream_invoice_pdf(write, invoice_number, bp_number, contract_id)
+                if not size:
+                    raise IECError(-1, f"Received empty PDF of invoice {invoice_number}")
+                await executor.run(os.replace, temp_path, path)
+                archived_at = datetime.now(TIMEZONE).isoformat()
+                return ArchivedInvoice(
+                    contract_id, invoice_number, relative_path, size, sha256.hexdigest(), archived_at
+                )
+            except Exception as ex:
+                if attempt == self._retries or not _is_retryable(ex):
+                    raise
+                logger.debug(f"Retrying download of invoice {invoice_number} after: {ex}")
+            finally:
+                await executor.run(commons.remove_file, temp_path)
+
+            await asyncio.sleep(RETRY_DELAY * 2**attempt)
+            attempt += 1
+
+    async def archive(self, contract_ids: Optional[list[str]] = None, bp_number: Optional[str] = None) -> ArchiveResult:
+        """
+        Archive the invoice PDFs not yet archived.
+        Args:
+            contract_ids (list[str]): The Contract IDs. Default is all the contracts of the BP number.
+            bp_number (str): The BP number.
+        Returns:
+            ArchiveResult: The newly archived invoices, the number of skipped ones and the errors.
+        """
+        executor = self._client._executor
+        await executor.run(_make_dirs, self._directory)
+        self._manifest = await executor.run(self._read_manifest)
+        result = ArchiveResult()
+
+        invoices = await self._client.get_billing_invoices_for_all_contracts(
+            bp_number, contract_ids=contract_ids, max_concurrency=self._max_concurrency
+        )
+        missing: list[tuple[str, str]] = []
+        for contract_id, listing in invoices.items():
+            if listing.error:
+                result.errors[contract_id] = listing.error
+                continue
+            for invoice in listing.result.invoices if listing.result else []:
+                invoice_number = _invoice_number(invoice)
+                key = f"{contract_id}/{invoice_number}"
+                if await executor.run(self._check_archived, key, contract_id, invoice_number):
+                    result.skipped += 1
+                else:
+                    missing.append((contract_id, invoice_number))
+
+        try:
+            async for download in commons.fan_out(
+                missing, lambda job: self._download(bp_number, *job), self._max_concurrency
+            ):
+                key = "/".join(download.key)
+                archived = download.result
+                if download.error or not archived:
+                    result.errors[key] = download.error or IECError(-1, f"Failed to archive invoice {key}")
+                    continue
+                self._manifest[key] = archived
+                result.downloaded.append(archived)
+                if len(result.downloaded) % MANIFEST_SAVE_INTERVAL == 0:
+                    await executor.run(self._write_manifest, dict(self._manifest))
+        finally:
+            await executor.run(self._write_manifest, dict(self._manifest))
+
+        return result
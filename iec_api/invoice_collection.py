@@ -0,0 +1,97 @@
+"""Indexed collection of invoices, for range, status and contract queries without scanning the invoices."""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+from iec_api.const import TIMEZONE
+from iec_api.models.invoice import GetInvoicesBody, Invoice
+
+
+class InvoiceCollection:
+    """
+    Immutable collection of invoices, ordered by to_date (undated invoices first).
+    Indexes and aggregates are computed once, on creation.
+    """
+
+    def __init__(self, invoices: list[Invoice]):
+        dated = sorted(
+            (invoice.to_date.astimezone(TIMEZONE).date(), i, invoice)
+            for i, invoice in enumerate(invoices)
+            if invoice.to_date
+        )
+        self._to_days: list[date] = [to_day for to_day, _, _ in dated]
+        self._dated: list[Invoice] = [invoice for _, _, invoice in dated]
+        self._invoices: list[Invoice] = [invoice for invoice in invoices if not invoice.to_date] + self._dated
+
+        self._by_status: dict[int, list[Invoice]] = defaultdict(list)
+        self._by_contract: dict[int, list[Invoice]] = defaultdict(list)
+        self._totals_by_year: dict[int, float] = defaultdict(float)
+        self.total_amount = 0.0
+        self.total_paid = 0.0
+        self.outstanding = 0.0
+
+        for invoice in self._invoices:
+            self._by_status[invoice.invoice_payment_status].append(invoice)
+            self._by_contract[invoice.contract_number].append(invoice)
+            if invoice.to_date:
+                self._totals_by_year[invoice.to_date.astimezone(TIMEZONE).year] += invoice.amount_origin
+            self.total_amount += invoice.amount_origin
+            self.total_paid += invoice.amount_paid
+            self.outstanding += invoice.amount_to_pay
+
+        self._open = [invoice for invoice in self._invoices if invoice.amount_to_pay > 0]
+
+    @classmethod
+    def from_response(cls, response: Optional[GetInvoicesBody]) -> "InvoiceCollection":
+        return cls(response.invoices if response else [])
+
+    def __len__(self) -> int:
+        return len(self._invoices)
+
+    def __iter__(self) -> Iterator[Invoice]:
+        return iter(self._invoices)
+
+    @property
+    def latest(self) -> Optional[Invoice]:
+        """The invoice with the latest to_date."""
+        return self._dated[-1] if self._dated else None
+
+    @property
+    def open_invoices(self) -> list[Invoice]:
+        """The invoices with an amount to pay."""
+        return list(self._open)
+
+    @property
+    def totals_by_year(self) -> dict[int, float]:
+        """Sum of the invoice amounts by the year of their to_date."""
+        return dict(self._totals_by_year)
+
+    def between(
+        self, from_date: Optional[date | datetime] = None, to_date: Optional[date | datetime] = None
+    ) -> list[Invoice]:
+        """
+        Get the invoices whose to_date is in a range, in O(log n + k)
+        Args:
+            from_date (date): First day of the range, inclusive. Default is unbounded.
+            to_date (date): Last day of the range, inclusive. Default is unbounded.
+        Returns:
+            list[Invoice]: The invoices, ordered by to_date
+        """
+        if isinstance(from_date, datetime):
+            from_date = from_date.astimezone(TIMEZONE).date()
+        if isinstance(to_date, datetime):
+            to_date = to_date.astimezone(TIMEZONE).date()
+
+        start = bisect_left(self._to_days, from_date) if from_date else 0
+        end = bisect_right(self._to_days, to_date) if to_date else len(self._dated)
+        return self._dated[start:end]
+
+    def by_status(self, invoice_payment_status: int) -> list[Invoice]:
+        """Get the invoices with a payment status, ordered by to_date."""
+        return list(self._by_status.get(invoice_payment_status, []))
+
+    def by_contract(self, contract_number: int | str) -> list[Invoice]:
+        """Get the invoices of a contract, ordered by to_date."""
+        return list(self._by_contract.get(int(contract_number), []))
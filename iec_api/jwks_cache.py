@@ -0,0 +1,164 @@
+"""Async cache of the JSON Web Key Set used for JWT signature verification."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from aiohttp import ClientSession
+from jwt import PyJWK
+from jwt.exceptions import PyJWKClientError, PyJWKError
+
+from iec_api import commons
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JWKS_TTL = 60 * 60
+MIN_REFRESH_INTERVAL = 60  # Throttles refreshes on unknown key IDs, e.g. of forged tokens
+PREFETCH_AHEAD_RATIO = 0.9  # Prefetch refreshes the keys when 90% of the TTL has passed
+
+
+class JwksCache:
+    """
+    JWKS cache indexed by key ID.
+    Keys are fetched once per TTL (or in the background by the prefetch task), and on an unknown key ID,
+    so verification of tokens signed with known keys makes no network calls.
+    """
+
+    def __init__(self, url: str, ttl: float = DEFAULT_JWKS_TTL, min_refresh_interval: float = MIN_REFRESH_INTERVAL):
+        """
+        Initializes the cache.
+
+        Args:
+        url (str): The JWKS URL.
+        ttl (float): Seconds after which the keys are refreshed.
+        min_refresh_interval (float): Minimal seconds between refreshes triggered by unknown key IDs.
+        """
+        self._url = url
+        self._ttl = ttl
+        self._min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, PyJWK] = {}
+        self._jwk_data: dict[str, dict[str, Any]] = {}  # The raw JWKs, picklable unlike the parsed keys
+        self._fetched_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None  # The running fetch, shared by all waiting callers
+        self._prefetch_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self._ttl
+
+    def get_cached_key(self, kid: Optional[str]) -> Optional[PyJWK]:
+        """
+        Get a signing key from the cache, without any network call.
+        Args:
+            kid (str): The key ID.
+        Returns:
+            PyJWK: The signing key, None if not cached.
+        """
+        return self._keys.get(kid) if kid else None
+
+    def get_cached_jwk_data(self, kid: Optional[str]) -> Optional[dict[str, Any]]:
+        """
+        Get the raw JWK of a signing key from the cache, e.g. to send it to another process.
+        Args:
+            kid (str): The key ID.
+        Returns:
+            dict: The JWK, None if not cached.
+        """
+        return self._jwk_data.get(kid) if kid else None
+
+    async def _fetch(self, session: ClientSession) -> None:
+        response: dict[str, Any] = await commons.send_get_request(session, self._url)
+
+        keys = {}
+        jwk_data = {}
+        for jwk in response.get("keys", []):
+            if jwk.get("use", "sig") != "sig" or not jwk.get("kid"):
+                continue
+            try:
+                keys[jwk["kid"]] = PyJWK.from_dict(jwk)
+                jwk_data[jwk["kid"]] = jwk
+            except PyJWKError as ex:
+                logger.debug(f"Skipping unusable JWK {jwk.get('kid')}: {ex}")
+
+        if not keys:
+            raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
+
+        self._keys = keys
+        self._jwk_data = jwk_data
+        self._fetched_at = time.monotonic()
+
+    async def refresh(self, session: ClientSession) -> None:
+        """
+        Fetch the keys. Concurrent callers share a single fetch.
+        Args:
+            session (ClientSession): The aiohttp ClientSession object.
+        """
+        await asyncio.shield(self._start_refresh(session))
+
+    def _start_refresh(self, session: ClientSession) -> asyncio.Task:
+        if not self._refresh_task:
+            self._refresh_task = asyncio.ensure_future(self._fetch(session))
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
+
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh_task = None
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Failed refreshing JWKS: {task.exception()}")
+
+    async def get_signing_key(self, session: ClientSession, kid: Optional[str]) -> PyJWK:
+        """
+        Get a signing key, fetching the keys only when none are cached or the key ID is unknown.
+        Stale keys are served while refreshed in the background.
+        Args:
+            session (ClientSession): The aiohttp ClientSession object.
+            kid (str): The key ID.
+        Returns:
+            PyJWK: The signing key.
+        """
+        if self._fetched_at is None:
+            await self.refresh(session)
+        elif self.is_stale:
+            self._start_refresh(session)
+
+        key = self.get_cached_key(kid)
+        if (
+            not key
+            and self._fetched_at is not None
+            and time.monotonic() - self._fetched_at >= self._min_refresh_interval
+        ):
+            await self.refresh(session)
+            key = self.get_cached_key(kid)
+
+        if not key:
+            raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    async def _prefetch(self, session: ClientSession) -> None:
+        while True:
+            try:
+                await self.refresh(session)
+                delay = self._ttl * PREFETCH_AHEAD_RATIO
+            except Exception:
+                delay = self._min_refresh_interval  # Logged by _on_refresh_done
+            await asyncio.sleep(delay)
+
+    def start_prefetch(self, session: ClientSession) -> None:
+        """
+        Start refreshing the keys in the background before they become stale.
+        Args:
+            session (ClientSession): The aiohttp ClientSession object.
+        """
+        if not self._prefetch_task or self._prefetch_task.done():
+            self._prefetch_task = asyncio.ensure_future(self._prefetch(session))
+
+    async def stop_prefetch(self) -> None:
+        """Stop the background refresh."""
+        if self._prefetch_task:
+            self._prefetch_task.cancel()
+            try:
+                await self._prefetch_task
+            except asyncio.CancelledError:
+                pass
+            self._prefetch_task = None
@@ -1,5 +1,6 @@
 """IEC Login Module."""
 
+import asyncio
 import json
 import logging
 import os
@@ -7,19 +8,24 @@ import random
 import re
 import string
 import time
-from typing import Any, Optional, Tuple
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Mapping, Optional, Tuple, TypeVar
 
-import aiofiles
 import jwt
 import pkce
 from aiohttp import ClientSession
-from cryptography.fernet import Fernet
-from jwt import PyJWKClient
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from jwt import PyJWK, PyJWKClient
 
 from iec_api import commons
+from iec_api.commons import FanOutResult
+from iec_api.jwks_cache import JwksCache
 from iec_api.models.exceptions import IECLoginError
 from iec_api.models.jwt import JWT
 
+K = TypeVar("K")
 logger = logging.getLogger(__name__)
 
 # Environment variables for security
@@ -30,7 +36,10 @@ IEC_OKTA_BASE_URL = os.environ.get("IEC_OKTA_BASE_URL", "https://iec-ext.okta.co
 
 # JWKS for JWT signature verification
 JWKS_URL = os.environ.get("IEC_JWKS_URL", f"{IEC_OKTA_BASE_URL}/oauth2/default/v1/keys")
+VERIFY_CHUNK_SIZE = 256  # Tokens per process pool task of batch verification
 _jwks_client: Optional[PyJWKClient] = None
+_jwks_cache = JwksCache(JWKS_URL)
+_fernet: Optional[Tuple[bytes, MultiFernet]] = None  # (encryption key, Fernet) of the last used key
 
 
 async def authorize_session(session: ClientSession, session_token) -> Tuple[str, str]:
@@ -279,23 +288,49 @@ async def refresh_token(session: ClientSession, token: JWT) -> JWT:
     return JWT.from_dict(response)
 
 
-async def save_token_to_file(token: JWT, path: str = "token.json") -> None:
+def encrypt_token(token: JWT) -> bytes:
     """
-    Save token to file with optional encryption.
-    If IEC_TOKEN_ENCRYPTION_KEY env var is set, encrypts the token using Fernet (AES-128).
+    Serialize token with optional encryption.
+    If IEC_TOKEN_ENCRYPTION_KEY env var is set, encrypts the token using Fernet (AES-128) with the first key.
     """
     fernet = _get_fernet()
-    token_json = json.dumps(token.to_dict())
+    token_json = json.dumps(token.to_dict()).encode()
+    return fernet.encrypt(token_json) if fernet else token_json
 
+
+def decrypt_token(data: bytes) -> JWT:
+    """
+    Deserialize token with optional decryption, using any of the keys of IEC_TOKEN_ENCRYPTION_KEY.
+    Falls back to plain text for backward compatibility.
+    """
+    fernet = _get_fernet()
     if fernet:
-        # Encrypt token before saving
-        encrypted_data = fernet.encrypt(token_json.encode())
-        async with aiofiles.open(path, mode="wb") as f:
-            await f.write(encrypted_data)
-    else:
-        # Save as plain text (backward compatible)
-        async with aiofiles.open(path, mode="w", encoding="utf-8") as f:
-            await f.write(token_json)
+        try:
+            data = fernet.decrypt(data)
+        except InvalidToken:
+            pass  # Plain text token (backward compatible)
+    return JWT.from_dict(json.loads(data.decode("utf-8")))
+
+
+def _write_token_file(token: JWT, path: str) -> None:
+    with open(path, mode="wb") as f:
+        f.write(encrypt_token(token))
+
+
+def _read_token_file(path: str) -> JWT:
+    with open(path, mode="rb") as f:
+        return decrypt_token(f.read())
+
+
+async def save_token_to_file(
+    token: JWT, path: str = "token.json", executor: Optional[commons.BlockingExecutor] = None
+) -> None:
+    """
+    Save token to file with optional encryption.
+    If IEC_TOKEN_ENCRYPTION_KEY env var is set, encrypts the token using Fernet (AES-128).
+    The encryption and the file write run on the executor, default is the shared executor.
+    """
+    await (executor or commons.get_default_executor()).run(_write_token_file, token, path)
 
 
 def _get_jwks_client() -> PyJWKClient:
@@ -314,12 +349,19 @@ def _get_encryption_key() -> bytes | None:
     return None
 
 
-def _get_fernet() -> Fernet | None:
-    """Get Fernet instance if encryption key is available."""
+def _get_fernet() -> MultiFernet | None:
+    """
+    Get the cached Fernet instance if encryption key is available.
+    The key may be a comma separated list of keys, newest first, to rotate keys:
+    tokens are encrypted with the first key and decrypted with any of them.
+    """
+    global _fernet
     key = _get_encryption_key()
-    if key:
-        return Fernet(key)
-    return None
+    if not key:
+        return None
+    if not _fernet or _fernet[0] != key:
+        _fernet = (key, MultiFernet([Fernet(k.strip()) for k in key.split(b",") if k.strip()]))
+    return _fernet[1]
 
 
 def decode_token(token: JWT, verify: bool = True) -> dict[str, Any]:
@@ -332,8 +374,10 @@ def decode_token(token: JWT, verify: bool = True) -> dict[str, Any]:
         dict: The decoded token claims.
     """
     if verify:
-        jwks_client = _get_jwks_client()
-        signing_key = jwks_client.get_signing_key_from_jwt(token.id_token)
+        # Prefer the keys cached by verify_token, the JWKS client fetches them synchronously
+        signing_key = _jwks_cache.get_cached_key(jwt.get_unverified_header(token.id_token).get("kid"))
+        if not signing_key:
+            signing_key = _get_jwks_client().get_signing_key_from_jwt(token.id_token)
         return jwt.decode(
             token.id_token,
             signing_key.key,
@@ -344,31 +388,112 @@ def decode_token(token: JWT, verify: bool = True) -> dict[str, Any]:
         return jwt.decode(token.id_token, options={"verify_signature": False}, algorithms=["RS256"])
 
 
-async def load_token_from_file(path: str = "token.json") -> JWT:
+def get_jwks_cache() -> JwksCache:
+    """Get the JWKS cache used for JWT signature verification, e.g. to start its prefetch."""
+    return _jwks_cache
+
+
+async def verify_token(session: ClientSession, token: JWT) -> dict[str, Any]:
     """
-    Load token from file with optional decryption.
-    If IEC_TOKEN_ENCRYPTION_KEY env var is set, decrypts the token using Fernet.
-    Falls back to plain text for backward compatibility.
+    Decode and verify JWT token, using the cached signing keys.
+    Args:
+        session: The aiohttp ClientSession object, used when the signing keys must be fetched.
+        token: The JWT token to verify.
+    Returns:
+        dict: The decoded token claims.
     """
-    fernet = _get_fernet()
+    signing_key = await _jwks_cache.get_signing_key(session, jwt.get_unverified_header(token.id_token).get("kid"))
+    return jwt.decode(token.id_token, signing_key.key, algorithms=["RS256"], audience=APP_CLIENT_ID)
 
-    if fernet:
-        # Try to read as encrypted file
-        async with aiofiles.open(path, "rb") as f:
-            encrypted_data = await f.read()
+
+def _decode_id_tokens(key: Any, id_tokens: list[str]) -> list[dict[str, Any] | Exception]:
+    """Verify id tokens signed with the same key."""
+    results: list[dict[str, Any] | Exception] = []
+    for id_token in id_tokens:
         try:
-            decrypted_data = fernet.decrypt(encrypted_data)
-            contents = decrypted_data.decode("utf-8")
-        except Exception:
-            # If decryption fails, try reading as plain text (backward compatible)
-            async with aiofiles.open(path, "r", encoding="utf-8") as f:
-                contents = await f.read()
-    else:
-        # Read as plain text
-        async with aiofiles.open(path, "r", encoding="utf-8") as f:
-            contents = await f.read()
+            results.append(jwt.decode(id_token, key, algorithms=["RS256"], audience=APP_CLIENT_ID))
+        except jwt.exceptions.PyJWTError as ex:
+            results.append(ex)
+    return results
+
+
+def _verify_id_tokens(jwk_data: dict[str, Any], id_tokens: list[str]) -> list[dict[str, Any] | Exception]:
+    """Verify id tokens signed with the same key, in a worker process."""
+    return _decode_id_tokens(PyJWK.from_dict(jwk_data).key, id_tokens)
 
-    jwt_data = JWT.from_dict(json.loads(contents))
+
+async def verify_tokens(
+    session: ClientSession,
+    tokens: Mapping[K, JWT],
+    executor: Optional[ProcessPoolExecutor] = None,
+    chunk_size: int = VERIFY_CHUNK_SIZE,
+) -> dict[K, FanOutResult[K, dict[str, Any]]]:
+    """
+    Decode and verify many JWT tokens, fetching every signing key at most once.
+    Args:
+        session: The aiohttp ClientSession object, used when the signing keys must be fetched.
+        tokens: The JWT tokens to verify, by any key (e.g. user ID).
+        executor: Process pool to spread the signature verification across. Default is the shared executor.
+        chunk_size: Number of tokens verified per task of the executor.
+    Returns:
+        dict: The decoded token claims or the verification error, by the key of the token.
+    """
+    results: dict[K, FanOutResult[K, dict[str, Any]]] = {}
+    keys_by_kid: dict[Optional[str], list[K]] = defaultdict(list)
+    for key, token in tokens.items():
+        try:
+            keys_by_kid[jwt.get_unverified_header(token.id_token).get("kid")].append(key)
+        except jwt.exceptions.PyJWTError as ex:
+            results[key] = FanOutResult(key=key, error=ex)
+
+    loop = asyncio.get_running_loop()
+
+    async def verify(
+        signing_key: PyJWK, jwk_data: Optional[dict[str, Any]], id_tokens: list[str]
+    ) -> list[dict[str, Any] | Exception]:
+        if executor and jwk_data:
+            return await loop.run_in_executor(executor, _verify_id_tokens, jwk_data, id_tokens)
+        return await commons.get_default_executor().run(_decode_id_tokens, signing_key.key, id_tokens)
+
+    chunks: list[list[K]] = []
+    verifications = []
+    for kid, keys in keys_by_kid.items():
+        try:
+            signing_key = await _jwks_cache.get_signing_key(session, kid)
+        except Exception as ex:
+            results.update((key, FanOutResult(key=key, error=ex)) for key in keys)
+            continue
+
+        jwk_data = _jwks_cache.get_cached_jwk_data(kid)
+        for i in range(0, len(keys), chunk_size):
+            chunk = keys[i : i + chunk_size]
+            chunks.append(chunk)
+            verifications.append(verify(signing_key, jwk_data, [tokens[key].id_token for key in chunk]))
+
+    for chunk, verified in zip(chunks, await asyncio.gather(*verifications, return_exceptions=True)):
+        if isinstance(verified, BrokenProcessPool):
+            results.update((key, FanOutResult(key=key, error=verified)) for key in chunk)
+            continue
+        if isinstance(verified, BaseException):
+            raise verified
+
+        for key, claims in zip(chunk, verified):
+            if isinstance(claims, Exception):
+                results[key] = FanOutResult(key=key, error=claims)
+            else:
+                results[key] = FanOutResult(key=key, result=claims)
+
+    return {key: results[key] for key in tokens}
+
+
+async def load_token_from_file(path: str = "token.json", executor: Optional[commons.BlockingExecutor] = None) -> JWT:
+    """
+    Load token from file with optional decryption.
+    If IEC_TOKEN_ENCRYPTION_KEY env var is set, decrypts the token using Fernet.
+    Falls back to plain text for backward compatibility.
+    The file read and the decryption run on the executor, default is the shared executor.
+    """
+    jwt_data = await (executor or commons.get_default_executor()).run(_read_token_file, path)
 
     # decode token to verify validity (without signature verification to handle expired tokens)
     decode_token(jwt_data, verify=False)
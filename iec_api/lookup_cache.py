@@ -0,0 +1,140 @@
+"""Cache of rarely changing lookup data, with TTL, single-flight loading and optional disk persistence."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Optional, TypeVar
+from uuid import uuid4
+
+from iec_api import commons
+
+T = TypeVar("T")
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOOKUP_TTL = 24 * 60 * 60
+
+
+@dataclass
+class _Entry(Generic[T]):
+    fetched_at: float  # Epoch time, so persisted entries keep their age across restarts
+    raw: Any  # The JSON response, persisted to disk
+    value: T  # The decoded response
+
+
+class LookupCache:
+    """
+    Cache of lookups by name. Every lookup is fetched once per TTL, concurrent callers of a missing lookup share
+    a single fetch. With a directory, lookups are persisted as "<name>.json" and reused after a restart.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_LOOKUP_TTL,
+        directory: Optional[str] = None,
+        executor: Optional[commons.BlockingExecutor] = None,
+    ):
+        """
+        Initializes the cache.
+
+        Args:
+        ttl (float): Seconds after which a lookup is fetched again.
+        directory (str): Directory to persist the lookups in. Default is memory only.
+        executor (BlockingExecutor): Runs the disk I/O, default is the shared executor.
+        """
+        self._ttl = ttl
+        self._directory = directory
+        self._executor = executor
+        self._entries: dict[str, _Entry] = {}
+        self._loading: dict[str, asyncio.Task[_Entry]] = {}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._directory or "", f"{name}.json")
+
+    def _is_fresh(self, entry: Optional[_Entry]) -> bool:
+        return entry is not None and time.time() - entry.fetched_at < self._ttl
+
+    def _read(self, name: str) -> Optional[tuple[float, Any]]:
+        try:
+            with open(self._path(name), encoding="utf-8") as f:
+                persisted = json.load(f)
+            return persisted["fetched_at"], persisted["data"]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError) as ex:
+            logger.warning(f"Ignoring corrupted lookup {name}: {ex}")
+            return None
+
+    def _write(self, name: str, fetched_at: float, raw: Any) -> None:
+        temp_path = f"{self._path(name)}.{uuid4().hex}.part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": fetched_at, "data": raw}, f, ensure_ascii=False)
+        os.replace(temp_path, self._path(name))
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        return await (self._executor or commons.get_default_executor()).run(func, *args)
+
+    async def _load(self, name: str, fetch: Callable[[], Awaitable[Any]], decode: Callable[[Any], T]) -> _Entry[T]:
+        if self._directory:
+            persisted = await self._run(self._read, name)
+            if persisted:
+                entry = _Entry(persisted[0], persisted[1], decode(persisted[1]))
+                if self._is_fresh(entry):
+                    return entry
+
+        raw = await fetch()
+        entry = _Entry(time.time(), raw, decode(raw))
+        if self._directory:
+            try:
+                await self._run(self._write, name, entry.fetched_at, raw)
+            except OSError as ex:
+                logger.warning(f"Failed persisting lookup {name}: {ex}")
+        return entry
+
+    async def get(self, name: str, fetch: Callable[[], Awaitable[Any]], decode: Callable[[Any], T]) -> T:
+        """
+        Get a lookup, fetching it if missing or expired.
+        Args:
+            name (str): The name of the lookup.
+            fetch (Callable[[], Awaitable[Any]]): Fetches the JSON response of the lookup.
+            decode (Callable[[Any], T]): Decodes the JSON response.
+        Returns:
+            T: The decoded lookup.
+        """
+        entry = self._entries.get(name)
+        if entry and self._is_fresh(entry):
+            return entry.value
+
+        task = self._loading.get(name)
+        if not task:
+            task = asyncio.ensure_future(self._load(name, fetch, decode))
+            self._loading[name] = task
+            task.add_done_callback(lambda _: self._loading.pop(name, None))
+
+        loaded = await asyncio.shield(task)
+        self._entries[name] = loaded
+        return loaded.value
+
+    def _remove(self, name: str) -> None:
+        if os.path.exists(self._path(name)):
+            os.remove(self._path(name))
+
+    async def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drop a lookup from memory and disk, so it is fetched again on the next get.
+        Args:
+            name (str): The name of the lookup. Default is all the lookups.
+        """
+        names = [name] if name else list(self._entries)
+        for lookup_name in names:
+            self._entries.pop(lookup_name, None)
+        if self._directory:
+            for lookup_name in names:
+                await self._run(self._remove, lookup_name)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._is_fresh(self._entries.get(name))
@@ -0,0 +1,87 @@
+"""Index of the MASA lookup, for O(1) translation of lookup codes and IDs to their objects."""
+
+from typing import Optional
+from uuid import UUID
+
+from iec_api.masa_api_models.lookup import (
+    ActionCode,
+    ConnectionSizeType,
+    GetLookupResponse,
+    MeterSetupType,
+    OrderPurpose,
+    OrderStatusState,
+    PhonePrefix,
+    Region,
+    SiteType,
+)
+
+
+def _uuid(value: UUID | str) -> UUID:
+    return UUID(value) if isinstance(value, str) else value
+
+
+class LookupIndex:
+    """Index of every lookup category of a GetLookupResponse by its ID and code, built once per lookup load."""
+
+    def __init__(self, lookup: GetLookupResponse):
+        self.lookup = lookup
+
+        # Codes are indexed in reverse, so the first object of a duplicate code wins
+        self._regions_by_id = {region.region_id: region for region in lookup.regions}
+        self._regions_by_code = {region.code: region for region in reversed(lookup.regions)}
+
+        self._connection_sizes_by_id = {size.id: size for size in lookup.connection_size_types}
+        # The last object of a duplicate size type wins, as in the connection size map this index replaced
+        self._connection_sizes_by_size_type = {size.size_type: size for size in lookup.connection_size_types}
+
+        self._site_types = {site_type.key: site_type for site_type in reversed(lookup.site_types)}
+        self._order_status_states = {state.key: state for state in reversed(lookup.order_status_state)}
+        self._action_codes = {action_code.key: action_code for action_code in reversed(lookup.action_codes)}
+        self._phone_prefixes = {prefix.key: prefix for prefix in reversed(lookup.phone_prefixes)}
+        self._order_purposes = {purpose.id: purpose for purpose in lookup.order_purposes}
+        self._meter_setup_types = {setup_type.id: setup_type for setup_type in lookup.meter_setup_types}
+
+    def region(self, region_id: UUID | str) -> Optional[Region]:
+        """Get a region by its ID."""
+        return self._regions_by_id.get(_uuid(region_id))
+
+    def region_by_code(self, code: int) -> Optional[Region]:
+        """Get a region by its code."""
+        return self._regions_by_code.get(code)
+
+    def connection_size_type(self, connection_size_type_id: UUID | str) -> Optional[ConnectionSizeType]:
+        """Get a connection size type by its ID."""
+        return self._connection_sizes_by_id.get(_uuid(connection_size_type_id))
+
+    def connection_size_by_size_type(self, size_type: int) -> Optional[ConnectionSizeType]:
+        """Get a connection size type by its size type code, e.g. the power connection size of an equipment."""
+        return self._connection_sizes_by_size_type.get(size_type)
+
+    def connection_size_name(self, size_type: int) -> Optional[str]:
+        """Get the name of a connection size type by its size type code."""
+        size = self._connection_sizes_by_size_type.get(size_type)
+        return size.name if size else None
+
+    def site_type(self, key: int) -> Optional[SiteType]:
+        """Get a site type by its key."""
+        return self._site_types.get(key)
+
+    def order_status_state(self, key: int) -> Optional[OrderStatusState]:
+        """Get an order status state by its key."""
+        return self._order_status_states.get(key)
+
+    def action_code(self, key: int) -> Optional[ActionCode]:
+        """Get an action code by its key."""
+        return self._action_codes.get(key)
+
+    def phone_prefix(self, key: int) -> Optional[PhonePrefix]:
+        """Get a phone prefix by its key."""
+        return self._phone_prefixes.get(key)
+
+    def order_purpose(self, order_purpose_id: UUID | str) -> Optional[OrderPurpose]:
+        """Get an order purpose by its ID."""
+        return self._order_purposes.get(_uuid(order_purpose_id))
+
+    def meter_setup_type(self, meter_setup_type_id: UUID | str) -> Optional[MeterSetupType]:
+        """Get a meter setup type by its ID."""
+        return self._meter_setup_types.get(_uuid(meter_setup_type_id))
@@ -0,0 +1,48 @@
+"""MASA context, the aggregate of the MASA data fetched when bootstrapping a MASA user."""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from iec_api.lookup_index import LookupIndex
+from iec_api.masa_api_models.contact_account_user_profile import MasaMainPortalContactAccountUserProfile
+from iec_api.masa_api_models.equipment import GetEquipmentResponse
+from iec_api.masa_api_models.lookup import GetLookupResponse
+from iec_api.masa_api_models.titles import GetTitleResponse
+from iec_api.masa_api_models.user_profile import MasaUserProfile
+from iec_api.masa_api_models.volt_levels import VoltLevel
+
+
+@dataclass
+class MasaContext:
+    """
+    The MASA data of a user and their account.
+
+    Attributes:
+        account_id (Optional[str]): The MASA account ID.
+        user_profile (Optional[MasaUserProfile]): The user profile.
+        contact_account_user_profile (Optional[MasaMainPortalContactAccountUserProfile]): The contact account profile.
+        lookup_index (Optional[LookupIndex]): The lookup, indexed. Shared by all clients.
+        volt_levels (Optional[list[VoltLevel]]): The volt levels. Shared by all clients.
+        equipment (Optional[GetEquipmentResponse]): The equipment of the account.
+        order_titles (Optional[GetTitleResponse]): The order titles of the account.
+        errors (dict[str, Exception]): Errors of the failed calls, by call name.
+    """
+
+    account_id: Optional[str] = None
+    user_profile: Optional[MasaUserProfile] = None
+    contact_account_user_profile: Optional[MasaMainPortalContactAccountUserProfile] = None
+    lookup_index: Optional[LookupIndex] = None
+    volt_levels: Optional[list[VoltLevel]] = None
+    equipment: Optional[GetEquipmentResponse] = None
+    order_titles: Optional[GetTitleResponse] = None
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def lookup(self) -> Optional[GetLookupResponse]:
+        """The lookup."""
+        return self.lookup_index.lookup if self.lookup_index else None
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether all calls of the context succeeded."""
+        return not self.errors
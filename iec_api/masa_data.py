@@ -1,9 +1,14 @@
-from typing import List
+import asyncio
+import math
+from collections import deque
+from typing import AsyncGenerator, List, Optional
 
 from aiohttp import ClientSession
 
 from iec_api import commons
+from iec_api.city_index import CityIndex
 from iec_api.const import (
+    DEFAULT_MASA_PAGE_SIZE,
     GET_MASA_CITIES_LOOKUP_URL,
     GET_MASA_CONTACT_ACCOUNT_USER_PROFILE_URL,
     GET_MASA_EQUIPMENTS_URL,
@@ -15,9 +20,11 @@ from iec_api.const import (
     HEADERS_WITH_AUTH,
     HEADERS_WITH_AUTH_MASA_PORTAL,
 )
+from iec_api.lookup_cache import LookupCache
+from iec_api.lookup_index import LookupIndex
 from iec_api.masa_api_models.cities import CitiesResponse, City
 from iec_api.masa_api_models.contact_account_user_profile import MasaMainPortalContactAccountUserProfile
-from iec_api.masa_api_models.equipment import GetEquipmentResponse
+from iec_api.masa_api_models.equipment import GetEquipmentResponse, Item
 from iec_api.masa_api_models.lookup import GetLookupResponse
 from iec_api.masa_api_models.order_lookup import OrderCategory, OrderLookupResponse
 from iec_api.masa_api_models.titles import GetTitleResponse
@@ -25,36 +32,47 @@ from iec_api.masa_api_models.user_profile import MasaUserProfile
 from iec_api.masa_api_models.volt_levels import VoltLevel, VoltLevelsResponse
 from iec_api.models.jwt import JWT
 
-cities = None
-order_categories = None
-volt_levels = None
-lookup = None
+lookup_cache = LookupCache()  # Shared by all clients, the lookups are not user specific
+city_index: Optional[tuple[List[City], CityIndex]] = None  # (cities, their index)
+lookup_index: Optional[LookupIndex] = None
+
+
+def set_lookup_cache(cache: LookupCache):
+    """Replace the shared lookup cache, e.g. with a cache persisted to disk."""
+    global lookup_cache
+    lookup_cache = cache
 
 
 async def get_masa_cities(session: ClientSession, token: JWT) -> List[City]:
     """Get Cities from IEC Masa API."""
 
-    global cities
-    if not cities:
-        headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH_MASA_PORTAL, token.id_token)
-        # sending get request and saving the response as response object
-        response = await commons.send_get_request(session=session, url=GET_MASA_CITIES_LOOKUP_URL, headers=headers)
+    headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH_MASA_PORTAL, token.id_token)
+    return await lookup_cache.get(
+        "masa_cities",
+        lambda: commons.send_get_request(session=session, url=GET_MASA_CITIES_LOOKUP_URL, headers=headers),
+        lambda response: CitiesResponse.from_dict(response).data_collection,
+    )
+
+
+async def get_masa_city_index(session: ClientSession, token: JWT) -> CityIndex:
+    """Get the index of the Cities from IEC Masa API, built once per cities load."""
 
-        cities = CitiesResponse.from_dict(response).data_collection
-    return cities
+    global city_index
+    cities = await get_masa_cities(session, token)
+    if not city_index or city_index[0] is not cities:
+        city_index = (cities, CityIndex(cities))
+    return city_index[1]
 
 
 async def get_masa_order_categories(session: ClientSession, token: JWT) -> List[OrderCategory]:
     """Get Order Categories from IEC Masa API."""
 
-    global order_categories
-    if not order_categories:
-        headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH, token.id_token)
-        # sending get request and saving the response as response object
-        response = await commons.send_get_request(session=session, url=GET_MASA_ORDER_LOOKUP_URL, headers=headers)
-
-        order_categories = OrderLookupResponse.from_dict(response).order_categories
-    return order_categories
+    headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH, token.id_token)
+    return await lookup_cache.get(
+        "masa_order_categories",
+        lambda: commons.send_get_request(session=session, url=GET_MASA_ORDER_LOOKUP_URL, headers=headers),
+        lambda response: OrderLookupResponse.from_dict(response).order_categories,
+    )
 
 
 async def get_masa_user_profile(session: ClientSession, token: JWT) -> MasaUserProfile:
@@ -91,29 +109,80 @@ async def get_masa_contact_account_user_profile(
     return MasaMainPortalContactAccountUserProfile.from_dict(response)
 
 
-async def get_masa_equipments(session: ClientSession, token: JWT, account_id: str) -> GetEquipmentResponse:
-    """Get Equipments from IEC Masa API."""
+async def get_masa_equipments(
+    session: ClientSession,
+    token: JWT,
+    account_id: str,
+    page_number: int = 1,
+    page_size: int = DEFAULT_MASA_PAGE_SIZE,
+) -> GetEquipmentResponse:
+    """Get a page of Equipments from IEC Masa API."""
 
     headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH, token.id_token)
+    url = GET_MASA_EQUIPMENTS_URL.format(account_id=account_id, page_number=page_number, page_size=page_size)
     # sending get request and saving the response as response object
-    response = await commons.send_get_request(
-        session=session, url=GET_MASA_EQUIPMENTS_URL.format(account_id=account_id), headers=headers
-    )
+    response = await commons.send_get_request(session=session, url=url, headers=headers)
 
     return GetEquipmentResponse.from_dict(response)
 
 
+async def iter_masa_equipments(
+    session: ClientSession,
+    token: JWT,
+    account_id: str,
+    page_size: int = DEFAULT_MASA_PAGE_SIZE,
+    prefetch: int = 0,
+) -> AsyncGenerator[Item, None]:
+    """
+    Iterate over the Equipments of all pages from IEC Masa API, in page order.
+    Args:
+        session: The aiohttp ClientSession object.
+        token: The JWT token for authentication.
+        account_id: The MASA account ID.
+        page_size: Number of equipments per page.
+        prefetch: Number of later pages fetched concurrently, based on the total records of the first page.
+    """
+    page = await get_masa_equipments(session, token, account_id, 1, page_size)
+    for item in page.items:
+        yield item
+
+    last_page = math.ceil(page.total_records / page_size) if page.total_records > 0 else None
+    prefetched: deque[asyncio.Task] = deque()
+    next_page_number = 2
+    try:
+        while page.more_records and page.items:
+            if prefetch > 0 and last_page:
+                while len(prefetched) < prefetch and next_page_number <= last_page:
+                    prefetched.append(
+                        asyncio.ensure_future(
+                            get_masa_equipments(session, token, account_id, next_page_number, page_size)
+                        )
+                    )
+                    next_page_number += 1
+            if prefetched:
+                page = await prefetched.popleft()
+            else:
+                page = await get_masa_equipments(session, token, account_id, next_page_number, page_size)
+                next_page_number += 1
+
+            for item in page.items:
+                yield item
+    finally:
+        for task in prefetched:
+            task.cancel()
+        # Wait for the cancellations and retrieve the errors of the pages fetched meanwhile, which are not needed
+        await asyncio.gather(*prefetched, return_exceptions=True)
+
+
 async def get_masa_volt_levels(session: ClientSession, token: JWT) -> List[VoltLevel]:
     """Get Volt Levels from IEC Masa API."""
 
-    global volt_levels
-    if not volt_levels:
-        headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH, token.id_token)
-        # sending get request and saving the response as response object
-        response = await commons.send_get_request(session=session, url=GET_MASA_VOLT_LEVELS_URL, headers=headers)
-
-        volt_levels = VoltLevelsResponse.from_dict(response).data_collection
-    return volt_levels
+    headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH, token.id_token)
+    return await lookup_cache.get(
+        "masa_volt_levels",
+        lambda: commons.send_get_request(session=session, url=GET_MASA_VOLT_LEVELS_URL, headers=headers),
+        lambda response: VoltLevelsResponse.from_dict(response).data_collection,
+    )
 
 
 async def get_masa_order_titles(session: ClientSession, token: JWT, account_id: str) -> GetTitleResponse:
@@ -130,11 +199,29 @@ async def get_masa_order_titles(session: ClientSession, token: JWT, account_id:
 
 async def get_masa_lookup(session: ClientSession, token: JWT) -> GetLookupResponse:
     """Get All Lookup from IEC Masa API."""
-    global lookup
-    if not lookup:
-        headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH, token.id_token)
-        # sending get request and saving the response as response object
-        response = await commons.send_get_request(session=session, url=GET_MASA_LOOKUP_URL, headers=headers)
-
-        lookup = GetLookupResponse.from_dict(response)
-    return lookup
+    headers = commons.add_auth_bearer_to_headers(HEADERS_WITH_AUTH, token.id_token)
+    return await lookup_cache.get(
+        "masa_lookup",
+        lambda: commons.send_get_request(session=session, url=GET_MASA_LOOKUP_URL, headers=headers),
+        GetLookupResponse.from_dict,
+    )
+
+
+async def get_masa_lookup_index(session: ClientSession, token: JWT) -> LookupIndex:
+    """Get the index of the Lookup from IEC Masa API, built once per lookup load and shared by all clients."""
+
+    global lookup_index
+    lookup = await get_masa_lookup(session, token)
+    if not lookup_index or lookup_index.lookup is not lookup:
+        lookup_index = LookupIndex(lookup)
+    return lookup_index
+
+
+async def warm_up_masa_lookups(session: ClientSession, token: JWT) -> None:
+    """Load all the MASA lookups concurrently, e.g. on startup."""
+    await asyncio.gather(
+        get_masa_cities(session, token),
+        get_masa_order_categories(session, token),
+        get_masa_volt_levels(session, token),
+        get_masa_lookup(session, token),
+    )
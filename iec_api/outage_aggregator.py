@@ -0,0 +1,146 @@
+"""Live counters of the active outages of many accounts by region, area and city, updated incrementally."""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from iec_api.compact_outage import CompactOutage
+from iec_api.outage_watcher import OutageEvent, OutageEventType
+
+OutageKey = tuple[str, str]  # account_id, disconnect_key
+
+
+@dataclass
+class OutageCounts:
+    """
+    Active outage counts of a region, area or city.
+
+    Attributes:
+        disconnects (int): Number of distinct active disconnects.
+        sites (int): Number of affected sites, a disconnect affecting several accounts counts once per account.
+    """
+
+    disconnects: int = 0
+    sites: int = 0
+
+
+@dataclass
+class _Counter:
+    sites: int = 0
+    disconnects: Counter = field(default_factory=Counter)  # Sites by disconnect key
+
+    def counts(self) -> OutageCounts:
+        return OutageCounts(disconnects=len(self.disconnects), sites=self.sites)
+
+
+class OutageAggregator:
+    """
+    Counts the active outages of accounts by region, area and city. Every outage change updates the counters in
+    O(1), and every count is answered in O(1), without going over the accounts.
+    Feed it with the events of an OutageWatcher (on_event=aggregator.apply), or with full polls (set_outages).
+    """
+
+    def __init__(self):
+        self._active: dict[OutageKey, CompactOutage] = {}
+        self._by_account: dict[str, set[str]] = {}  # Active disconnect keys by account ID
+        self._total = _Counter()
+        self._regions: dict[Optional[str], _Counter] = {}
+        self._areas: dict[Optional[str], _Counter] = {}
+        self._cities: dict[Optional[str], _Counter] = {}
+
+    def _counters(self, outage: CompactOutage) -> tuple[_Counter, ...]:
+        return (
+            self._total,
+            self._regions.setdefault(outage.region, _Counter()),
+            self._areas.setdefault(outage.area, _Counter()),
+            self._cities.setdefault(outage.city, _Counter()),
+        )
+
+    def _add(self, account_id: str, outage: CompactOutage):
+        key = (account_id, outage.disconnect_key)
+        if key in self._active:
+            self._remove(account_id, outage.disconnect_key)
+        self._active[key] = outage
+        self._by_account.setdefault(account_id, set()).add(outage.disconnect_key)
+        for counter in self._counters(outage):
+            counter.sites += 1
+            counter.disconnects[outage.disconnect_key] += 1
+
+    def _remove(self, account_id: str, disconnect_key: str):
+        outage = self._active.pop((account_id, disconnect_key), None)
+        if not outage:
+            return
+        disconnect_keys = self._by_account[account_id]
+        disconnect_keys.discard(disconnect_key)
+        if not disconnect_keys:
+            del self._by_account[account_id]
+        for counter in self._counters(outage):
+            counter.sites -= 1
+            counter.disconnects[disconnect_key] -= 1
+            if not counter.disconnects[disconnect_key]:
+                del counter.disconnects[disconnect_key]
+        # Drop the emptied counters, so places that had outages once do not accumulate
+        for counters, name in ((self._regions, outage.region), (self._areas, outage.area), (self._cities, outage.city)):
+            if not counters[name].sites:
+                del counters[name]
+
+    def apply(self, event: OutageEvent):
+        """Apply a change event of an OutageWatcher."""
+        if event.event_type != OutageEventType.RESOLVED and event.outage.is_active:
+            self._add(event.account_id, event.outage)
+        else:
+            self._remove(event.account_id, event.outage.disconnect_key)
+
+    def set_outages(self, account_id: str, outages: list[CompactOutage]):
+        """
+        Replace the outages of an account with a full poll, updating only the changed ones.
+        Args:
+            account_id (str): The account ID.
+            outages (list[CompactOutage]): All the current outages of the account.
+        """
+        active = {outage.disconnect_key: outage for outage in outages if outage.is_active}
+        for disconnect_key in self._by_account.get(account_id, set()) - active.keys():
+            self._remove(account_id, disconnect_key)
+        for disconnect_key, outage in active.items():
+            if self._active.get((account_id, disconnect_key)) != outage:
+                self._add(account_id, outage)
+
+    def remove_account(self, account_id: str):
+        """Drop all the outages of an account."""
+        for disconnect_key in list(self._by_account.get(account_id, set())):
+            self._remove(account_id, disconnect_key)
+
+    @property
+    def total(self) -> OutageCounts:
+        """Counts of all the active outages."""
+        return self._total.counts()
+
+    def region(self, name: Optional[str]) -> OutageCounts:
+        """Counts of the active outages of a region."""
+        counter = self._regions.get(name)
+        return counter.counts() if counter else OutageCounts()
+
+    def area(self, name: Optional[str]) -> OutageCounts:
+        """Counts of the active outages of an area."""
+        counter = self._areas.get(name)
+        return counter.counts() if counter else OutageCounts()
+
+    def city(self, name: Optional[str]) -> OutageCounts:
+        """Counts of the active outages of a city."""
+        counter = self._cities.get(name)
+        return counter.counts() if counter else OutageCounts()
+
+    @property
+    def regions(self) -> dict[Optional[str], OutageCounts]:
+        """Counts of the regions with active outages."""
+        return {name: counter.counts() for name, counter in self._regions.items()}
+
+    @property
+    def areas(self) -> dict[Optional[str], OutageCounts]:
+        """Counts of the areas with active outages."""
+        return {name: counter.counts() for name, counter in self._areas.items()}
+
+    @property
+    def cities(self) -> dict[Optional[str], OutageCounts]:
+        """Counts of the cities with active outages."""
+        return {name: counter.counts() for name, counter in self._cities.items()}
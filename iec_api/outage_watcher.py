@@ -0,0 +1,236 @@
+"""Outage watcher, polling the outages of many accounts on an adaptive schedule and emitting only the changes."""
+
+import asyncio
+import heapq
+import logging
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+from iec_api import commons
+from iec_api.compact_outage import CompactOutage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_POLL_INTERVAL = 60  # Seconds, used while an account has active outages
+DEFAULT_MAX_POLL_INTERVAL = 15 * 60  # Seconds, reached by doubling the interval while an account is idle
+DEFAULT_WATCH_CONCURRENCY = 10
+DEFAULT_POLL_TIMEOUT = 30
+
+
+class OutageEventType(Enum):
+    """Outage Event Type enum."""
+
+    NEW = "new"
+    UPDATED = "updated"
+    RESOLVED = "resolved"
+
+
+@dataclass
+class OutageEvent:
+    """
+    A change of a disconnect affecting an account.
+
+    Attributes:
+        account_id (str): The account ID.
+        event_type (OutageEventType): The change.
+        outage (CompactOutage): The disconnect, as last seen.
+        previous (Optional[CompactOutage]): The disconnect before the change, None for new disconnects.
+    """
+
+    account_id: str
+    event_type: OutageEventType
+    outage: CompactOutage
+    previous: Optional[CompactOutage] = None
+
+
+def diff_outages(
+    account_id: str, previous: dict[str, CompactOutage], current: dict[str, CompactOutage]
+) -> list[OutageEvent]:
+    """
+    Diff two polls of the outages of an account.
+    A disconnect is updated when its treatment state or energized date changed, and resolved when it was energized
+    or when it disappeared while still active.
+    Args:
+        account_id (str): The account ID.
+        previous (dict[str, CompactOutage]): The previous outages, by disconnect key.
+        current (dict[str, CompactOutage]): The current outages, by disconnect key.
+    Returns:
+        list[OutageEvent]: The change events.
+    """
+    events = []
+    for key, outage in current.items():
+        before = previous.get(key)
+        if not before:
+            events.append(OutageEvent(account_id, OutageEventType.NEW, outage))
+        elif before.is_active and not outage.is_active:
+            events.append(OutageEvent(account_id, OutageEventType.RESOLVED, outage, before))
+        elif (
+            before.treatment_state_code != outage.treatment_state_code or before.energized_date != outage.energized_date
+        ):
+            events.append(OutageEvent(account_id, OutageEventType.UPDATED, outage, before))
+
+    for key, before in previous.items():
+        if key not in current and before.is_active:
+            events.append(OutageEvent(account_id, OutageEventType.RESOLVED, before, before))
+    return events
+
+
+@dataclass
+class _WatchedAccount:
+    interval: float
+    next_poll: float = 0
+    outages: Optional[dict[str, CompactOutage]] = None  # By disconnect key, None until the first successful poll
+
+
+class OutageWatcher:
+    """
+    Watches the outages of accounts. Every account is polled every min_interval while it has active outages or
+    changes, and the interval doubles up to max_interval while it is idle. Only changes are emitted.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[list[CompactOutage]]],
+        account_ids: Iterable[str] = (),
+        min_interval: float = DEFAULT_MIN_POLL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        max_concurrency: int = DEFAULT_WATCH_CONCURRENCY,
+        timeout: Optional[float] = DEFAULT_POLL_TIMEOUT,
+        on_event: Optional[Callable[[OutageEvent], None]] = None,
+        emit_initial: bool = True,
+    ):
+        """
+        Initializes the watcher.
+
+        Args:
+        fetch (Callable[[str], Awaitable[list[CompactOutage]]]): Fetches the outages of an account ID.
+        account_ids (Iterable[str]): The account IDs to watch.
+        min_interval (float): Seconds between polls of an account with active outages or changes.
+        max_interval (float): Maximal seconds between polls of an idle account.
+        max_concurrency (int): Maximal number of concurrent polls.
+        timeout (float): Timeout in seconds of a single poll.
+        on_event (Callable[[OutageEvent], None]): Called with every event.
+        emit_initial (bool): Whether the outages found by the first poll of an account are emitted as new.
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Poll intervals must be positive, and max interval at least min interval")
+
+        self._fetch = fetch
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._on_event = on_event
+        self._emit_initial = emit_initial
+        self._accounts: dict[str, _WatchedAccount] = {}
+        self._schedule: list[tuple[float, str]] = []  # Heap of (next poll, account ID), stale entries are skipped
+        self._account_added = asyncio.Event()  # Wakes up watch, so new accounts are polled at once
+        for account_id in account_ids:
+            self.add_account(account_id)
+
+    def add_account(self, account_id: str):
+        """Watch an account, polling it on the next poll."""
+        if account_id in self._accounts:
+            return
+        now = time.monotonic()
+        self._accounts[account_id] = _WatchedAccount(interval=self._min_interval, next_poll=now)
+        heapq.heappush(self._schedule, (now, account_id))
+        self._account_added.set()
+
+    def remove_account(self, account_id: str):
+        """Stop watching an account."""
+        self._accounts.pop(account_id, None)
+
+    def get_outages(self, account_id: str) -> list[CompactOutage]:
+        """Get the outages of an account, as last polled."""
+        account = self._accounts.get(account_id)
+        return list(account.outages.values()) if account and account.outages else []
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    @property
+    def next_poll_in(self) -> float:
+        """Seconds until the next account is due."""
+        while self._schedule:
+            next_poll, account_id = self._schedule[0]
+            account = self._accounts.get(account_id)
+            if account and account.next_poll == next_poll:
+                return max(0.0, next_poll - time.monotonic())
+            heapq.heappop(self._schedule)
+        return self._min_interval
+
+    def _pop_due(self) -> list[str]:
+        now = time.monotonic()
+        due = []
+        while self._schedule and self._schedule[0][0] <= now:
+            next_poll, account_id = heapq.heappop(self._schedule)
+            account = self._accounts.get(account_id)
+            if account and account.next_poll == next_poll:
+                due.append(account_id)
+        return due
+
+    def _reschedule(self, account_id: str, account: _WatchedAccount):
+        account.next_poll = time.monotonic() + account.interval
+        heapq.heappush(self._schedule, (account.next_poll, account_id))
+
+    async def poll(self) -> list[OutageEvent]:
+        """
+        Poll the accounts that are due.
+        Returns:
+            list[OutageEvent]: The change events, in poll completion order.
+        """
+        events: list[OutageEvent] = []
+        async for result in commons.fan_out(self._pop_due(), self._fetch, self._max_concurrency, self._timeout):
+            account = self._accounts.get(result.key)
+            if not account:  # Removed while polled
+                continue
+
+            if result.error:
+                logger.warning(f"Failed polling outages of account {result.key}: {result.error}")
+                self._reschedule(result.key, account)
+                continue
+
+            current = {outage.disconnect_key: outage for outage in result.result or []}
+            if account.outages is not None or self._emit_initial:
+                account_events = diff_outages(result.key, account.outages or {}, current)
+            else:
+                account_events = []
+            account.outages = current
+
+            if account_events or any(outage.is_active for outage in current.values()):
+                account.interval = self._min_interval
+            else:
+                account.interval = min(account.interval * 2, self._max_interval)
+            self._reschedule(result.key, account)
+
+            for event in account_events:
+                if self._on_event:
+                    try:
+                        self._on_event(event)
+                    except Exception:  # A failing callback must not stop the watcher
+                        logger.exception(f"Failed handling outage event of account {event.account_id}")
+            events.extend(account_events)
+        return events
+
+    async def watch(self) -> AsyncIterator[OutageEvent]:
+        """
+        Poll the accounts forever, as they are due, and newly added accounts at once.
+        Returns:
+            AsyncIterator[OutageEvent]: The change events
+        """
+        while True:
+            for event in await self.poll():
+                yield event
+            self._account_added.clear()
+            try:
+                await asyncio.wait_for(self._account_added.wait(), self.next_poll_in)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        """Poll the accounts forever, reporting the events only to on_event."""
+        async for _ in self.watch():
+            pass
@@ -0,0 +1,108 @@
+"""Apache Arrow and Parquet export of remote reading time series, partitioned by contract, meter and month."""
+
+from typing import Iterable, Iterator
+
+from iec_api.const import TIMEZONE
+from iec_api.models.remote_reading import MeterReadingData, RemoteReadingResponse
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.dataset
+
+    _HAS_PYARROW = True
+except ImportError:  # Optional, the "parquet" extra
+    _HAS_PYARROW = False
+
+PARTITION_COLUMNS = ["contract_number", "meter_serial", "month"]
+
+
+def _require_pyarrow():
+    if not _HAS_PYARROW:
+        raise ImportError("pyarrow is required for the Parquet export, install iec-api[parquet]")
+
+
+def reading_schema() -> "pyarrow.Schema":
+    """Schema of the reading record batches, with the month ("YYYY-MM", local time) to partition by."""
+    _require_pyarrow()
+    return pyarrow.schema(
+        [
+            ("contract_number", pyarrow.string()),
+            ("meter_serial", pyarrow.string()),
+            ("meter_code", pyarrow.string()),
+            ("meter_kind", pyarrow.int32()),
+            ("interval", pyarrow.timestamp("us", tz=TIMEZONE.zone)),
+            ("consumption", pyarrow.float64()),
+            ("back_stream", pyarrow.float64()),
+            ("status", pyarrow.int32()),
+            ("month", pyarrow.string()),
+        ]
+    )
+
+
+def reading_partitioning() -> "pyarrow.dataset.Partitioning":
+    """The hive partitioning of the Parquet dataset, to read the partition columns back as strings."""
+    schema = reading_schema()
+    return pyarrow.dataset.partitioning(
+        pyarrow.schema([schema.field(name) for name in PARTITION_COLUMNS]), flavor="hive"
+    )
+
+
+def meter_record_batch(contract_number: str, meter: MeterReadingData) -> "pyarrow.RecordBatch":
+    """
+    Build the record batch of the period consumptions of a meter.
+    Every column is built by Arrow in a single pass over the periods, the meter columns are constant.
+    Args:
+        contract_number (str): The contract number.
+        meter (MeterReadingData): The meter readings.
+    Returns:
+        RecordBatch: The batch, in reading_schema().
+    """
+    schema = reading_schema()
+    periods = meter.period_consumptions
+    size = len(periods)
+    interval = pyarrow.array([period.interval for period in periods], schema.field("interval").type)
+    return pyarrow.RecordBatch.from_arrays(
+        [
+            pyarrow.repeat(pyarrow.scalar(contract_number, pyarrow.string()), size),
+            pyarrow.repeat(pyarrow.scalar(meter.meter_serial, pyarrow.string()), size),
+            pyarrow.repeat(pyarrow.scalar(meter.meter_code, pyarrow.string()), size),
+            pyarrow.repeat(pyarrow.scalar(meter.meter_kind, pyarrow.int32()), size),
+            interval,
+            pyarrow.array([period.consumption for period in periods], pyarrow.float64()),
+            pyarrow.array([period.back_stream for period in periods], pyarrow.float64()),
+            pyarrow.array([period.status for period in periods], pyarrow.int32()),
+            # Formatted in the timezone of the type. Called by name, as the compute functions are generated at runtime
+            pyarrow.compute.call_function("strftime", [interval], pyarrow.compute.StrftimeOptions("%Y-%m")),
+        ],
+        schema=schema,
+    )
+
+
+def reading_record_batches(responses: Iterable[RemoteReadingResponse]) -> Iterator["pyarrow.RecordBatch"]:
+    """Build a record batch per meter of every remote reading response, lazily."""
+    for response in responses:
+        for meter in response.meter_list:
+            if meter.period_consumptions:
+                yield meter_record_batch(response.contract_number, meter)
+
+
+def write_readings_parquet(responses: Iterable[RemoteReadingResponse], base_dir: str) -> None:
+    """
+    Write remote readings as a Parquet dataset, hive partitioned by contract, meter and month
+    ("<base_dir>/contract_number=.../meter_serial=.../month=YYYY-MM/*.parquet"), for Spark or DuckDB to read directly.
+    The responses are streamed, one record batch in memory at a time. Partitions written before are overwritten.
+    Read it back with partitioning=reading_partitioning() to keep the partition columns as strings.
+    Args:
+        responses (Iterable[RemoteReadingResponse]): The remote reading responses, e.g. a year of daily readings.
+        base_dir (str): The dataset directory.
+    """
+    _require_pyarrow()
+    pyarrow.dataset.write_dataset(
+        reading_record_batches(responses),
+        base_dir,
+        schema=reading_schema(),
+        format="parquet",
+        partitioning=reading_partitioning(),
+        existing_data_behavior="delete_matching",
+    )
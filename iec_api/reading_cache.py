@@ -0,0 +1,199 @@
+"""Resolution-aware cache of remote readings.
+
+Remote readings are requested by a start date and a ``ReadingResolution``:
+
+- ``DAILY`` returns the intervals (e.g. 15 minutes) of the local day of ``from_date``.
+- ``WEEKLY`` returns one point per day for the 7 days starting at ``from_date``.
+- ``MONTHLY`` returns one point per day from ``from_date`` until the end of its calendar month.
+
+Since the coarser resolutions are daily totals, they can be derived from cached finer data. The cache keeps the
+daily totals it has seen per meter (from any resolution) and serves a request locally when every requested day is
+covered, so a DAILY -> WEEKLY -> MONTHLY sequence over the same range costs a single round trip per day.
+
+Only complete days that are already over (in local Israel time) are cached, as today's data is still changing.
+Responses are copied when stored and when returned, so callers may mutate them without corrupting the cache.
+
+The cache key leaves out the last invoice date of the request: it only affects ``future_consumption_info`` (the
+consumption since the last invoice, as of now), never the period consumptions of the requested days. That field is
+dropped from every cached response, as it would be stale when served later.
+"""
+
+import copy
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from iec_api.const import TIMEZONE
+from iec_api.models.remote_reading import (
+    MeterReadingData,
+    PeriodConsumption,
+    ReadingResolution,
+    RemoteReadingResponse,
+)
+from iec_api.reading_resampler import ResampleFrequency, resample
+
+logger = logging.getLogger(__name__)
+
+MeterKey = tuple[str, str, str, str]  # contract_id, meter_kind, meter_serial_number, meter_code
+
+
+@dataclass
+class _MeterCache:
+    """Cached readings of a single meter."""
+
+    contract_number: str
+    template: MeterReadingData
+    daily: dict[date, PeriodConsumption] = field(default_factory=dict)
+    intraday: dict[date, RemoteReadingResponse] = field(default_factory=dict)
+
+
+def requested_days(resolution: ReadingResolution, from_date: date) -> list[date]:
+    """
+    Get the local days covered by a remote reading request.
+    A MONTHLY request is assumed to cover from_date until the end of its calendar month (not a full month from
+    from_date), as the IEC API answers it, so a month is only served whole when requested from its first day.
+    Args:
+        resolution (ReadingResolution): The requested resolution.
+        from_date (date): The requested start date.
+    Returns:
+        list[date]: The covered days, in chronological order.
+    """
+    if resolution == ReadingResolution.DAILY:
+        return [from_date]
+    if resolution == ReadingResolution.WEEKLY:
+        return [from_date + timedelta(days=i) for i in range(7)]
+
+    next_month = (from_date.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return [from_date + timedelta(days=i) for i in range((next_month - from_date).days)]
+
+
+class RemoteReadingCache:
+    """Resolution-aware cache of remote readings, keyed by contract and meter."""
+
+    def __init__(self, max_meters: int = 64):
+        """
+        Initializes the cache.
+
+        Args:
+        max_meters (int): Maximal number of meters to keep, least recently used meters are evicted first.
+        """
+        self._max_meters = max_meters
+        self._meters: OrderedDict[MeterKey, _MeterCache] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._meters.clear()
+
+    def get(
+        self, key: MeterKey, from_date: datetime | date, resolution: ReadingResolution
+    ) -> Optional[RemoteReadingResponse]:
+        """
+        Serve a remote reading request from the cache.
+        Args:
+            key (MeterKey): The contract and meter identifiers.
+            from_date (datetime | date): The requested start date.
+            resolution (ReadingResolution): The requested resolution.
+        Returns:
+            RemoteReadingResponse: The cached or derived response, or None on a cache miss.
+        """
+        meter = self._meters.get(key)
+        day = from_date.date() if isinstance(from_date, datetime) else from_date
+        response = self._get_from_meter(meter, day, resolution) if meter else None
+
+        if response is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._meters.move_to_end(key)
+        return copy.deepcopy(response)
+
+    def put(
+        self,
+        key: MeterKey,
+        from_date: datetime | date,
+        resolution: ReadingResolution,
+        response: Optional[RemoteReadingResponse],
+    ):
+        """
+        Store the settled days of a remote reading response.
+        Args:
+            key (MeterKey): The contract and meter identifiers.
+            from_date (datetime | date): The requested start date.
+            resolution (ReadingResolution): The requested resolution.
+            response (RemoteReadingResponse): The response returned by IEC API.
+        """
+        if not response or not response.meter_list:
+            return
+
+        day = from_date.date() if isinstance(from_date, datetime) else from_date
+        today = datetime.now(TIMEZONE).date()
+        # Stored as a copy, the caller keeps the response it got from the API
+        response = copy.deepcopy(response)
+        meter_data = response.meter_list[0] = replace(response.meter_list[0], future_consumption_info=None)
+
+        meter = self._meters.get(key)
+        if meter is None:
+            meter = _MeterCache(contract_number=response.contract_number, template=meter_data)
+            self._meters[key] = meter
+        else:
+            meter.template = meter_data
+        self._meters.move_to_end(key)
+        while len(self._meters) > self._max_meters:
+            self._meters.popitem(last=False)
+
+        if resolution == ReadingResolution.DAILY:
+            if day >= today or not meter_data.period_consumptions:
+                return
+            buckets = resample(meter_data.period_consumptions, ResampleFrequency.DAILY)
+            if len(buckets) != 1 or not buckets[0].is_complete:
+                logger.debug(f"Not caching incomplete remote reading of {day}")
+                return
+            bucket = buckets[0]
+            meter.intraday[day] = response
+            meter.daily[day] = PeriodConsumption(
+                interval=bucket.start,
+                consumption=bucket.total,
+                back_stream=bucket.back_stream,
+                status=1 if bucket.flagged_count else 0,
+            )
+        else:
+            for pc in meter_data.period_consumptions:
+                pc_day = pc.interval.astimezone(TIMEZONE).date()
+                if pc_day < today:
+                    meter.daily[pc_day] = pc
+
+    @staticmethod
+    def _get_from_meter(
+        meter: _MeterCache, day: date, resolution: ReadingResolution
+    ) -> Optional[RemoteReadingResponse]:
+        if resolution == ReadingResolution.DAILY:
+            return meter.intraday.get(day)
+
+        days = requested_days(resolution, day)
+        points = [meter.daily.get(d) for d in days]
+        if any(point is None for point in points):
+            return None
+
+        consumptions = [point for point in points if point is not None]
+        # The template is the meter data of another request, so drop its fields describing a different period
+        meter_data = replace(
+            meter.template,
+            future_consumption_info=None,
+            number_of_period_aggregated=None,
+            total_import=None,
+            total_export=None,
+            total_import_date_for_period=None,
+            status_for_period=None,
+            start_date=days[0],
+            end_date=days[-1],
+            total_consumption_for_period=sum(pc.consumption for pc in consumptions),
+            total_back_stream_for_period=sum(pc.back_stream for pc in consumptions),
+            period_consumptions=consumptions,
+        )
+        return RemoteReadingResponse(
+            report_status=0, contract_number=meter.contract_number, meter_list=[meter_data], taoz_list=[]
+        )
@@ -0,0 +1,259 @@
+"""Local resampling of remote reading series.
+
+IEC only aggregates remote readings server-side to DAILY/WEEKLY/MONTHLY resolutions. This module rolls
+``PeriodConsumption`` series up to coarser buckets locally, in a single pass over the (already sorted) series,
+so callers don't need to re-request the same range at a coarser resolution.
+
+All bucket boundaries are computed in local Israel time (Asia/Jerusalem), so days around DST transitions are
+23 or 25 hours long and the expected number of intervals per bucket is adjusted accordingly.
+"""
+
+import math
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import Iterable, Optional, Sequence
+
+from iec_api.const import TIMEZONE
+from iec_api.models.invoice import Invoice
+from iec_api.models.remote_reading import MeterReadingData, PeriodConsumption
+
+SUNDAY = 6  # datetime.weekday() value of Sunday, the first day of the week in Israel
+
+
+class ResampleFrequency(Enum):
+    """Resample Frequency enum."""
+
+    HOURLY = "hourly"
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+
+@dataclass
+class ConsumptionBucket:
+    """Aggregated consumption of a single bucket.
+
+    Attributes:
+        start (datetime): Bucket start (inclusive), tz-aware in local time.
+        end (datetime): Bucket end (exclusive), tz-aware in local time.
+        total (float): Sum of the consumption of the included intervals.
+        back_stream (float): Sum of the back stream of the included intervals.
+        count (int): Number of intervals included in the aggregation.
+        flagged_count (int): Number of intervals with a non-zero status.
+        skipped_count (int): Number of flagged intervals left out of the aggregation.
+        expected_count (Optional[int]): Number of intervals expected in the bucket, if the step is known.
+        min (Optional[float]): Minimal interval consumption.
+        max (Optional[float]): Maximal interval consumption.
+        percentiles (dict[float, float]): Requested percentiles of the interval consumption.
+    """
+
+    start: datetime
+    end: datetime
+    total: float = 0.0
+    back_stream: float = 0.0
+    count: int = 0
+    flagged_count: int = 0
+    skipped_count: int = 0
+    expected_count: Optional[int] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: dict[float, float] = field(default_factory=dict)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def missing_count(self) -> int:
+        if self.expected_count is None:
+            return 0
+        return max(self.expected_count - self.count - self.skipped_count, 0)
+
+    @property
+    def is_complete(self) -> bool:
+        return self.missing_count == 0
+
+
+def _local_midnight(day: date) -> datetime:
+    return TIMEZONE.localize(datetime.combine(day, time()))
+
+
+def _bucket_bounds(interval: datetime, frequency: ResampleFrequency, week_start: int) -> tuple[datetime, datetime]:
+    """Get the local [start, end) bounds of the bucket containing the given interval."""
+    if frequency == ResampleFrequency.HOURLY:
+        # Israel offsets are whole hours, so flooring the UTC timestamp keeps both 01:00 hours of the
+        # fall-back day apart.
+        start_ts = math.floor(interval.timestamp() / 3600) * 3600
+        return datetime.fromtimestamp(start_ts, TIMEZONE), datetime.fromtimestamp(start_ts + 3600, TIMEZONE)
+
+    day = interval.astimezone(TIMEZONE).date()
+    if frequency == ResampleFrequency.DAILY:
+        return _local_midnight(day), _local_midnight(day + timedelta(days=1))
+    if frequency == ResampleFrequency.WEEKLY:
+        first_day = day - timedelta(days=(day.weekday() - week_start) % 7)
+        return _local_midnight(first_day), _local_midnight(first_day + timedelta(days=7))
+
+    first_day = day.replace(day=1)
+    next_month = (first_day + timedelta(days=32)).replace(day=1)
+    return _local_midnight(first_day), _local_midnight(next_month)
+
+
+def infer_step(consumptions: Sequence[PeriodConsumption], sample_size: int = 100) -> Optional[timedelta]:
+    """
+    Infer the interval step (e.g. 15 minutes) of a sorted series from its most common gap.
+    Args:
+        consumptions (Sequence[PeriodConsumption]): Series sorted by interval.
+        sample_size (int): Number of leading gaps to sample.
+    Returns:
+        Optional[timedelta]: The inferred step, or None if the series is too short.
+    """
+    gaps: Counter[float] = Counter()
+    for prev, curr in zip(consumptions, consumptions[1 : sample_size + 1]):
+        gap = curr.interval.timestamp() - prev.interval.timestamp()
+        if gap > 0:
+            gaps[gap] += 1
+    if not gaps:
+        return None
+    return timedelta(seconds=gaps.most_common(1)[0][0])
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Linear interpolation percentile, same as numpy's default method."""
+    rank = (len(sorted_values) - 1) * q / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+class _BucketBuilder:
+    """Accumulates a single bucket in O(1) memory, unless percentiles were requested."""
+
+    def __init__(self, start: datetime, end: datetime, keep_values: bool):
+        self.bucket = ConsumptionBucket(start=start, end=end)
+        self.values: Optional[list[float]] = [] if keep_values else None
+
+    def add(self, pc: PeriodConsumption, include: bool):
+        bucket = self.bucket
+        if pc.status:
+            bucket.flagged_count += 1
+        if not include:
+            bucket.skipped_count += 1
+            return
+        bucket.count += 1
+        bucket.total += pc.consumption
+        bucket.back_stream += pc.back_stream
+        if bucket.min is None or pc.consumption < bucket.min:
+            bucket.min = pc.consumption
+        if bucket.max is None or pc.consumption > bucket.max:
+            bucket.max = pc.consumption
+        if self.values is not None:
+            self.values.append(pc.consumption)
+
+    def build(self, step: Optional[timedelta], percentiles: Sequence[float]) -> ConsumptionBucket:
+        bucket = self.bucket
+        if step:
+            duration = bucket.end.timestamp() - bucket.start.timestamp()
+            bucket.expected_count = round(duration / step.total_seconds())
+        if self.values:
+            self.values.sort()
+            bucket.percentiles = {q: _percentile(self.values, q) for q in percentiles}
+        return bucket
+
+
+def resample(
+    consumptions: Iterable[PeriodConsumption],
+    frequency: ResampleFrequency,
+    percentiles: Sequence[float] = (),
+    include_flagged: bool = True,
+    step: Optional[timedelta] = None,
+    week_start: int = SUNDAY,
+) -> list[ConsumptionBucket]:
+    """
+    Resample a period consumption series to a coarser frequency in a single pass.
+    Args:
+        consumptions (Iterable[PeriodConsumption]): Series sorted by interval (as returned by the API).
+        frequency (ResampleFrequency): The target frequency.
+        percentiles (Sequence[float]): Percentiles (0-100) of the interval consumption to compute per bucket.
+        include_flagged (bool): Whether intervals with a non-zero status are aggregated. Default is True.
+        step (timedelta): Interval step of the series, used for missing interval detection. Inferred if omitted.
+        week_start (int): First weekday of WEEKLY buckets (datetime.weekday() value). Default is Sunday.
+    Returns:
+        list[ConsumptionBucket]: Buckets that have at least one interval, in chronological order.
+    """
+    for q in percentiles:
+        if not 0 <= q <= 100:
+            raise ValueError("Percentiles must be between 0 and 100")
+
+    series = consumptions if isinstance(consumptions, Sequence) else list(consumptions)
+    if step is None:
+        step = infer_step(series)
+
+    buckets: list[ConsumptionBucket] = []
+    current: Optional[_BucketBuilder] = None
+    for pc in series:
+        if current is None or not current.bucket.start <= pc.interval < current.bucket.end:
+            if current is not None:
+                buckets.append(current.build(step, percentiles))
+            start, end = _bucket_bounds(pc.interval, frequency, week_start)
+            current = _BucketBuilder(start, end, keep_values=bool(percentiles))
+        current.add(pc, include=include_flagged or not pc.status)
+
+    if current is not None:
+        buckets.append(current.build(step, percentiles))
+    return buckets
+
+
+def resample_to_periods(
+    consumptions: Iterable[PeriodConsumption],
+    periods: Sequence[tuple[datetime, datetime]],
+    percentiles: Sequence[float] = (),
+    include_flagged: bool = True,
+    step: Optional[timedelta] = None,
+) -> list[ConsumptionBucket]:
+    """
+    Aggregate a period consumption series into arbitrary [start, end) periods, e.g. billing periods.
+    Args:
+        consumptions (Iterable[PeriodConsumption]): Series sorted by interval.
+        periods (Sequence[tuple[datetime, datetime]]): Non-overlapping tz-aware periods.
+        percentiles (Sequence[float]): Percentiles (0-100) of the interval consumption to compute per period.
+        include_flagged (bool): Whether intervals with a non-zero status are aggregated. Default is True.
+        step (timedelta): Interval step of the series, used for missing interval detection. Inferred if omitted.
+    Returns:
+        list[ConsumptionBucket]: One bucket per period, in the order of the sorted periods.
+    """
+    series = consumptions if isinstance(consumptions, Sequence) else list(consumptions)
+    if step is None:
+        step = infer_step(series)
+
+    sorted_periods = sorted(periods)
+    starts = [start.timestamp() for start, _ in sorted_periods]
+    builders = [_BucketBuilder(start, end, keep_values=bool(percentiles)) for start, end in sorted_periods]
+
+    for pc in series:
+        idx = bisect_right(starts, pc.interval.timestamp()) - 1
+        if idx >= 0 and pc.interval < builders[idx].bucket.end:
+            builders[idx].add(pc, include=include_flagged or not pc.status)
+
+    return [builder.build(step, percentiles) for builder in builders]
+
+
+def billing_periods(invoices: Iterable[Invoice]) -> list[tuple[datetime, datetime]]:
+    """
+    Build [start, end) billing periods from invoices, to be used with resample_to_periods.
+    The invoice to_date is the last billed day, so the period ends at the following local midnight.
+    """
+    periods = []
+    for invoice in invoices:
+        if invoice.from_date and invoice.to_date:
+            start = _local_midnight(invoice.from_date.astimezone(TIMEZONE).date())
+            end = _local_midnight(invoice.to_date.astimezone(TIMEZONE).date() + timedelta(days=1))
+            periods.append((start, end))
+    return periods
+
+
+def resample_meter_reading(meter: MeterReadingData, frequency: ResampleFrequency, **kwargs) -> list[ConsumptionBucket]:
+    """Resample the period consumptions of a single meter of a RemoteReadingResponse."""
+    return resample(meter.period_consumptions, frequency, **kwargs)
@@ -115,8 +115,8 @@ async def _get_connection_to_power_size(session: ClientSession) -> dict[str, flo
     return connection_to_power_size_map
 
 
-async def get_power_size(session: ClientSession, connection: str) -> float:
-    """Get PowerSize by Connection (incl. VAT) from IEC API."""
+async def get_power_size(session: ClientSession, connection: str, include_vat: bool = True) -> float:
+    """Get PowerSize by Connection (incl. VAT unless include_vat is False) from IEC API."""
 
     key = connection_to_power_size_key
     if key not in cache:
@@ -126,6 +126,8 @@ async def get_power_size(session: ClientSession, connection: str) -> float:
 
     # If connection is not found, return 0
     power_size = connection_to_power_size_map.get(connection, 0)
+    if not include_vat:
+        return float(power_size)
 
     vat = await _get_vat(session)
     return round(power_size * (1 + float(vat)), 2)
@@ -0,0 +1,157 @@
+"""Flat and Time-of-Use (TAOZ) cost computation over remote reading series.
+
+``RemoteReadingResponse.taoz_list`` marks the TAOZ band in effect from each of its intervals onward. The cost
+engine merge-joins a sorted period consumption series with the sorted TAOZ series and prices every interval under
+any number of tariff plans in a single pass, so plans can be compared over long ranges without re-iterating the data.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Sequence
+
+from iec_api.const import TIMEZONE
+from iec_api.models.remote_reading import PeriodConsumption, TaozReading
+
+DAYS_PER_YEAR = 365
+MONTHS_PER_YEAR = 12
+
+
+@dataclass(frozen=True)
+class TariffPlan:
+    """
+    A kWh pricing plan. All rates are in ILS and include VAT.
+
+    Attributes:
+        name (str): The plan name, used as the key of the computed costs.
+        kwh_rate (float): Rate per kWh, used for flat plans and for intervals without a specific band rate.
+        band_rates (dict[int, float]): Rate per kWh by TAOZ band, for Time-of-Use plans.
+        fixed_monthly_charge (float): Fixed charges per month (e.g. distribution and delivery), prorated per day
+            with prorate_monthly_charge.
+    """
+
+    name: str
+    kwh_rate: float
+    band_rates: dict[int, float] = field(default_factory=dict)
+    fixed_monthly_charge: float = 0.0
+
+    @classmethod
+    def with_discounts(
+        cls, name: str, kwh_rate: float, band_discounts: dict[int, float], fixed_monthly_charge: float = 0.0
+    ) -> "TariffPlan":
+        """
+        Build a Time-of-Use plan from discounts over the base kWh rate, as IEC suppliers usually publish them.
+        Args:
+            name (str): The plan name.
+            kwh_rate (float): The base rate per kWh.
+            band_discounts (dict[int, float]): Discount (0-1) by TAOZ band, e.g. {1: 0.2} for 20% off in band 1.
+            fixed_monthly_charge (float): Fixed charges per month.
+        Returns:
+            TariffPlan: The Time-of-Use plan.
+        """
+        band_rates = {band: kwh_rate * (1 - discount) for band, discount in band_discounts.items()}
+        return cls(name=name, kwh_rate=kwh_rate, band_rates=band_rates, fixed_monthly_charge=fixed_monthly_charge)
+
+    def rate(self, band: Optional[int]) -> float:
+        if band is None:
+            return self.kwh_rate
+        return self.band_rates.get(band, self.kwh_rate)
+
+
+@dataclass
+class CostBreakdown:
+    """
+    Cost of a consumption series under a single tariff plan.
+
+    Attributes:
+        plan (str): The plan name.
+        total_kwh (float): Total consumption.
+        energy_cost (float): Cost of the consumption.
+        fixed_cost (float): Prorated fixed charges for the days covered by the series.
+        days (int): Number of local days covered by the series.
+        kwh_by_band (dict[Optional[int], float]): Consumption by TAOZ band (None when no band is known).
+        cost_by_band (dict[Optional[int], float]): Energy cost by TAOZ band.
+        interval_costs (Optional[list[float]]): Energy cost per interval, aligned with the input series.
+    """
+
+    plan: str
+    total_kwh: float = 0.0
+    energy_cost: float = 0.0
+    fixed_cost: float = 0.0
+    days: int = 0
+    kwh_by_band: dict[Optional[int], float] = field(default_factory=dict)
+    cost_by_band: dict[Optional[int], float] = field(default_factory=dict)
+    interval_costs: Optional[list[float]] = None
+
+    @property
+    def total(self) -> float:
+        return self.energy_cost + self.fixed_cost
+
+
+def compute_costs(
+    consumptions: Iterable[PeriodConsumption],
+    taoz_list: Sequence[TaozReading],
+    plans: Sequence[TariffPlan],
+    include_intervals: bool = False,
+) -> dict[str, CostBreakdown]:
+    """
+    Price a consumption series under several tariff plans in a single pass.
+    Args:
+        consumptions (Iterable[PeriodConsumption]): Series sorted by interval (as returned by the API).
+        taoz_list (Sequence[TaozReading]): TAOZ bands sorted by interval. May be empty for flat plans.
+        plans (Sequence[TariffPlan]): The plans to price the series with.
+        include_intervals (bool): Whether to keep the cost of every interval. Default is False.
+    Returns:
+        dict[str, CostBreakdown]: The cost breakdown by plan name.
+    """
+    if len({plan.name for plan in plans}) != len(plans):
+        raise ValueError("Plan names must be unique")
+
+    breakdowns = [CostBreakdown(plan=plan.name, interval_costs=[] if include_intervals else None) for plan in plans]
+    # Rates are resolved once per band change instead of once per interval
+    rates = [plan.rate(None) for plan in plans]
+
+    taoz_idx = -1
+    band: Optional[int] = None
+    last_day = None
+    days = 0
+
+    for pc in consumptions:
+        while taoz_idx + 1 < len(taoz_list) and taoz_list[taoz_idx + 1].interval <= pc.interval:
+            taoz_idx += 1
+            if taoz_list[taoz_idx].taoz != band:
+                band = taoz_list[taoz_idx].taoz
+                rates = [plan.rate(band) for plan in plans]
+
+        day = pc.interval.astimezone(TIMEZONE).date()
+        if day != last_day:
+            days += 1
+            last_day = day
+
+        kwh = pc.consumption
+        for breakdown, rate in zip(breakdowns, rates):
+            cost = kwh * rate
+            breakdown.total_kwh += kwh
+            breakdown.energy_cost += cost
+            breakdown.kwh_by_band[band] = breakdown.kwh_by_band.get(band, 0.0) + kwh
+            breakdown.cost_by_band[band] = breakdown.cost_by_band.get(band, 0.0) + cost
+            if breakdown.interval_costs is not None:
+                breakdown.interval_costs.append(cost)
+
+    for breakdown, plan in zip(breakdowns, plans):
+        breakdown.days = days
+        breakdown.fixed_cost = prorate_monthly_charge(plan.fixed_monthly_charge, days)
+
+    return {breakdown.plan: breakdown for breakdown in breakdowns}
+
+
+def prorate_monthly_charge(monthly_charge: float, days: int | float) -> float:
+    """
+    Prorate a monthly charge to the given number of days.
+    The distribution and delivery tariffs are monthly charges (ILS per month, including VAT), and a day is charged
+    12/365 of a month, so 365 days cost exactly 12 monthly charges whatever the lengths of the calendar months.
+    Args:
+        monthly_charge (float): The charge per month.
+        days (int | float): The number of days.
+    Returns:
+        float: The charge for the days.
+    """
+    return monthly_charge * MONTHS_PER_YEAR / DAYS_PER_YEAR * days
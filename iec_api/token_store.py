@@ -0,0 +1,215 @@
+"""Token stores, persisting the tokens of many users with optional encryption (see login.encrypt_token)."""
+
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+from typing import Callable, Iterable, Optional, TypeVar
+
+from iec_api import commons, login
+from iec_api.models.jwt import JWT
+
+T = TypeVar("T")
+logger = logging.getLogger(__name__)
+
+
+def _check_user_id(user_id: str | int) -> str:
+    if not commons.is_valid_israeli_id(user_id):
+        raise ValueError("User ID must be a valid Israeli ID.")
+    return str(user_id)
+
+
+class TokenStore(ABC):
+    """Store of the tokens of many users, by user ID. Batch methods load or save many tokens in a single pass."""
+
+    _executor: Optional[commons.BlockingExecutor] = None  # Runs the blocking I/O and crypto, default is shared
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        return await (self._executor or commons.get_default_executor()).run(func, *args)
+
+    @abstractmethod
+    async def load_many(self, user_ids: Optional[Iterable[str]] = None) -> dict[str, JWT]:
+        """
+        Load the tokens of many users.
+        Args:
+            user_ids (Iterable[str]): The user IDs. Default is all the users in the store.
+        Returns:
+            dict[str, JWT]: The tokens by user ID, users without a readable token are missing.
+        """
+
+    @abstractmethod
+    async def save_many(self, tokens: dict[str, JWT]) -> None:
+        """
+        Save the tokens of many users, replacing their existing tokens.
+        Args:
+            tokens (dict[str, JWT]): The tokens by user ID.
+        """
+
+    @abstractmethod
+    async def delete(self, user_id: str) -> None:
+        """
+        Delete the token of a user, if exists.
+        Args:
+            user_id (str): The user ID.
+        """
+
+    async def load(self, user_id: str) -> Optional[JWT]:
+        """
+        Load the token of a user.
+        Args:
+            user_id (str): The user ID.
+        Returns:
+            JWT: The token, None if the user has no token.
+        """
+        return (await self.load_many([user_id])).get(str(user_id))
+
+    async def save(self, user_id: str, token: JWT) -> None:
+        """
+        Save the token of a user.
+        Args:
+            user_id (str): The user ID.
+            token (JWT): The token.
+        """
+        await self.save_many({user_id: token})
+
+    async def rotate(self) -> int:
+        """
+        Re-encrypt all tokens with the first key of IEC_TOKEN_ENCRYPTION_KEY, to retire the older keys.
+        Returns:
+            int: Number of re-encrypted tokens.
+        """
+        tokens = await self.load_many()
+        await self.save_many(tokens)
+        return len(tokens)
+
+
+class MemoryTokenStore(TokenStore):
+    """In-memory token store, mostly for tests and short-lived processes."""
+
+    def __init__(self):
+        self._tokens: dict[str, JWT] = {}
+
+    async def load_many(self, user_ids: Optional[Iterable[str]] = None) -> dict[str, JWT]:
+        if user_ids is None:
+            return dict(self._tokens)
+        return {str(user_id): self._tokens[str(user_id)] for user_id in user_ids if str(user_id) in self._tokens}
+
+    async def save_many(self, tokens: dict[str, JWT]) -> None:
+        self._tokens.update({_check_user_id(user_id): token for user_id, token in tokens.items()})
+
+    async def delete(self, user_id: str) -> None:
+        self._tokens.pop(str(user_id), None)
+
+
+class DirectoryTokenStore(TokenStore):
+    """Token store keeping a "<user ID>.json" file per user in a directory, the files are replaced atomically."""
+
+    SUFFIX = ".json"
+
+    def __init__(self, directory: str, executor: Optional[commons.BlockingExecutor] = None):
+        self._directory = directory
+        self._executor = executor
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, user_id: str) -> str:
+        return os.path.join(self._directory, f"{user_id}{self.SUFFIX}")
+
+    def _read_all(self, user_ids: Optional[Iterable[str]]) -> dict[str, JWT]:
+        if user_ids is None:
+            user_ids = [
+                name.removesuffix(self.SUFFIX) for name in os.listdir(self._directory) if name.endswith(self.SUFFIX)
+            ]
+
+        tokens = {}
+        for user_id in map(str, user_ids):
+            try:
+                with open(self._path(_check_user_id(user_id)), "rb") as f:
+                    tokens[user_id] = login.decrypt_token(f.read())
+            except FileNotFoundError:
+                continue
+            except Exception as ex:
+                logger.warning(f"Failed reading token of user {user_id}: {ex}")
+        return tokens
+
+    def _write_all(self, tokens: dict[str, JWT]) -> None:
+        for user_id, token in tokens.items():
+            path = self._path(_check_user_id(user_id))
+            fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(login.encrypt_token(token))
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+    def _remove(self, user_id: str) -> None:
+        try:
+            os.remove(self._path(_check_user_id(user_id)))
+        except FileNotFoundError:
+            pass
+
+    async def load_many(self, user_ids: Optional[Iterable[str]] = None) -> dict[str, JWT]:
+        return await self._run(self._read_all, user_ids)
+
+    async def save_many(self, tokens: dict[str, JWT]) -> None:
+        await self._run(self._write_all, tokens)
+
+    async def delete(self, user_id: str) -> None:
+        await self._run(self._remove, user_id)
+
+
+class SqliteTokenStore(TokenStore):
+    """Token store keeping all the tokens in a single SQLite table, every batch is a single transaction."""
+
+    def __init__(self, path: str, executor: Optional[commons.BlockingExecutor] = None):
+        self._path = path
+        self._executor = executor
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tokens (user_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path)
+
+    def _read_all(self, user_ids: Optional[Iterable[str]]) -> dict[str, JWT]:
+        with closing(self._connect()) as connection:
+            if user_ids is None:
+                rows = connection.execute("SELECT user_id, data FROM tokens").fetchall()
+            else:
+                connection.execute("CREATE TEMP TABLE requested (user_id TEXT PRIMARY KEY)")
+                connection.executemany("INSERT OR IGNORE INTO requested VALUES (?)", ((str(u),) for u in user_ids))
+                rows = connection.execute(
+                    "SELECT tokens.user_id, data FROM tokens JOIN requested USING (user_id)"
+                ).fetchall()
+
+        tokens = {}
+        for user_id, data in rows:
+            try:
+                tokens[user_id] = login.decrypt_token(data)
+            except Exception as ex:
+                logger.warning(f"Failed reading token of user {user_id}: {ex}")
+        return tokens
+
+    def _write_all(self, tokens: dict[str, JWT]) -> None:
+        now = time.time()
+        rows = [(_check_user_id(user_id), login.encrypt_token(token), now) for user_id, token in tokens.items()]
+        with closing(self._connect()) as connection, connection:
+            connection.executemany("INSERT OR REPLACE INTO tokens VALUES (?, ?, ?)", rows)
+
+    def _remove(self, user_id: str) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM tokens WHERE user_id = ?", (str(user_id),))
+
+    async def load_many(self, user_ids: Optional[Iterable[str]] = None) -> dict[str, JWT]:
+        return await self._run(self._read_all, user_ids)
+
+    async def save_many(self, tokens: dict[str, JWT]) -> None:
+        await self._run(self._write_all, tokens)
+
+    async def delete(self, user_id: str) -> None:
+        await self._run(self._remove, user_id)
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from iec_api.models.device import Device
+from iec_api.models.exceptions import IECError
+from tests.helpers import make_client
+
+
+class AccountSnapshotTest(unittest.IsolatedAsyncioTestCase):
+    async def test_partial_results_and_errors(self):
+        client = make_client(self)
+        client._bp_number = "bp"
+        contracts = [MagicMock(contract_id="c1"), MagicMock(contract_id="c2")]
+
+        with (
+            patch.object(client, "get_customer", AsyncMock(return_value=MagicMock(bp_number="bp"))),
+            patch.object(client, "get_contracts", AsyncMock(return_value=contracts)),
+            patch.object(client, "get_devices", AsyncMock(return_value=[Device(True, 3, "d1", "1")])),
+            patch.object(client, "get_device_by_device_id", AsyncMock(return_value="details")),
+            patch.object(client, "get_last_meter_reading", AsyncMock(return_value="reading")),
+            patch.object(client, "get_billing_invoices", AsyncMock(side_effect=IECError(500, "boom"))),
+            patch.object(client, "get_electric_bill", AsyncMock(return_value="bill")),
+        ):
+            snapshot = await client.get_account_snapshot(max_concurrency=2)
+
+        self.assertFalse(snapshot.is_complete)
+        self.assertEqual([c.contract.contract_id for c in snapshot.contracts], ["c1", "c2"])
+        for contract_snapshot in snapshot.contracts:
+            self.assertEqual(contract_snapshot.device_details, {"d1": "details"})
+            self.assertEqual(contract_snapshot.last_meter_reading, "reading")
+            self.assertEqual(contract_snapshot.electric_bill, "bill")
+            self.assertIsNone(contract_snapshot.billing_invoices)
+            self.assertIsInstance(contract_snapshot.errors["billing_invoices"], IECError)
+
+    async def test_customer_failure_without_bp_number(self):
+        client = make_client(self)
+
+        with patch.object(client, "get_customer", AsyncMock(side_effect=IECError(401, "unauthorized"))):
+            snapshot = await client.get_account_snapshot()
+
+        self.assertIsNone(snapshot.customer)
+        self.assertEqual(snapshot.contracts, [])
+        self.assertIn("customer", snapshot.errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
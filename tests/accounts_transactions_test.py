@@ -0,0 +1,41 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from iec_api import fault_portal_data
+from iec_api.fault_portal_models.accounts_transactions import AccountsTransactionsResponse
+from iec_api.models.exceptions import IECError
+
+
+class AccountsTransactionsInChunksTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.requests: list[list[str]] = []
+
+    async def post(self, session, token, accounts, state_code):
+        self.requests.append(accounts)
+        if "bad" in accounts:
+            raise IECError(500, "down")
+        return AccountsTransactionsResponse(consumption_order_view_type_code=len(accounts), logical_name="account")
+
+    async def test_chunks_and_maps_back(self):
+        accounts = [f"account-{i}" for i in range(7)]
+        with patch.object(fault_portal_data, "post_accounts_transactions", self.post):
+            results = await fault_portal_data.post_accounts_transactions_in_chunks(
+                MagicMock(), MagicMock(), accounts + ["account-0", "bad"], chunk_size=3
+            )
+
+        self.assertEqual(sorted(len(chunk) for chunk in self.requests), [2, 3, 3])
+        self.assertEqual(list(results), accounts + ["bad"])
+        transactions = results["account-0"].result
+        assert transactions is not None
+        self.assertEqual(transactions.consumption_order_view_type_code, 3)
+        self.assertIsNone(results["account-0"].error)
+        self.assertIsInstance(results["bad"].error, IECError)
+        self.assertIs(results["account-6"].error, results["bad"].error)  # Same chunk
+
+    async def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            await fault_portal_data.post_accounts_transactions_in_chunks(MagicMock(), MagicMock(), ["a"], chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
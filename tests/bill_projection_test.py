@@ -0,0 +1,103 @@
+import unittest
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+from iec_api.bill_projection import DEFAULT_BILLING_CYCLE_DAYS, project_bill
+from iec_api.models.device import ConnectionSize, CounterDevice, Device, Devices
+from iec_api.models.remote_reading import FutureConsumptionInfo, MeterReadingData, RemoteReadingResponse
+from iec_api.tariff_cost import prorate_monthly_charge
+from tests.helpers import make_client
+
+
+class ProjectBillTest(unittest.TestCase):
+    def test_projection_extrapolates_to_cycle(self):
+        info = FutureConsumptionInfo(
+            last_invoice_date="2024-01-01", current_date=date(2024, 1, 16), future_consumption=150.0
+        )
+
+        projection = project_bill(info, kwh_tariff=0.6, distribution_tariff=10.0, delivery_tariff=20.0)
+
+        self.assertEqual(projection.days_elapsed, 15)
+        self.assertEqual(projection.cycle_days, DEFAULT_BILLING_CYCLE_DAYS)
+        self.assertAlmostEqual(projection.projected_consumption, 600.0)
+        self.assertAlmostEqual(projection.energy_cost, 360.0)
+        self.assertAlmostEqual(projection.fixed_cost, prorate_monthly_charge(30.0, DEFAULT_BILLING_CYCLE_DAYS))
+        self.assertEqual(projection.projected_amount, round(projection.energy_cost + projection.fixed_cost, 2))
+
+    def test_projected_amount_pinned(self):
+        # Example inputs, all rates including VAT: 0.6402 ILS per kWh, 27.78 + 17.10 ILS distribution and delivery
+        # per month, and 79 ILS per KVA per year for a 5.5 KVA connection (its power size, without VAT)
+        info = FutureConsumptionInfo(
+            last_invoice_date="2024-01-01", current_date=date(2024, 1, 16), future_consumption=150.0
+        )
+
+        projection = project_bill(
+            info,
+            kwh_tariff=0.6402,
+            distribution_tariff=27.78,
+            delivery_tariff=17.10,
+            power_size=5.5,
+            kva_tariff=79.0,
+        )
+
+        # 600 kWh * 0.6402 = 384.12, 44.88 * 12 / 365 * 60 = 88.53 and 5.5 * 79 / 365 * 60 = 71.42
+        self.assertAlmostEqual(projection.energy_cost, 384.12)
+        self.assertAlmostEqual(projection.fixed_cost, 88.53, places=2)
+        self.assertAlmostEqual(projection.capacity_cost, 71.42, places=2)
+        self.assertEqual(projection.projected_amount, 544.08)
+
+    def test_cycle_never_shorter_than_elapsed(self):
+        info = FutureConsumptionInfo(
+            last_invoice_date="2024-01-01", current_date=date(2024, 3, 11), future_consumption=70
+        )
+
+        projection = project_bill(info, kwh_tariff=1.0, distribution_tariff=0, delivery_tariff=0)
+
+        self.assertEqual(projection.cycle_days, 70)
+        self.assertAlmostEqual(projection.projected_consumption, 70.0)
+
+
+class GetBillProjectionTest(unittest.IsolatedAsyncioTestCase):
+    async def test_static_inputs_are_cached_between_polls(self):
+        client = make_client(self)
+        client._bp_number = "bp"
+        client._contract_id = "contract"
+
+        reading = RemoteReadingResponse(
+            report_status=0,
+            meter_list=[
+                MeterReadingData(
+                    future_consumption_info=FutureConsumptionInfo(
+                        last_invoice_date="2024-01-01", current_date=date(2024, 1, 11), future_consumption=10
+                    )
+                )
+            ],
+        )
+
+        counter_device = CounterDevice("1", "001", "1", "01", "", ConnectionSize(25, 1, "1X25"))
+        devices = Devices(mr_type="01", counter_devices=[counter_device])
+
+        with (
+            patch("iec_api.data.get_devices", AsyncMock(return_value=[Device(True, 3, "1", "2")])) as get_devices,
+            patch("iec_api.data.get_device_by_device_id", AsyncMock(return_value=devices)),
+            patch("iec_api.data.get_billing_invoices", AsyncMock(return_value=None)) as get_invoices,
+            patch("iec_api.data.get_remote_reading", AsyncMock(return_value=reading)) as get_reading,
+            patch("iec_api.static_data.get_kwh_tariff", AsyncMock(return_value=1.0)),
+            patch("iec_api.static_data.get_distribution_tariff", AsyncMock(return_value=0.0)),
+            patch("iec_api.static_data.get_delivery_tariff", AsyncMock(return_value=0.0)),
+            patch("iec_api.static_data.get_kva_tariff", AsyncMock(return_value=0.0)),
+            patch("iec_api.static_data.get_power_size", AsyncMock(return_value=0.0)) as get_power_size,
+        ):
+            first = await client.get_bill_projection()
+            await client.get_bill_projection()
+
+        self.assertAlmostEqual(first.projected_consumption, 60.0)
+        self.assertEqual(get_devices.await_count, 1)
+        self.assertEqual(get_invoices.await_count, 1)
+        self.assertEqual(get_reading.await_count, 2)
+        # The KVA tariff includes VAT, so the power size is fetched without it
+        get_power_size.assert_awaited_with(client._session, "1X25", False)
+
+
+if __name__ == "__main__":
+    unittest.main()
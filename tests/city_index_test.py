@@ -0,0 +1,55 @@
+import unittest
+import uuid
+
+from iec_api.city_index import CityIndex, normalize_name
+from iec_api.masa_api_models.cities import City
+
+
+def _city(name: str, code: str) -> City:
+    return City.from_dict(
+        {
+            "area": {"name": "a", "shovalAreaCode": 1, "id": str(uuid.uuid4()), "logicalName": "iec_area"},
+            "region": {"name": "r", "shovalRegionCode": 1, "id": str(uuid.uuid4()), "logicalName": "iec_region"},
+            "name": name,
+            "shovalCityCode": code,
+            "id": str(uuid.uuid4()),
+            "logicalName": "iec_city",
+        }
+    )
+
+
+class CityIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.cities = [
+            _city("תל אביב - יפו", "5000"),
+            _city("ראש העין", "2640"),
+            _city("תל מונד", "154"),
+            _city("קרית טבעון", "2300"),
+            _city("טבריה", "6700"),
+        ]
+        self.index = CityIndex(self.cities)
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("תֵּל־אָבִיב"), "תל אביב")
+        self.assertEqual(normalize_name("ראש העין"), normalize_name("ראש העינ"))
+        self.assertEqual(normalize_name("  Kiryat   Tivon "), "kiryat tivon")
+
+    def test_exact_lookups(self):
+        self.assertIs(self.index.by_id(str(self.cities[1].id)), self.cities[1])
+        self.assertIs(self.index.by_shoval_code(154), self.cities[2])
+        self.assertIs(self.index.by_name("ראש העין"), self.cities[1])
+        self.assertIsNone(self.index.by_shoval_code("1"))
+        self.assertIsNone(self.index.by_id(str(uuid.uuid4())))
+        self.assertIsNone(self.index.by_id("not-a-uuid"))
+
+    def test_prefix_search(self):
+        self.assertEqual(self.index.search("תל"), [self.cities[0], self.cities[2]])
+        self.assertEqual(self.index.search("תֵּל מ"), [self.cities[2]])
+        self.assertEqual(self.index.search("העי"), [self.cities[1]])
+        self.assertEqual(self.index.search("טב"), [self.cities[4], self.cities[3]])  # Name prefix before word prefix
+        self.assertEqual(self.index.search("ת", limit=1), [self.cities[0]])
+        self.assertEqual(self.index.search(" "), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
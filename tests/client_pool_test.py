@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from iec_api import commons
+from iec_api.client_pool import ClientPool
+from iec_api.iec_client import IecClient
+
+
+class ClientPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def test_clients_share_session_and_trace_config(self):
+        session = MagicMock(closed=False, trace_configs=[])
+        pool = ClientPool(session=session)
+
+        first = pool.get_client(100000009)
+        second = pool.get_client("100000017")
+
+        self.assertIs(first._session, second._session)
+        self.assertEqual(session.trace_configs, [commons.get_debug_trace_config()])
+        self.assertIs(pool.get_client("100000009"), first)
+        self.assertEqual((pool.metrics.created, pool.metrics.hits), (2, 1))
+
+        async with first:
+            pass
+        session.close.assert_not_called()
+
+    async def test_lru_eviction(self):
+        evicted: list[IecClient] = []
+        pool = ClientPool(max_clients=2, session=MagicMock(trace_configs=[]), on_evict=evicted.append)
+
+        first = pool.get_client(100000009)
+        pool.get_client(100000017)
+        pool.get_client(100000009)
+        pool.get_client(100000025)
+
+        self.assertEqual([client._user_id for client in evicted], ["100000017"])
+        self.assertIn(100000009, pool)
+        self.assertIs(pool.get_client(100000009), first)
+        self.assertEqual(pool.metrics.evictions, 1)
+
+    async def test_idle_eviction(self):
+        pool = ClientPool(idle_timeout=60, session=MagicMock(trace_configs=[]))
+
+        with patch("iec_api.client_pool.time.monotonic", return_value=0):
+            pool.get_client(100000009)
+        with patch("iec_api.client_pool.time.monotonic", return_value=30):
+            pool.get_client(100000017)
+        with patch("iec_api.client_pool.time.monotonic", return_value=70):
+            self.assertEqual(pool.evict_idle(), 1)
+
+        self.assertNotIn(100000009, pool)
+        self.assertNotIn(None, pool)
+        self.assertEqual(len(pool), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
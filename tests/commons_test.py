@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import unittest
 
 import iec_api.commons
@@ -17,5 +19,37 @@ class CommonsTest(unittest.TestCase):
         self.assertFalse(iec_api.commons.is_valid_israeli_id(user_id), "Israeli ID should be invalid")
 
 
+class BlockingExecutorTest(unittest.IsolatedAsyncioTestCase):
+    async def test_queue_metrics(self):
+        executor = iec_api.commons.BlockingExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+
+        calls = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        metrics = executor.metrics
+        release.set()
+        await asyncio.gather(*calls)
+
+        self.assertEqual((metrics.running, metrics.pending), (1, 2))
+        self.assertGreaterEqual(metrics.max_pending, 2)
+        self.assertEqual((executor.metrics.pending, executor.metrics.completed), (0, 3))
+
+    async def test_cancelled_call_leaves_queue(self):
+        executor = iec_api.commons.BlockingExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await running
+
+        self.assertEqual(executor.metrics.pending, 0)
+
+
 if __name__ == "__main__":
     unittest.main()
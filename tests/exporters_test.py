@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from iec_api import exporters
+from iec_api.exporters import (
+    INVOICE_COLUMNS,
+    METER_READING_COLUMNS,
+    READING_COLUMNS,
+    ExportFormat,
+    export_rows,
+    export_rows_async,
+    invoice_rows,
+    meter_reading_rows,
+    reading_rows,
+)
+from iec_api.models.invoice import Invoice
+from iec_api.models.meter_reading import LastMeter, MeterReading, MeterReadings
+from iec_api.models.remote_reading import MeterReadingData, PeriodConsumption, RemoteReadingResponse
+
+START = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def _responses() -> list[RemoteReadingResponse]:
+    consumptions = [PeriodConsumption(interval=START.replace(minute=15 * i), consumption=0.5 * i) for i in range(3)]
+    return [
+        RemoteReadingResponse(
+            report_status=0,
+            contract_number="123",
+            meter_list=[MeterReadingData(meter_serial="456", meter_code="789", period_consumptions=consumptions)],
+        )
+    ]
+
+
+class ExportersTest(unittest.IsolatedAsyncioTestCase):
+    def test_rows_follow_columns(self):
+        invoice = Invoice(
+            amount_origin=10, amount_to_pay=0, amount_paid=10, invoice_id=1, contract_number=123, order_number=2,
+            invoice_payment_status=1, document_id="d", days_period="60", has_direct_debit=False, invoice_type=0,
+        )  # fmt: skip
+        readings = MeterReadings(
+            contract_account="123",
+            last_meters=[LastMeter([MeterReading(reading=7, reading_date=START)], "456", "m", "r")],
+        )
+
+        (invoice_row,) = invoice_rows([invoice])
+        (meter_row,) = meter_reading_rows([readings])
+        self.assertEqual(dict(zip(INVOICE_COLUMNS, invoice_row))["document_id"], "d")
+        self.assertEqual(dict(zip(METER_READING_COLUMNS, meter_row))["reading"], 7)
+        self.assertEqual(len(list(reading_rows(_responses()))), 3)
+
+    def test_ndjson_with_and_without_orjson(self):
+        outputs = []
+        for has_orjson in (exporters._HAS_ORJSON, False):
+            with self.subTest(orjson=has_orjson), patch.object(exporters, "_HAS_ORJSON", has_orjson):
+                out = io.BytesIO()
+                self.assertEqual(export_rows(reading_rows(_responses()), READING_COLUMNS, out.write), 3)
+                outputs.append(out.getvalue())
+
+        records = [json.loads(line) for line in outputs[-1].splitlines()]
+        self.assertEqual(records[1]["interval"], "2024-05-01T00:15:00+00:00")
+        self.assertEqual(records[2]["consumption"], 1.0)
+        self.assertEqual([json.loads(line) for line in outputs[0].splitlines()], records)
+
+    def test_csv(self):
+        out = io.BytesIO()
+        export_rows(reading_rows(_responses()), READING_COLUMNS, out.write, ExportFormat.CSV)
+
+        rows = list(csv.DictReader(io.StringIO(out.getvalue().decode())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["interval"], "2024-05-01T00:00:00+00:00")
+        self.assertEqual(rows[0]["meter_kind"], "")
+
+    async def test_async_buffered(self):
+        async def rows():
+            for row in reading_rows(_responses()):
+                yield row
+
+        writes: list[bytes] = []
+
+        async def write(chunk: bytes):
+            writes.append(chunk)
+
+        count = await export_rows_async(rows(), READING_COLUMNS, write, ExportFormat.CSV)
+        self.assertEqual((count, len(writes)), (3, 1))
+
+        writes.clear()
+        await export_rows_async(reading_rows(_responses()), READING_COLUMNS, write, ExportFormat.CSV, buffer_size=None)
+        self.assertEqual(len(writes), 3)  # Header buffered with the first row
+        self.assertTrue(writes[0].startswith(b"contract_number,"))
+
+
+if __name__ == "__main__":
+    unittest.main()
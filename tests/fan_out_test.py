@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from iec_api.commons import fan_out
+from iec_api.models.exceptions import IECError
+from tests.helpers import make_client
+
+
+class FanOutTest(unittest.IsolatedAsyncioTestCase):
+    async def test_bounded_concurrency_and_error_capture(self):
+        running = 0
+        max_running = 0
+
+        async def func(key: int) -> int:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if key == 3:
+                raise ValueError("bad key")
+            return key * 2
+
+        results = {result.key: result async for result in fan_out(range(6), func, max_concurrency=2)}
+
+        self.assertEqual(max_running, 2)
+        self.assertEqual(results[2].result, 4)
+        self.assertIsInstance(results[3].error, ValueError)
+        self.assertIsNone(results[3].result)
+
+    async def test_timeout_and_completion_order(self):
+        async def func(key: float) -> float:
+            await asyncio.sleep(key)
+            return key
+
+        results = [result async for result in fan_out([1.0, 0.01, 0.02], func, max_concurrency=3, timeout=0.5)]
+
+        self.assertEqual([result.key for result in results], [0.01, 0.02, 1.0])
+        self.assertIsInstance(results[-1].error, IECError)
+
+    async def test_early_exit_cancels_pending_calls(self):
+        cancelled: list[float] = []
+
+        async def func(key: float) -> float:
+            try:
+                await asyncio.sleep(key)
+            except asyncio.CancelledError:
+                cancelled.append(key)
+                raise
+            return key
+
+        results = fan_out([0.01, 10.0, 20.0], func, max_concurrency=3)
+        async for result in results:
+            self.assertEqual(result.key, 0.01)
+            break
+        await results.aclose()
+
+        # The pending calls are done once the fan out is closed, not just scheduled for cancellation
+        self.assertEqual(sorted(cancelled), [10.0, 20.0])
+
+
+class AllContractsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_devices_for_all_contracts(self):
+        client = make_client(self)
+        contracts = [MagicMock(contract_id="c1"), MagicMock(contract_id="c2")]
+
+        async def get_devices(contract_id):
+            if contract_id == "c2":
+                raise IECError(500, "boom")
+            return ["device"]
+
+        with (
+            patch.object(client, "get_contracts", AsyncMock(return_value=contracts)),
+            patch.object(client, "get_devices", side_effect=get_devices),
+        ):
+            results = await client.get_devices_for_all_contracts()
+
+        self.assertEqual(results["c1"].result, ["device"])
+        self.assertIsInstance(results["c2"].error, IECError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+from typing import Any, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from iec_api.iec_client import IecClient
+
+
+def make_client(test_case: unittest.TestCase, session: Optional[MagicMock] = None, **methods: Any) -> IecClient:
+    """
+    Create a client with a mocked session and a valid token, for the duration of a test.
+    Args:
+        test_case (unittest.TestCase): The test, stopping the patches on cleanup.
+        session (MagicMock): The mocked session. Default is a new one.
+        **methods: Client methods to patch, by name, e.g. get_devices=AsyncMock(return_value=[]).
+    Returns:
+        IecClient: The client.
+    """
+    client = IecClient(123456782, session=session or MagicMock())
+    for name, mock in {"check_token": AsyncMock(return_value=True), **methods}.items():
+        patcher = patch.object(client, name, mock)
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+    return client
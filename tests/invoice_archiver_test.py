@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from iec_api.commons import FanOutResult
+from iec_api.invoice_archiver import InvoiceArchiver
+from iec_api.models.exceptions import IECError
+from tests.helpers import make_client
+
+
+class InvoiceArchiverTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.downloads: list[str] = []
+        self.failures = {"d2": 1}  # Fails once with a retryable error
+
+        invoices = MagicMock(invoices=[MagicMock(document_id="d1"), MagicMock(document_id="d2")])
+        listings = {"c1": FanOutResult("c1", result=invoices), "c2": FanOutResult("c2", error=IECError(500, "x"))}
+        self.client = make_client(
+            self,
+            get_billing_invoices_for_all_contracts=AsyncMock(return_value=listings),
+            stream_invoice_pdf=self.stream_invoice_pdf,
+        )
+
+    async def stream_invoice_pdf(self, write, invoice_number, bp_number, contract_id) -> int:
+        if self.failures.get(invoice_number):
+            self.failures[invoice_number] -= 1
+            raise IECError(-1, "timeout")
+        self.downloads.append(invoice_number)
+        await write(b"%PDF-" + invoice_number.encode())
+        return 7
+
+    @patch("iec_api.invoice_archiver.RETRY_DELAY", 0)
+    async def test_incremental_archive(self):
+        archiver = InvoiceArchiver(self.client, self.directory.name)
+
+        first = await archiver.archive()
+        second = await InvoiceArchiver(self.client, self.directory.name, verify_hash=True).archive()
+
+        self.assertEqual(sorted(invoice.invoice_number for invoice in first.downloaded), ["d1", "d2"])
+        self.assertEqual(list(first.errors), ["c2"])
+        self.assertEqual((second.downloaded, second.skipped), ([], 2))
+        self.assertEqual(sorted(self.downloads), ["d1", "d2"])
+        with open(os.path.join(self.directory.name, "c1", "d2.pdf"), "rb") as f:
+            self.assertEqual(f.read(), b"%PDF-d2")
+
+    async def test_resume_adopts_files_missing_from_manifest(self):
+        os.makedirs(os.path.join(self.directory.name, "c1"))
+        with open(os.path.join(self.directory.name, "c1", "d1.pdf"), "wb") as f:
+            f.write(b"%PDF-d1")
+        self.failures = {}
+
+        result = await InvoiceArchiver(self.client, self.directory.name).archive()
+
+        self.assertEqual(result.skipped, 1)
+        self.assertEqual(self.downloads, ["d2"])
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, "manifest.json")))
+
+    async def test_resume_downloads_empty_and_invalid_files_again(self):
+        os.makedirs(os.path.join(self.directory.name, "c1"))
+        for invoice_number, content in (("d1", b""), ("d2", b"<html>")):
+            with open(os.path.join(self.directory.name, "c1", f"{invoice_number}.pdf"), "wb") as f:
+                f.write(content)
+        self.failures = {}
+
+        result = await InvoiceArchiver(self.client, self.directory.name).archive()
+        again = await InvoiceArchiver(self.client, self.directory.name).archive()
+
+        self.assertEqual((result.skipped, sorted(self.downloads)), (0, ["d1", "d2"]))
+        self.assertEqual((again.skipped, again.downloaded), (2, []))
+        with open(os.path.join(self.directory.name, "c1", "d1.pdf"), "rb") as f:
+            self.assertEqual(f.read(), b"%PDF-d1")
+
+
+if __name__ == "__main__":
+    unittest.main()
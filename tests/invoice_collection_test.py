@@ -0,0 +1,60 @@
+import unittest
+from datetime import date, datetime
+
+from iec_api.const import TIMEZONE
+from iec_api.invoice_collection import InvoiceCollection
+from iec_api.models.invoice import Invoice
+
+
+def _invoice(to_date: date | None, paid: float, to_pay: float, status: int = 1, contract: int = 1) -> Invoice:
+    return Invoice(
+        amount_origin=paid + to_pay,
+        amount_to_pay=to_pay,
+        amount_paid=paid,
+        invoice_id=1,
+        contract_number=contract,
+        order_number=0,
+        invoice_payment_status=status,
+        document_id="1",
+        days_period="60",
+        has_direct_debit=False,
+        invoice_type=0,
+        to_date=TIMEZONE.localize(datetime(to_date.year, to_date.month, to_date.day)) if to_date else None,
+    )
+
+
+class InvoiceCollectionTest(unittest.TestCase):
+    def setUp(self):
+        self.invoices = [
+            _invoice(date(2024, 3, 1), 100, 0),
+            _invoice(date(2023, 11, 1), 90, 0, contract=2),
+            _invoice(None, 0, 10, status=2),
+            _invoice(date(2024, 5, 1), 0, 120, status=2),
+            _invoice(date(2024, 1, 1), 80, 0),
+        ]
+        self.collection = InvoiceCollection(self.invoices)
+
+    def test_range_queries(self):
+        self.assertEqual(
+            self.collection.between(date(2024, 1, 1), date(2024, 3, 1)), self.invoices[4:5] + self.invoices[0:1]
+        )
+        self.assertEqual(self.collection.between(from_date=date(2024, 4, 1)), [self.invoices[3]])
+        self.assertEqual(len(self.collection.between()), 4)
+        self.assertIs(self.collection.latest, self.invoices[3])
+
+    def test_indexes_and_aggregates(self):
+        self.assertEqual(self.collection.by_status(2), [self.invoices[2], self.invoices[3]])
+        self.assertEqual(self.collection.by_contract("2"), [self.invoices[1]])
+        self.assertEqual(self.collection.open_invoices, [self.invoices[2], self.invoices[3]])
+        self.assertEqual(self.collection.total_paid, 270)
+        self.assertEqual(self.collection.outstanding, 130)
+        self.assertEqual(self.collection.totals_by_year, {2023: 90, 2024: 300})
+
+    def test_empty(self):
+        collection = InvoiceCollection.from_response(None)
+        self.assertIsNone(collection.latest)
+        self.assertEqual(collection.between(date(2024, 1, 1)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
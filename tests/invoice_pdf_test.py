@@ -0,0 +1,81 @@
+import gzip
+import os
+import tempfile
+import unittest
+from typing import Optional
+from unittest.mock import AsyncMock, MagicMock
+
+from iec_api.commons import BlockingExecutor
+from iec_api.models.exceptions import IECError
+from tests.helpers import make_client
+
+
+def _pdf_response(chunks: list[bytes], content_length: int, headers: Optional[dict] = None) -> MagicMock:
+    async def iter_chunked(chunk_size):
+        for chunk in chunks:
+            yield chunk
+
+    response = MagicMock(status=200, content_length=content_length, headers=headers or {})
+    response.content.iter_chunked = iter_chunked
+    return response
+
+
+class SaveInvoicePdfTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.session = MagicMock()
+        self.client = make_client(self, self.session)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "invoice.pdf")
+
+    async def test_streams_to_file(self):
+        response = _pdf_response([b"%PDF", b"-1.4"], 8)
+        self.session.post = AsyncMock(return_value=response)
+
+        size = await self.client.save_invoice_pdf_to_file(self.path, "1", bp_number="bp", contract_id="c")
+
+        self.assertEqual(size, 8)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"%PDF-1.4")
+        self.assertEqual(os.listdir(self.directory.name), ["invoice.pdf"])
+        response.release.assert_called_once()
+
+    async def test_file_operations_run_on_executor(self):
+        executor = BlockingExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        self.client._executor = executor
+        self.session.post = AsyncMock(return_value=_pdf_response([b"%PDF", b"-1.4"], 8))
+
+        await self.client.save_invoice_pdf_to_file(self.path, "1", bp_number="bp", contract_id="c")
+
+        # Open, two writes, close, replace and the cleanup of the temporary file
+        self.assertEqual(executor.metrics.completed, 6)
+
+    async def test_gzip_encoded_download(self):
+        content = b"%PDF-1.4" * 100
+        response = _pdf_response(
+            [content[:400], content[400:]], len(gzip.compress(content)), {"Content-Encoding": "gzip"}
+        )
+        self.session.post = AsyncMock(return_value=response)
+
+        size = await self.client.save_invoice_pdf_to_file(self.path, "1", bp_number="bp", contract_id="c")
+
+        self.assertEqual(size, len(content))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), content)
+
+    async def test_incomplete_download_keeps_existing_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"old")
+        self.session.post = AsyncMock(return_value=_pdf_response([b"%PDF"], 8))
+
+        with self.assertRaises(IECError):
+            await self.client.save_invoice_pdf_to_file(self.path, "1", bp_number="bp", contract_id="c")
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"old")
+        self.assertEqual(os.listdir(self.directory.name), ["invoice.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
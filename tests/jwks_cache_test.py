@@ -0,0 +1,115 @@
+import asyncio
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from jwt.exceptions import PyJWKClientError
+
+from iec_api import login
+from iec_api.jwks_cache import JwksCache
+from iec_api.models.jwt import JWT
+
+
+def _jwks_response(keys: dict) -> MagicMock:
+    jwks = {"keys": [{**RSAAlgorithm.to_jwk(key.public_key(), as_dict=True), "kid": kid} for kid, key in keys.items()]}
+    return MagicMock(status=200, json=AsyncMock(return_value=jwks))
+
+
+class JwksCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.session = MagicMock()
+        self.session.get = AsyncMock(return_value=_jwks_response({"k1": self.private_key}))
+
+    async def test_keys_fetched_once_for_concurrent_calls(self):
+        cache = JwksCache("https://jwks")
+
+        keys = await asyncio.gather(*(cache.get_signing_key(self.session, "k1") for _ in range(3)))
+
+        self.assertEqual(self.session.get.await_count, 1)
+        self.assertIs(keys[0], keys[2])
+
+    async def test_unknown_kid_refresh_is_throttled(self):
+        cache = JwksCache("https://jwks", min_refresh_interval=60)
+        await cache.refresh(self.session)
+
+        with self.assertRaises(PyJWKClientError):
+            await cache.get_signing_key(self.session, "k2")
+        self.assertEqual(self.session.get.await_count, 1)
+
+        self.session.get.return_value = _jwks_response({"k2": self.private_key})
+        with patch("iec_api.jwks_cache.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertIsNotNone(await cache.get_signing_key(self.session, "k2"))
+        self.assertEqual(self.session.get.await_count, 2)
+
+    async def test_verify_token(self):
+        id_token = jwt.encode(
+            {"aud": login.APP_CLIENT_ID, "sub": "user"}, self.private_key, algorithm="RS256", headers={"kid": "k1"}
+        )
+        token = JWT(access_token="", refresh_token="", token_type="", expires_in=0, scope="", id_token=id_token)
+
+        with patch.object(login, "_jwks_cache", JwksCache("https://jwks")):
+            claims = await login.verify_token(self.session, token)
+            self.assertEqual(login.decode_token(token)["sub"], "user")  # Served from the cache
+
+        self.assertEqual(claims["sub"], "user")
+        self.assertEqual(self.session.get.await_count, 1)
+
+
+class VerifyTokensTest(unittest.IsolatedAsyncioTestCase):
+    async def test_batch_verification(self):
+        keys = {"k1": rsa.generate_private_key(65537, 2048), "k2": rsa.generate_private_key(65537, 2048)}
+        session = MagicMock()
+        session.get = AsyncMock(return_value=_jwks_response(keys))
+
+        def token(kid: str, sub: str, aud: str = login.APP_CLIENT_ID) -> JWT:
+            id_token = jwt.encode({"aud": aud, "sub": sub}, keys[kid], algorithm="RS256", headers={"kid": kid})
+            return JWT(access_token="", refresh_token="", token_type="", expires_in=0, scope="", id_token=id_token)
+
+        tokens = {
+            "a": token("k1", "a"),
+            "b": token("k2", "b"),
+            "c": token("k1", "c", aud="other"),
+            "d": token("k1", "d"),
+        }
+        tokens["e"] = JWT(access_token="", refresh_token="", token_type="", expires_in=0, scope="", id_token="bad")
+
+        for executor in (None, ProcessPoolExecutor(max_workers=2)):
+            with self.subTest(executor=executor), patch.object(login, "_jwks_cache", JwksCache("https://jwks")):
+                results = await login.verify_tokens(session, tokens, executor=executor, chunk_size=1)
+                if executor:
+                    executor.shutdown()
+
+                self.assertEqual(list(results), list(tokens))
+                claims = [results[key].result for key in "abd"]
+                self.assertEqual([claim["sub"] for claim in claims if claim is not None], ["a", "b", "d"])
+                self.assertIsInstance(results["c"].error, jwt.InvalidAudienceError)
+                self.assertIsInstance(results["e"].error, jwt.DecodeError)
+        self.assertEqual(session.get.await_count, 2)  # Once per cache
+
+    async def test_broken_process_pool(self):
+        key = rsa.generate_private_key(65537, 2048)
+        session = MagicMock()
+        session.get = AsyncMock(return_value=_jwks_response({"k1": key}))
+        id_token = jwt.encode({"aud": login.APP_CLIENT_ID, "sub": "a"}, key, algorithm="RS256", headers={"kid": "k1"})
+        tokens = {
+            user: JWT(access_token="", refresh_token="", token_type="", expires_in=0, scope="", id_token=id_token)
+            for user in "ab"
+        }
+        executor = MagicMock(spec=ProcessPoolExecutor)
+        executor.submit.side_effect = BrokenProcessPool("A worker died")
+
+        with patch.object(login, "_jwks_cache", JwksCache("https://jwks")):
+            results = await login.verify_tokens(session, tokens, executor=executor, chunk_size=1)
+
+        for result in results.values():
+            self.assertIsInstance(result.error, BrokenProcessPool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from iec_api.lookup_cache import LookupCache
+
+
+class LookupCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_single_flight(self):
+        cache = LookupCache()
+
+        async def slow_fetch():
+            await asyncio.sleep(0.01)
+            return {"a": 1}
+
+        fetch = AsyncMock(side_effect=slow_fetch)
+
+        values = await asyncio.gather(*(cache.get("lookup", fetch, lambda raw: raw["a"]) for _ in range(5)))
+
+        self.assertEqual(values, [1] * 5)
+        self.assertEqual(fetch.await_count, 1)
+        self.assertIn("lookup", cache)
+
+    async def test_ttl(self):
+        cache = LookupCache(ttl=60)
+        fetch = AsyncMock(return_value=1)
+
+        with patch("iec_api.lookup_cache.time.time", return_value=1000):
+            await cache.get("lookup", fetch, int)
+        with patch("iec_api.lookup_cache.time.time", return_value=1059):
+            await cache.get("lookup", fetch, int)
+        with patch("iec_api.lookup_cache.time.time", return_value=1060):
+            await cache.get("lookup", fetch, int)
+
+        self.assertEqual(fetch.await_count, 2)
+
+    async def test_disk_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fetch = AsyncMock(return_value={"name": "תל אביב"})
+
+            await LookupCache(directory=directory).get("cities", fetch, dict)
+            restarted = LookupCache(directory=directory)
+            value = await restarted.get("cities", fetch, dict)
+
+            self.assertEqual(value, {"name": "תל אביב"})
+            self.assertEqual(fetch.await_count, 1)
+
+            await restarted.invalidate("cities")
+            self.assertNotIn("cities", restarted)
+            self.assertEqual(os.listdir(directory), [])
+            await restarted.get("cities", fetch, dict)
+            self.assertEqual(fetch.await_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from iec_api import masa_data
+from iec_api.lookup_cache import LookupCache
+from iec_api.lookup_index import LookupIndex
+from iec_api.masa_api_models.lookup import GetLookupResponse
+from iec_api.models.jwt import JWT
+
+
+def _lookup_dict() -> dict:
+    def size(name: str, size_type: int) -> dict:
+        return {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "sizeType": size_type,
+            "voltType": 1,
+            "code": name,
+            "description": name,
+            "index": size_type,
+            "isEnlargeable": True,
+            "isAllowResidence": None,
+        }
+
+    return {
+        "regions": [{"regionId": str(uuid.uuid4()), "name": "חיפה והצפון", "code": 7}],
+        "connectionSizeTypes": [size("1X40", 1), size("3X25", 2), size("3X25 duplicate", 2)],
+        "siteTypes": [{"key": 1, "value": "מגורים", "index": 1}],
+        "orderStatusState": [{"key": 2, "value": "פתוחה", "index": 1}],
+        "actionCodes": [{"key": 3, "value": "חיבור", "index": 1}],
+        "phonePrefixes": [{"key": 4, "value": "050", "index": 1}],
+        "orderPurposes": [{"desc": "d", "buildingType": None, "id": str(uuid.uuid4()), "name": "n"}],
+        "meterSetupTypes": [{"id": str(uuid.uuid4()), "name": "n", "desc": "d", "code": "c"}],
+        "stateMachineForOrderStage": None,
+    }
+
+
+class LookupIndexTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.lookup = GetLookupResponse.from_dict(_lookup_dict())
+        self.index = LookupIndex(self.lookup)
+
+    def test_lookups(self):
+        region = self.lookup.regions[0]
+        self.assertIs(self.index.region(str(region.region_id)), region)
+        self.assertIs(self.index.region_by_code(7), region)
+        self.assertIs(
+            self.index.connection_size_type(self.lookup.connection_size_types[1].id),
+            self.lookup.connection_size_types[1],
+        )
+        self.assertEqual(self.index.connection_size_name(2), "3X25 duplicate")  # Last of a duplicate size type wins
+        self.assertIsNone(self.index.connection_size_name(9))
+        site_type = self.index.site_type(1)
+        order_status_state = self.index.order_status_state(2)
+        action_code = self.index.action_code(3)
+        phone_prefix = self.index.phone_prefix(4)
+        assert site_type is not None and order_status_state is not None
+        assert action_code is not None and phone_prefix is not None
+        self.assertEqual(site_type.value, "מגורים")
+        self.assertEqual(order_status_state.value, "פתוחה")
+        self.assertEqual(action_code.value, "חיבור")
+        self.assertEqual(phone_prefix.value, "050")
+        self.assertIs(self.index.order_purpose(self.lookup.order_purposes[0].id), self.lookup.order_purposes[0])
+        self.assertIs(
+            self.index.meter_setup_type(str(self.lookup.meter_setup_types[0].id)), self.lookup.meter_setup_types[0]
+        )
+
+    async def test_index_shared_per_lookup_load(self):
+        token = JWT(access_token="", refresh_token="", token_type="", expires_in=0, scope="", id_token="t")
+        cache = LookupCache()
+        with (
+            patch.object(masa_data, "lookup_cache", cache),
+            patch.object(masa_data, "lookup_index", None),
+            patch("iec_api.commons.send_get_request", AsyncMock(return_value=_lookup_dict())) as send,
+        ):
+            first = await masa_data.get_masa_lookup_index(MagicMock(), token)
+            self.assertIs(await masa_data.get_masa_lookup_index(MagicMock(), token), first)
+
+            await cache.invalidate("masa_lookup")
+            self.assertIsNot(await masa_data.get_masa_lookup_index(MagicMock(), token), first)
+            self.assertEqual(send.await_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from iec_api import masa_data
+from iec_api.models.exceptions import IECError
+from tests.helpers import make_client
+
+
+class MasaContextTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = make_client(self)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def call(self, result):
+        async def side_effect(*args):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return side_effect
+
+    def patch_calls(self, **results) -> dict[str, AsyncMock]:
+        defaults = {
+            "get_masa_user_profile": SimpleNamespace(accounts=[SimpleNamespace(id="profile-account")]),
+            "get_masa_contact_account_user_profile": "contact",
+            "get_masa_lookup_index": "index",
+            "get_masa_volt_levels": ["volt"],
+            "get_masa_equipments": "equipment",
+            "get_masa_order_titles": "titles",
+        }
+        defaults.update(results)
+        mocks = {name: AsyncMock(side_effect=self.call(result)) for name, result in defaults.items()}
+        for name, mock in mocks.items():
+            patcher = patch.object(masa_data, name, mock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return mocks
+
+    async def test_all_calls_concurrent(self):
+        mocks = self.patch_calls()
+        context = await self.client.get_masa_context("account")
+
+        self.assertTrue(context.is_complete)
+        self.assertEqual(self.max_in_flight, 6)
+        self.assertEqual(context.account_id, "account")
+        self.assertEqual((context.equipment, context.order_titles), ("equipment", "titles"))
+        self.assertEqual(context.volt_levels, ["volt"])
+        mocks["get_masa_equipments"].assert_awaited_once_with(self.client._session, self.client._token, "account")
+
+    async def test_account_id_from_user_profile(self):
+        self.patch_calls()
+        context = await self.client.get_masa_context()
+
+        self.assertEqual(context.account_id, "profile-account")
+        self.assertIsNone(self.client._account_id)  # Not a side effect of getting the context
+        self.assertEqual(context.order_titles, "titles")
+
+    async def test_failed_calls_reported(self):
+        mocks = self.patch_calls(
+            get_masa_user_profile=IECError(500, "down"), get_masa_volt_levels=IECError(500, "down")
+        )
+        context = await self.client.get_masa_context()
+
+        self.assertEqual(set(context.errors), {"user_profile", "volt_levels", "account_id"})
+        self.assertIsNone(context.equipment)
+        self.assertEqual(context.contact_account_user_profile, "contact")
+        mocks["get_masa_equipments"].assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import gc
+import unittest
+from unittest.mock import MagicMock, patch
+
+from iec_api import masa_data
+from iec_api.models.exceptions import IECError
+
+
+class IterMasaEquipmentsTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.requested_pages: list[int] = []
+
+    async def get_page(self, session, token, account_id, page_number, page_size):
+        self.requested_pages.append(page_number)
+        first = (page_number - 1) * page_size
+        items = list(range(first, min(first + page_size, 7)))
+        return MagicMock(items=items, more_records=first + page_size < 7, total_records=7)
+
+    async def test_follows_pages(self):
+        for prefetch in (0, 2, 10):
+            self.requested_pages = []
+            with self.subTest(prefetch=prefetch), patch.object(masa_data, "get_masa_equipments", self.get_page):
+                items = [
+                    item async for item in masa_data.iter_masa_equipments(MagicMock(), MagicMock(), "a", 3, prefetch)
+                ]
+
+                self.assertEqual(items, list(range(7)))
+                self.assertEqual(sorted(self.requested_pages), [1, 2, 3])
+
+    async def test_early_exit_cancels_prefetch(self):
+        cancelled_pages: list[int] = []
+        errors: list[dict] = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+
+        async def get_page(session, token, account_id, page_number, page_size):
+            if page_number == 3:
+                self.requested_pages.append(page_number)
+                raise IECError(500, "Not needed anyway")
+            try:
+                if page_number > 3:
+                    await asyncio.sleep(10)
+                return await self.get_page(session, token, account_id, page_number, page_size)
+            except asyncio.CancelledError:
+                cancelled_pages.append(page_number)
+                raise
+
+        with patch.object(masa_data, "get_masa_equipments", get_page):
+            equipments = masa_data.iter_masa_equipments(MagicMock(), MagicMock(), "a", 1, prefetch=3)
+            async for item in equipments:
+                if item == 1:
+                    break
+            await equipments.aclose()
+
+        gc.collect()
+        # Pages 2-4 were prefetched while consuming page 2, nothing was fetched after the break
+        self.assertEqual(sorted(self.requested_pages), [1, 2, 3])  # Page 4 is still pending
+        self.assertEqual(cancelled_pages, [4])
+        self.assertEqual(errors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from iec_api import data, fault_portal_data
+from iec_api.compact_outage import CompactOutage, OutageSource, merge_outages
+from iec_api.models.exceptions import IECError
+from tests.helpers import make_client
+from tests.outage_fixtures import fault_portal_outage, iec_outage
+
+
+class MergeOutagesTest(unittest.TestCase):
+    def test_dedupe_and_fill(self):
+        first = [CompactOutage("a", OutageSource.FAULT_PORTAL, treatment_state_code="1")]
+        second = [
+            CompactOutage("a", OutageSource.IEC_API, treatment_state_code="2", city="טירה"),
+            CompactOutage("b", OutageSource.IEC_API),
+        ]
+
+        merged = merge_outages(first, second)
+
+        self.assertEqual([o.disconnect_key for o in merged], ["a", "b"])
+        self.assertEqual((merged[0].source, merged[0].treatment_state_code), (OutageSource.FAULT_PORTAL, "1"))
+        self.assertEqual(merged[0].city, "טירה")
+
+
+class MergedOutagesTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = make_client(self)
+        self.client._account_id = "account"
+
+    async def test_merges_both_sources_in_fixed_order(self):
+        for iec_delay, fault_portal_delay in ((0.01, 0), (0, 0.01)):
+
+            async def get_iec_outages(*args, delay=iec_delay):
+                await asyncio.sleep(delay)
+                return [iec_outage()]
+
+            async def get_fault_portal_outages(*args, delay=fault_portal_delay):
+                await asyncio.sleep(delay)
+                return [fault_portal_outage(energized="2024-05-18T11:09:41Z")]
+
+            with (
+                self.subTest(iec_delay=iec_delay),
+                patch.object(data, "get_outages_by_account", get_iec_outages),
+                patch.object(fault_portal_data, "get_outages_by_account", get_fault_portal_outages),
+            ):
+                (outage,) = await self.client.get_merged_outages()
+
+            # The same disconnect ID under different keys, the IEC API wins whichever source answers first and the
+            # fault portal fills in the energized date
+            self.assertEqual(outage.source, OutageSource.IEC_API)
+            self.assertIsNotNone(outage.energized_date)
+
+    async def test_falls_back_within_budget(self):
+        async def hanging(*args):
+            await asyncio.sleep(10)
+
+        with (
+            patch.object(data, "get_outages_by_account", AsyncMock(return_value=[iec_outage()])),
+            patch.object(fault_portal_data, "get_outages_by_account", hanging),
+        ):
+            (outage,) = await asyncio.wait_for(self.client.get_merged_outages(timeout=0.05), 1)
+
+        self.assertEqual(outage.source, OutageSource.IEC_API)
+
+    async def test_both_sources_failing(self):
+        with (
+            patch.object(data, "get_outages_by_account", AsyncMock(side_effect=IECError(500, "down"))),
+            patch.object(fault_portal_data, "get_outages_by_account", AsyncMock(side_effect=IECError(500, "down"))),
+            self.assertRaises(IECError),
+        ):
+            await self.client.get_merged_outages()
+
+
+if __name__ == "__main__":
+    unittest.main()
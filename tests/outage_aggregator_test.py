@@ -0,0 +1,63 @@
+import unittest
+
+from iec_api.compact_outage import CompactOutage, OutageSource, from_outages
+from iec_api.outage_aggregator import OutageAggregator, OutageCounts
+from iec_api.outage_watcher import OutageEvent, OutageEventType
+from tests.outage_fixtures import ENERGIZED_DATE, iec_outage
+
+
+def outage(key: str, city: str, area: str = "חיפה", region: str = "צפון", energized: bool = False) -> CompactOutage:
+    return CompactOutage(
+        key,
+        OutageSource.IEC_API,
+        region=region,
+        area=area,
+        city=city,
+        energized_date=ENERGIZED_DATE if energized else None,
+    )
+
+
+class OutageAggregatorTest(unittest.TestCase):
+    def setUp(self):
+        self.aggregator = OutageAggregator()
+
+    def test_address_normalized(self):
+        (compact,) = from_outages([iec_outage()])
+        self.assertEqual((compact.region, compact.area, compact.city), ("חיפה והצפון", "חיפה", "טירה"))
+
+    def test_events(self):
+        self.aggregator.apply(OutageEvent("a", OutageEventType.NEW, outage("k1", "טירה")))
+        self.aggregator.apply(OutageEvent("b", OutageEventType.NEW, outage("k1", "טירה")))  # Same disconnect
+        self.aggregator.apply(OutageEvent("b", OutageEventType.NEW, outage("k2", "עכו", area="עכו")))
+        self.aggregator.apply(OutageEvent("b", OutageEventType.UPDATED, outage("k2", "עכו", area="עכו")))
+
+        self.assertEqual(self.aggregator.total, OutageCounts(disconnects=2, sites=3))
+        self.assertEqual(self.aggregator.region("צפון"), OutageCounts(disconnects=2, sites=3))
+        self.assertEqual(self.aggregator.city("טירה"), OutageCounts(disconnects=1, sites=2))
+        self.assertEqual(self.aggregator.area("עכו"), OutageCounts(disconnects=1, sites=1))
+
+        self.aggregator.apply(OutageEvent("a", OutageEventType.RESOLVED, outage("k1", "טירה", energized=True)))
+        self.aggregator.apply(OutageEvent("b", OutageEventType.UPDATED, outage("k2", "עכו", energized=True)))
+
+        self.assertEqual(self.aggregator.total, OutageCounts(disconnects=1, sites=1))
+        self.assertEqual(self.aggregator.cities, {"טירה": OutageCounts(disconnects=1, sites=1)})
+        self.assertEqual(self.aggregator.city("עכו"), OutageCounts())
+
+    def test_set_outages(self):
+        self.aggregator.set_outages(
+            "a", [outage("k1", "טירה"), outage("k2", "עכו"), outage("k3", "חיפה", energized=True)]
+        )
+        self.assertEqual(self.aggregator.total, OutageCounts(disconnects=2, sites=2))
+
+        self.aggregator.set_outages("a", [outage("k2", "עכו"), outage("k4", "עכו")])
+        self.assertEqual(self.aggregator.cities, {"עכו": OutageCounts(disconnects=2, sites=2)})
+
+        self.aggregator.remove_account("a")
+        self.assertEqual(self.aggregator.total, OutageCounts())
+        self.assertEqual(self.aggregator.regions, {})
+        # No counters are left behind for the places that had outages
+        self.assertEqual((self.aggregator._regions, self.aggregator._areas, self.aggregator._cities), ({}, {}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
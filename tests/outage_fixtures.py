@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from iec_api.fault_portal_models.outages import FaultPortalOutage
+from iec_api.models.outages import Outage
+
+ENERGIZED_DATE = datetime(2024, 5, 18, 11, 9, 41, tzinfo=timezone.utc)
+DISCONNECT_ID = "1d9a36ef-9a14-ef11-9f89-7c1e52290237"
+
+
+def iec_outage(key: str = "17701HESD5840", state_code: str = "6", energized: Optional[str] = None) -> Outage:
+    return Outage.from_dict(
+        {
+            "transactionsInfo": [
+                {
+                    "disconnectDate": "2024-05-17T22:32:16Z",
+                    "disconnect": {
+                        "disconnectKey": key,
+                        "disconnectType": {
+                            "displayName": "תקלה איזורית",
+                            "code": 1,
+                            "id": "b146f469-819a-ea11-a811-000d3a239ca0",
+                        },
+                        "disconnectTreatmentState": {
+                            "displayName": "החזרת אספקה",
+                            "code": state_code,
+                            "isConnectIndicationBit": False,
+                            "id": "7eaecdd3-859a-ea11-a812-000d3a239136",
+                        },
+                        "id": DISCONNECT_ID,
+                        "estimateTreatmentDate": None,
+                        "energizedDate": energized,
+                    },
+                    "disconnectType": 1,
+                }
+            ],
+            "site": {
+                "contractNumber": "346496424",
+                "address": {
+                    "region": {"name": "חיפה והצפון", "id": "909a5d57-d7db-ea11-a813-000d3aabca53"},
+                    "area": {"name": "חיפה", "id": "0d93fbef-d7db-ea11-a813-000d3aabca53"},
+                    "street": "הגל",
+                    "houseNumber": "12",
+                    "city": {"name": "טירה", "id": "fb0a89b9-29e0-e911-a972-000d3a29fb7a"},
+                    "id": "f5453a99-0472-e811-8106-3863bb358f68",
+                },
+                "id": "8eb5c7da-e0a5-ea11-a812-000d3aaebb51",
+            },
+        }
+    )
+
+
+def fault_portal_outage(key: str = "17701HESD5840", energized: Optional[str] = None) -> FaultPortalOutage:
+    def base(name: str) -> dict:
+        return {"name": name, "id": "0d93fbef-d7db-ea11-a813-000d3aabca53", "logicalName": "l"}
+
+    return FaultPortalOutage.from_dict(
+        {
+            "siteKeyDesc": "603147332",
+            "disconnectDate": "2024-05-17T22:32:16Z",
+            "stateCode": 0,
+            "disconnect": {
+                "disconnectKey": key,
+                "disconnectTreatmentState": {
+                    "displayName": "החזרת אספקה",
+                    "code": "6",
+                    "isConnectIndicationBit": False,
+                    "disconnectTreatmentStatePortal": 3,
+                    "id": "7eaecdd3-859a-ea11-a812-000d3a239136",
+                    "logicalName": "iec_disconnecttreatmentstate",
+                },
+                "disconnectType": {"displayName": "תקלה איזורית", "code": 1, "id": None, "logicalName": None},
+                "energizedDate": energized,
+                "disconnectDate": "2024-05-17T22:12:08Z",
+                "id": DISCONNECT_ID,
+                "logicalName": "iec_disconnect",
+            },
+            "site": {
+                "contractNumber": "346496424",
+                "address": {
+                    "area": base("חיפה"),
+                    "region": base("חיפה והצפון"),
+                    "city": {**base("טירת כרמל"), "shovalCityCode": "778"},
+                    "houseNumber": "11",
+                    "streetStr": "הגל",
+                    "id": None,
+                    "logicalName": None,
+                },
+                "id": None,
+                "logicalName": None,
+            },
+            "id": None,
+            "logicalName": None,
+        }
+    )
@@ -0,0 +1,144 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from iec_api.compact_outage import CompactOutage, OutageSource, from_fault_portal_outages, from_outages
+from iec_api.models.exceptions import IECError
+from iec_api.outage_watcher import OutageEvent, OutageEventType, OutageWatcher, diff_outages
+from tests.outage_fixtures import DISCONNECT_ID, ENERGIZED_DATE, fault_portal_outage, iec_outage
+
+
+def outage(key: str, state_code: str = "1", energized: bool = False) -> CompactOutage:
+    return CompactOutage(
+        key, OutageSource.IEC_API, treatment_state_code=state_code, energized_date=ENERGIZED_DATE if energized else None
+    )
+
+
+class CompactOutageTest(unittest.TestCase):
+    def test_from_both_sources(self):
+        (iec,) = from_outages([iec_outage(energized="2024-05-18T11:09:41Z")])
+        (fault_portal,) = from_fault_portal_outages([fault_portal_outage(energized="2024-05-18T11:09:41Z")])
+
+        for compact in (iec, fault_portal):
+            self.assertEqual(compact.disconnect_key, "17701HESD5840")
+            self.assertEqual(str(compact.disconnect_id), DISCONNECT_ID)
+            self.assertEqual(compact.contract_number, "346496424")
+            self.assertEqual(compact.treatment_state_code, "6")
+            self.assertFalse(compact.is_active)
+        self.assertEqual(iec.energized_date, fault_portal.energized_date)
+        self.assertEqual((iec.source, iec.city), (OutageSource.IEC_API, "טירה"))
+        self.assertEqual(fault_portal.source, OutageSource.FAULT_PORTAL)
+        self.assertTrue(from_outages([iec_outage()])[0].is_active)
+
+
+class DiffOutagesTest(unittest.TestCase):
+    def test_diff(self):
+        previous = {o.disconnect_key: o for o in [outage("same"), outage("state"), outage("energized"), outage("gone")]}
+        current = {
+            o.disconnect_key: o
+            for o in [outage("same"), outage("state", "2"), outage("energized", energized=True), outage("new")]
+        }
+
+        events = {event.outage.disconnect_key: event for event in diff_outages("a", previous, current)}
+
+        self.assertEqual(
+            {key: event.event_type for key, event in events.items()},
+            {
+                "state": OutageEventType.UPDATED,
+                "energized": OutageEventType.RESOLVED,
+                "new": OutageEventType.NEW,
+                "gone": OutageEventType.RESOLVED,
+            },
+        )
+        previous_state = events["state"].previous
+        assert previous_state is not None
+        self.assertEqual(previous_state.treatment_state_code, "1")
+        self.assertEqual(diff_outages("a", {"old": outage("old", energized=True)}, {}), [])
+
+
+class OutageWatcherTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.outages: dict[str, list[CompactOutage]] = {"a": [outage("1")], "b": []}
+        patcher = patch("iec_api.outage_watcher.time", MagicMock(monotonic=lambda: self.now))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def fetch(self, account_id: str) -> list[CompactOutage]:
+        if account_id == "error":
+            raise IECError(500, "down")
+        return self.outages[account_id]
+
+    async def test_emits_changes_only(self):
+        seen: list[OutageEvent] = []
+        watcher = OutageWatcher(self.fetch, ["a", "b"], min_interval=10, max_interval=40, on_event=seen.append)
+
+        events = await watcher.poll()
+        self.assertEqual([(e.account_id, e.event_type) for e in events], [("a", OutageEventType.NEW)])
+
+        self.now += 10
+        self.assertEqual(await watcher.poll(), [])
+
+        self.outages["a"] = [outage("1", energized=True)]
+        self.now += 10
+        events = await watcher.poll()
+        self.assertEqual([e.event_type for e in events], [OutageEventType.RESOLVED])
+        self.assertEqual(seen, [*seen[:1], *events])
+        self.assertEqual(watcher.get_outages("a"), self.outages["a"])
+
+    async def test_adaptive_schedule(self):
+        watcher = OutageWatcher(self.fetch, ["a", "b"], min_interval=10, max_interval=40, emit_initial=False)
+        polled = []
+        for _ in range(8):
+            events = await watcher.poll()
+            self.assertEqual(events, [])
+            polled.append(sorted(watcher._accounts[key].interval for key in ("a", "b")))
+            self.now += 10
+
+        # The active account stays at the min interval, the idle one backs off to the max interval
+        self.assertEqual(polled[-1], [10, 40])
+        self.assertEqual(watcher.next_poll_in, 0)  # The active account is due again
+
+    async def test_failing_callback_keeps_polling(self):
+        self.outages["b"] = [outage("2")]
+        seen: list[OutageEvent] = []
+
+        def on_event(event: OutageEvent):
+            seen.append(event)
+            raise RuntimeError("Handler bug")
+
+        watcher = OutageWatcher(self.fetch, ["a", "b"], min_interval=10, on_event=on_event)
+        with self.assertLogs("iec_api.outage_watcher", "ERROR"):
+            events = await watcher.poll()
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(seen, events)
+
+    async def test_watch_polls_added_account_at_once(self):
+        first_event: asyncio.Future[OutageEvent] = asyncio.get_running_loop().create_future()
+        watcher = OutageWatcher(
+            self.fetch, ["b"], min_interval=10, max_interval=40, on_event=lambda e: first_event.set_result(e)
+        )
+        task = asyncio.create_task(watcher.run())
+        self.addCleanup(task.cancel)
+        await asyncio.sleep(0.01)
+        self.assertEqual(watcher.next_poll_in, 20)  # The idle account was polled, the watcher is waiting for it
+
+        watcher.add_account("a")
+
+        event = await asyncio.wait_for(first_event, 1)
+        self.assertEqual((event.account_id, event.event_type), ("a", OutageEventType.NEW))
+
+    async def test_failed_poll_keeps_state(self):
+        watcher = OutageWatcher(self.fetch, ["error"], min_interval=10)
+        self.assertEqual(await watcher.poll(), [])
+        self.assertEqual(watcher.get_outages("error"), [])
+        self.assertEqual(watcher.next_poll_in, 10)
+
+        watcher.remove_account("error")
+        self.assertEqual(len(watcher), 0)
+        self.assertEqual(await watcher.poll(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
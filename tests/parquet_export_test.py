@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from iec_api import parquet_export
+from iec_api.const import TIMEZONE
+from iec_api.models.remote_reading import MeterReadingData, PeriodConsumption, RemoteReadingResponse
+
+
+def _response(meter_serial: str, start: datetime, periods: int) -> RemoteReadingResponse:
+    consumptions = [
+        PeriodConsumption(interval=start + timedelta(minutes=15 * i), consumption=0.25) for i in range(periods)
+    ]
+    return RemoteReadingResponse(
+        report_status=0,
+        contract_number="123",
+        meter_list=[MeterReadingData(meter_serial=meter_serial, meter_code="789", period_consumptions=consumptions)],
+    )
+
+
+@unittest.skipIf(not parquet_export._HAS_PYARROW, "Requires pyarrow")
+class ParquetExportTest(unittest.TestCase):
+    def setUp(self):
+        # Crosses a local month boundary, which is still April in UTC
+        self.responses = [
+            _response("456", TIMEZONE.localize(datetime(2024, 4, 30, 23, 30)), 4),
+            _response("999", TIMEZONE.localize(datetime(2024, 5, 2)), 2),
+        ]
+
+    def test_record_batches(self):
+        batches = list(parquet_export.reading_record_batches(self.responses))
+
+        self.assertEqual([batch.num_rows for batch in batches], [4, 2])
+        self.assertEqual(batches[0].schema, parquet_export.reading_schema())
+        self.assertEqual(batches[0].column("month").to_pylist(), ["2024-04", "2024-04", "2024-05", "2024-05"])
+        self.assertEqual(batches[1].column("meter_serial").to_pylist(), ["999", "999"])
+
+    def test_partitioned_dataset(self):
+        import pyarrow.dataset
+
+        with tempfile.TemporaryDirectory() as base_dir:
+            parquet_export.write_readings_parquet(iter(self.responses), base_dir)
+            parquet_export.write_readings_parquet(iter(self.responses[:1]), base_dir)  # Rewrites its partitions
+
+            dataset = pyarrow.dataset.dataset(
+                base_dir, format="parquet", partitioning=parquet_export.reading_partitioning()
+            )
+            table = dataset.to_table(filter=pyarrow.dataset.field("month") == "2024-05")
+
+            self.assertEqual(table.num_rows, 4)
+            self.assertEqual(sorted(table.column("meter_serial").to_pylist()), ["456", "456", "999", "999"])
+            self.assertEqual(dataset.count_rows(), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from iec_api import data
+from iec_api.const import TIMEZONE
+from iec_api.models.remote_reading import (
+    FutureConsumptionInfo,
+    MeterReadingData,
+    PeriodConsumption,
+    ReadingResolution,
+    RemoteReadingResponse,
+)
+from iec_api.reading_cache import RemoteReadingCache, requested_days
+from tests.helpers import make_client
+
+KEY = ("123", "Consumption", "456", "789")
+
+
+def _daily_response(day: date, value: float = 0.25) -> RemoteReadingResponse:
+    start = TIMEZONE.localize(datetime.combine(day, datetime.min.time()))
+    steps = int(
+        (TIMEZONE.localize(datetime.combine(day + timedelta(days=1), datetime.min.time())) - start).total_seconds()
+    )
+    consumptions = [
+        PeriodConsumption(interval=start + timedelta(minutes=15 * i), consumption=value) for i in range(steps // 900)
+    ]
+    return RemoteReadingResponse(
+        report_status=0,
+        contract_number="123",
+        meter_list=[MeterReadingData(meter_serial="456", meter_code="789", period_consumptions=consumptions)],
+    )
+
+
+class RequestedDaysTest(unittest.TestCase):
+    def test_requested_days(self):
+        self.assertEqual(requested_days(ReadingResolution.DAILY, date(2024, 2, 27)), [date(2024, 2, 27)])
+        self.assertEqual(len(requested_days(ReadingResolution.WEEKLY, date(2024, 2, 27))), 7)
+        self.assertEqual(requested_days(ReadingResolution.MONTHLY, date(2024, 2, 27))[-1], date(2024, 2, 29))
+
+    def test_monthly_ends_with_calendar_month(self):
+        days = requested_days(ReadingResolution.MONTHLY, date(2024, 12, 15))
+
+        self.assertEqual((days[0], days[-1], len(days)), (date(2024, 12, 15), date(2024, 12, 31), 17))
+
+
+class RemoteReadingCacheTest(unittest.IsolatedAsyncioTestCase):
+    def test_weekly_derived_from_daily(self):
+        cache = RemoteReadingCache()
+        start = date(2024, 1, 7)
+        for i in range(7):
+            day = start + timedelta(days=i)
+            cache.put(KEY, day, ReadingResolution.DAILY, _daily_response(day))
+
+        self.assertIsNotNone(cache.get(KEY, start, ReadingResolution.DAILY))
+        weekly = cache.get(KEY, start, ReadingResolution.WEEKLY)
+
+        assert weekly is not None
+        meter = weekly.meter_list[0]
+        self.assertEqual(len(meter.period_consumptions), 7)
+        self.assertEqual(meter.period_consumptions[0].consumption, 24.0)
+        self.assertEqual(meter.total_consumption_for_period, 7 * 24.0)
+        self.assertEqual(meter.end_date, date(2024, 1, 13))
+
+    def test_partial_coverage_is_a_miss(self):
+        cache = RemoteReadingCache()
+        cache.put(KEY, date(2024, 1, 7), ReadingResolution.DAILY, _daily_response(date(2024, 1, 7)))
+
+        self.assertIsNone(cache.get(KEY, date(2024, 1, 7), ReadingResolution.WEEKLY))
+        self.assertEqual(cache.misses, 1)
+
+    def test_monthly_serves_weekly(self):
+        cache = RemoteReadingCache()
+        first = TIMEZONE.localize(datetime(2024, 2, 1))
+        monthly = RemoteReadingResponse(
+            report_status=0,
+            contract_number="123",
+            meter_list=[
+                MeterReadingData(
+                    period_consumptions=[
+                        PeriodConsumption(interval=first + timedelta(days=i), consumption=1.0) for i in range(29)
+                    ]
+                )
+            ],
+        )
+        cache.put(KEY, first, ReadingResolution.MONTHLY, monthly)
+
+        weekly = cache.get(KEY, datetime(2024, 2, 10), ReadingResolution.WEEKLY)
+        assert weekly is not None
+        self.assertEqual(weekly.meter_list[0].total_consumption_for_period, 7.0)
+        self.assertIsNone(cache.get(KEY, datetime(2024, 2, 10), ReadingResolution.DAILY))
+
+    def test_incomplete_and_future_days_are_not_cached(self):
+        cache = RemoteReadingCache()
+        incomplete = _daily_response(date(2024, 1, 7))
+        del incomplete.meter_list[0].period_consumptions[10]
+        cache.put(KEY, date(2024, 1, 7), ReadingResolution.DAILY, incomplete)
+        today = datetime.now(TIMEZONE).date()
+        cache.put(KEY, today, ReadingResolution.DAILY, _daily_response(today))
+
+        self.assertIsNone(cache.get(KEY, date(2024, 1, 7), ReadingResolution.DAILY))
+        self.assertIsNone(cache.get(KEY, today, ReadingResolution.DAILY))
+
+    def test_returns_copies(self):
+        cache = RemoteReadingCache()
+        start = date(2024, 1, 7)
+        for i in range(7):
+            day = start + timedelta(days=i)
+            cache.put(KEY, day, ReadingResolution.DAILY, _daily_response(day))
+
+        daily = cache.get(KEY, start, ReadingResolution.DAILY)
+        weekly = cache.get(KEY, start, ReadingResolution.WEEKLY)
+        assert daily is not None and weekly is not None
+        daily.meter_list[0].period_consumptions.clear()
+        weekly.meter_list[0].total_consumption_for_period = 0
+
+        daily = cache.get(KEY, start, ReadingResolution.DAILY)
+        weekly = cache.get(KEY, start, ReadingResolution.WEEKLY)
+        assert daily is not None and weekly is not None
+        self.assertEqual(len(daily.meter_list[0].period_consumptions), 96)
+        self.assertEqual(weekly.meter_list[0].total_consumption_for_period, 7 * 24.0)
+
+    def test_stores_copies(self):
+        cache = RemoteReadingCache()
+        day = date(2024, 1, 7)
+        response = _daily_response(day)
+        response.meter_list[0].future_consumption_info = FutureConsumptionInfo(future_consumption=1.0)
+        cache.put(KEY, day, ReadingResolution.DAILY, response)
+
+        response.meter_list[0].period_consumptions.clear()
+
+        cached = cache.get(KEY, day, ReadingResolution.DAILY)
+        assert cached is not None
+        self.assertEqual(len(cached.meter_list[0].period_consumptions), 96)
+        self.assertIsNone(cached.meter_list[0].future_consumption_info)  # Stale when served later
+        self.assertIsNotNone(response.meter_list[0].future_consumption_info)
+
+    async def test_client_result_of_a_miss_is_not_cached(self):
+        client = make_client(self)
+        day = date(2024, 1, 7)
+        at = datetime.combine(day, datetime.min.time())
+        with patch.object(data, "get_remote_reading", AsyncMock(side_effect=lambda **kwargs: _daily_response(day))):
+            missed = await client.get_remote_reading("Consumption", "456", 789, at, at, contract_id="123")
+            assert missed is not None
+            missed.meter_list[0].period_consumptions.clear()
+            cached = await client.get_remote_reading("Consumption", "456", 789, at, at, contract_id="123")
+
+        assert cached is not None
+        self.assertEqual(len(cached.meter_list[0].period_consumptions), 96)
+
+    def test_derived_drops_template_future_consumption(self):
+        cache = RemoteReadingCache()
+        start = date(2024, 1, 7)
+        for i in range(7):
+            day = start + timedelta(days=i)
+            response = _daily_response(day)
+            response.meter_list[0].future_consumption_info = FutureConsumptionInfo(future_consumption=1.0)
+            cache.put(KEY, day, ReadingResolution.DAILY, response)
+
+        weekly = cache.get(KEY, start, ReadingResolution.WEEKLY)
+
+        assert weekly is not None
+        self.assertIsNone(weekly.meter_list[0].future_consumption_info)
+
+    def test_lru_eviction(self):
+        cache = RemoteReadingCache(max_meters=1)
+        other_key = ("999", "Consumption", "456", "789")
+        cache.put(KEY, date(2024, 1, 7), ReadingResolution.DAILY, _daily_response(date(2024, 1, 7)))
+        cache.put(other_key, date(2024, 1, 7), ReadingResolution.DAILY, _daily_response(date(2024, 1, 7)))
+
+        self.assertIsNone(cache.get(KEY, date(2024, 1, 7), ReadingResolution.DAILY))
+        self.assertIsNotNone(cache.get(other_key, date(2024, 1, 7), ReadingResolution.DAILY))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+from datetime import datetime, timedelta
+
+import pytz
+
+from iec_api.const import TIMEZONE
+from iec_api.models.invoice import Invoice
+from iec_api.models.remote_reading import PeriodConsumption
+from iec_api.reading_resampler import (
+    ResampleFrequency,
+    billing_periods,
+    infer_step,
+    resample,
+    resample_to_periods,
+)
+
+
+def _series(start: datetime, count: int, step: timedelta = timedelta(minutes=15), value: float = 1.0):
+    return [PeriodConsumption(interval=start + step * i, consumption=value) for i in range(count)]
+
+
+class ResampleTest(unittest.TestCase):
+    def test_hourly_sum_and_stats(self):
+        start = TIMEZONE.localize(datetime(2024, 1, 10, 0, 0))
+        series = [PeriodConsumption(interval=start + timedelta(minutes=15 * i), consumption=float(i)) for i in range(8)]
+
+        buckets = resample(series, ResampleFrequency.HOURLY, percentiles=(50,))
+
+        self.assertEqual(len(buckets), 2)
+        self.assertEqual(buckets[0].total, 0 + 1 + 2 + 3)
+        self.assertEqual(buckets[0].mean, 1.5)
+        self.assertEqual(buckets[0].max, 3)
+        self.assertEqual(buckets[0].percentiles[50], 1.5)
+        self.assertEqual(buckets[1].start, start + timedelta(hours=1))
+        self.assertTrue(buckets[1].is_complete)
+
+    def test_daily_buckets_follow_local_midnight(self):
+        # 22:00 UTC is midnight in Israel during winter
+        start = datetime(2024, 1, 9, 21, 0, tzinfo=pytz.utc)
+        buckets = resample(_series(start, 8), ResampleFrequency.DAILY)
+
+        self.assertEqual(len(buckets), 2)
+        self.assertEqual(buckets[0].count, 4)
+        self.assertEqual(buckets[1].start, TIMEZONE.localize(datetime(2024, 1, 10)))
+
+    def test_dst_days_expected_counts(self):
+        # Israel switched to summer time on 2024-03-29 and back on 2024-10-27
+        spring = resample(_series(TIMEZONE.localize(datetime(2024, 3, 29)), 92), ResampleFrequency.DAILY)
+        autumn = resample(_series(TIMEZONE.localize(datetime(2024, 10, 27)), 100), ResampleFrequency.DAILY)
+
+        self.assertEqual(len(spring), 1)
+        self.assertEqual(spring[0].expected_count, 23 * 4)
+        self.assertTrue(spring[0].is_complete)
+        self.assertEqual(len(autumn), 1)
+        self.assertEqual(autumn[0].expected_count, 25 * 4)
+        self.assertTrue(autumn[0].is_complete)
+
+    def test_fall_back_hours_are_not_merged(self):
+        start = TIMEZONE.localize(datetime(2024, 10, 27, 0, 0))
+        buckets = resample(_series(start, 12), ResampleFrequency.HOURLY)
+
+        self.assertEqual(len(buckets), 3)
+        self.assertTrue(all(bucket.count == 4 for bucket in buckets))
+
+    def test_missing_and_flagged_intervals(self):
+        start = TIMEZONE.localize(datetime(2024, 1, 10, 0, 0))
+        series = _series(start, 4)
+        del series[2]
+        series[0] = PeriodConsumption(interval=series[0].interval, consumption=100.0, status=1)
+
+        included = resample(series, ResampleFrequency.HOURLY, step=timedelta(minutes=15))[0]
+        excluded = resample(series, ResampleFrequency.HOURLY, step=timedelta(minutes=15), include_flagged=False)[0]
+
+        self.assertEqual(included.total, 102.0)
+        self.assertEqual(included.flagged_count, 1)
+        self.assertEqual(included.missing_count, 1)
+        self.assertEqual(excluded.total, 2.0)
+        self.assertEqual(excluded.skipped_count, 1)
+        self.assertEqual(excluded.missing_count, 1)
+
+    def test_weekly_and_monthly(self):
+        start = TIMEZONE.localize(datetime(2024, 1, 28))  # Sunday
+        series = _series(start, 14, step=timedelta(days=1))
+
+        weekly = resample(series, ResampleFrequency.WEEKLY)
+        monthly = resample(series, ResampleFrequency.MONTHLY)
+
+        self.assertEqual([bucket.total for bucket in weekly], [7.0, 7.0])
+        self.assertEqual([bucket.total for bucket in monthly], [4.0, 10.0])
+        self.assertEqual(monthly[1].expected_count, 29)
+
+    def test_infer_step(self):
+        start = TIMEZONE.localize(datetime(2024, 1, 10))
+        self.assertEqual(infer_step(_series(start, 10)), timedelta(minutes=15))
+        self.assertIsNone(infer_step(_series(start, 1)))
+
+    def test_invalid_percentile(self):
+        with self.assertRaises(ValueError):
+            resample([], ResampleFrequency.DAILY, percentiles=(101,))
+
+
+class ResampleToPeriodsTest(unittest.TestCase):
+    def test_billing_periods(self):
+        invoice = Invoice.from_dict(
+            {
+                "amountOrigin": 1,
+                "amountToPay": 0,
+                "amountPaid": 1,
+                "invoiceId": 1,
+                "contractNumber": 1,
+                "orderNumber": 0,
+                "invoicePaymentStatus": 1,
+                "documentID": "1",
+                "daysPeriod": "2",
+                "hasDirectDebit": False,
+                "invoiceType": 0,
+                "fromDate": "2024-01-10T00:00:00",
+                "toDate": "2024-01-11T00:00:00",
+            }
+        )
+        periods = billing_periods([invoice])
+        series = _series(TIMEZONE.localize(datetime(2024, 1, 9)), 5, step=timedelta(days=1))
+
+        buckets = resample_to_periods(series, periods)
+
+        self.assertEqual(len(buckets), 1)
+        self.assertEqual(buckets[0].count, 2)
+        self.assertEqual(buckets[0].expected_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime, timedelta
+
+from iec_api.const import TIMEZONE
+from iec_api.models.remote_reading import PeriodConsumption, TaozReading
+from iec_api.tariff_cost import TariffPlan, compute_costs, prorate_monthly_charge
+
+
+class ComputeCostsTest(unittest.TestCase):
+    def setUp(self):
+        start = TIMEZONE.localize(datetime(2024, 1, 10, 0, 0))
+        self.consumptions = [PeriodConsumption(interval=start + timedelta(hours=i), consumption=1.0) for i in range(4)]
+        self.taoz_list = [
+            TaozReading(interval=start, taoz=1),
+            TaozReading(interval=start + timedelta(hours=2), taoz=2),
+        ]
+
+    def test_flat_and_tou_in_one_pass(self):
+        flat = TariffPlan(name="flat", kwh_rate=0.5)
+        tou = TariffPlan.with_discounts(name="night", kwh_rate=0.5, band_discounts={1: 0.2})
+
+        costs = compute_costs(self.consumptions, self.taoz_list, [flat, tou], include_intervals=True)
+
+        self.assertAlmostEqual(costs["flat"].energy_cost, 2.0)
+        self.assertAlmostEqual(costs["night"].energy_cost, 0.4 * 2 + 0.5 * 2)
+        self.assertEqual(costs["night"].kwh_by_band, {1: 2.0, 2: 2.0})
+        self.assertEqual(costs["night"].interval_costs, [0.4, 0.4, 0.5, 0.5])
+        self.assertIsNone(compute_costs(self.consumptions, [], [flat])["flat"].interval_costs)
+
+    def test_intervals_before_taoz_use_base_rate(self):
+        plan = TariffPlan(name="tou", kwh_rate=1.0, band_rates={1: 0.0, 2: 0.0})
+
+        costs = compute_costs(self.consumptions, self.taoz_list[1:], [plan])
+
+        self.assertAlmostEqual(costs["tou"].energy_cost, 2.0)
+        self.assertEqual(costs["tou"].kwh_by_band[None], 2.0)
+
+    def test_fixed_charges_are_prorated_by_days(self):
+        plan = TariffPlan(name="flat", kwh_rate=0.0, fixed_monthly_charge=30.0)
+
+        costs = compute_costs(self.consumptions, [], [plan])
+
+        self.assertEqual(costs["flat"].days, 1)
+        self.assertAlmostEqual(costs["flat"].total, prorate_monthly_charge(30.0, 1))
+
+    def test_prorated_monthly_charge(self):
+        # Example single-phase charges: 27.78 ILS distribution + 17.10 ILS delivery per month, including VAT
+        monthly_charge = 27.78 + 17.10
+
+        self.assertAlmostEqual(prorate_monthly_charge(monthly_charge, 365), 12 * monthly_charge)
+        # A 60 days billing cycle: 44.88 * 12 / 365 * 60 = 88.53
+        self.assertAlmostEqual(prorate_monthly_charge(monthly_charge, 60), 88.53, places=2)
+
+    def test_duplicate_plan_names(self):
+        with self.assertRaises(ValueError):
+            compute_costs([], [], [TariffPlan(name="a", kwh_rate=1), TariffPlan(name="a", kwh_rate=2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
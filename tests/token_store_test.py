@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from cryptography.fernet import Fernet
+
+from iec_api import login
+from iec_api.models.jwt import JWT
+from iec_api.token_store import DirectoryTokenStore, MemoryTokenStore, SqliteTokenStore
+
+USER_IDS = ["100000009", "100000017", "100000025"]
+
+
+def _token(i: int) -> JWT:
+    return JWT(
+        access_token=f"access{i}", refresh_token="refresh", token_type="Bearer", expires_in=3600, scope="", id_token=""
+    )
+
+
+class TokenStoreTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.tokens = {user_id: _token(i) for i, user_id in enumerate(USER_IDS)}
+
+    def _stores(self):
+        return [
+            MemoryTokenStore(),
+            DirectoryTokenStore(os.path.join(self.directory.name, "tokens")),
+            SqliteTokenStore(os.path.join(self.directory.name, "tokens.db")),
+        ]
+
+    async def test_batch_round_trip(self):
+        for store in self._stores():
+            with self.subTest(store=type(store).__name__):
+                await store.save_many(self.tokens)
+                await store.delete(USER_IDS[0])
+
+                self.assertEqual(await store.load_many(), {u: self.tokens[u] for u in USER_IDS[1:]})
+                self.assertEqual(
+                    await store.load_many([USER_IDS[2], "100000033"]), {USER_IDS[2]: self.tokens[USER_IDS[2]]}
+                )
+                self.assertIsNone(await store.load(USER_IDS[0]))
+
+    async def test_invalid_user_id(self):
+        for store in self._stores():
+            with self.subTest(store=type(store).__name__), self.assertRaises(ValueError):
+                await store.save("../token", _token(0))
+
+    async def test_key_rotation(self):
+        old_key, new_key = Fernet.generate_key(), Fernet.generate_key()
+        store = DirectoryTokenStore(self.directory.name)
+
+        with patch.dict(os.environ, {"IEC_TOKEN_ENCRYPTION_KEY": old_key.decode()}):
+            await store.save_many(self.tokens)
+        with patch.dict(os.environ, {"IEC_TOKEN_ENCRYPTION_KEY": f"{new_key.decode()},{old_key.decode()}"}):
+            self.assertEqual(await store.rotate(), len(USER_IDS))
+        with patch.dict(os.environ, {"IEC_TOKEN_ENCRYPTION_KEY": new_key.decode()}):
+            self.assertEqual(await store.load_many(), self.tokens)
+
+    def test_fernet_is_cached(self):
+        with patch.dict(os.environ, {"IEC_TOKEN_ENCRYPTION_KEY": Fernet.generate_key().decode()}):
+            self.assertIs(login._get_fernet(), login._get_fernet())
+
+
+if __name__ == "__main__":
+    unittest.main()